@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
+from signal_auswertung import KompakteSignale, VorwaertsFenster, cluster_perioden, signal_verlauf
 
 class RSIAnalysis:
     """
@@ -422,6 +423,9 @@ class ADXAnalysis:
             trend_acceleration = " Trend nimmt an Stärke zu"
         elif adx_trend < 0:
             trend_acceleration = " Trend verliert an Stärke"
+        else:
+            # unverändert oder ADX noch in der Warm-up-Phase (NaN)
+            trend_acceleration = ""
 
         return {
             "adx": round(adx, 2),
@@ -1203,6 +1207,225 @@ class TradeRiskManager:
             "position_typ": position_typ
         }
     
+class RegimeBatchAnalysis:
+    """
+    Array-Variante der Kette RSI → MACD → ADX → Market-Regime → Trade-Entscheidung
+    -----------------------------------------------------------------------------
+    Wertet die Regeln von RSIAnalysis, MACDAnalysis, ADXAnalysis,
+    MarketRegimeAnalysis und TradeDecisionEngine als maskierte NumPy-Operationen
+    für viele Zeitpunkte (oder viele Aktien) gleichzeitig aus.
+    Es werden nur die Zustände berechnet, keine Interpretationstexte.
+    """
+
+    ACTION_MAP = {
+        "BUY": "🟢 Kaufen",
+        "SELL": "🔴 Verkaufen",
+        "HOLD": "🟡 Halten",
+        "WAIT": "🟡 Halten",
+        "NO_TRADE": "🟡 Halten",
+        "REDUCE": "🟡 Halten",
+    }
+
+    def __init__(
+        self,
+        rsi_analysis: RSIAnalysis = None,
+        macd_analysis: MACDAnalysis = None,
+        adx_analysis: ADXAnalysis = None
+    ):
+        self.rsi_analysis = rsi_analysis or RSIAnalysis()
+        self.macd_analysis = macd_analysis or MACDAnalysis()
+        self.adx_analysis = adx_analysis or ADXAnalysis()
+
+    def analyse(
+        self,
+        rsi: np.ndarray,
+        prev_rsi: np.ndarray,
+        macd: np.ndarray,
+        signal: np.ndarray,
+        hist: np.ndarray,
+        prev_hist: np.ndarray,
+        adx: np.ndarray,
+        rsi_valid: np.ndarray = None,
+        macd_valid: np.ndarray = None,
+        adx_valid: np.ndarray = None
+    ) -> dict:
+        """
+        Alle Eingaben sind gleich lange Float-Arrays (ein Eintrag je Zeitpunkt/Aktie).
+        Die *_valid-Masken markieren Einträge, für die die Einzelanalyse ein
+        gültiges Ergebnis liefert (sonst _empty_result).
+        """
+        n = len(rsi)
+        alle = np.ones(n, dtype=bool)
+        rsi_valid = alle if rsi_valid is None else rsi_valid
+        macd_valid = alle if macd_valid is None else macd_valid
+        adx_valid = alle if adx_valid is None else adx_valid
+
+        r = self.rsi_analysis
+        m = self.macd_analysis
+        a = self.adx_analysis
+
+        # -------------------------
+        # RSI (Regime & Überdehnung)
+        # -------------------------
+        rsi_value = np.where(rsi_valid, np.round(rsi, 2), np.nan)
+
+        regime_bullish = (rsi >= r.bullish_floor) & (prev_rsi >= r.bullish_floor)
+        regime_bearish = ~regime_bullish & (rsi <= r.bearish_ceiling) & (prev_rsi <= r.bearish_ceiling)
+
+        rsi_state = np.select(
+            [
+                ~rsi_valid,
+                rsi <= r.oversold,
+                rsi >= r.overbought,
+                regime_bullish & (rsi >= 55),
+                regime_bearish & (rsi <= 45),
+            ],
+            ["invalid", "oversold", "overbought", "bullish_strength", "bearish_weakness"],
+            default="neutral",
+        )
+
+        # -------------------------
+        # MACD (Bias)
+        # -------------------------
+        hist_trend = hist - prev_hist
+        macd_bullish = macd > signal
+        macd_bearish = macd < signal
+
+        macd_bias = np.select(
+            [
+                ~macd_valid,
+                macd_bullish & (hist > m.min_hist_strength) & (hist_trend > 0),
+                macd_bullish & (hist_trend < 0),
+                macd_bullish,
+                macd_bearish & (hist < -m.min_hist_strength) & (hist_trend < 0),
+                macd_bearish & (hist_trend > 0),
+                macd_bearish,
+            ],
+            [
+                "none",
+                "trend_follow_long",
+                "caution_long",
+                "trend_follow_long",
+                "trend_follow_short",
+                "caution_short",
+                "trend_follow_short",
+            ],
+            default="wait",
+        )
+
+        # -------------------------
+        # ADX (Regime)
+        # -------------------------
+        adx_regime = np.select(
+            [
+                ~adx_valid,
+                adx < a.weak_trend,
+                (a.weak_trend <= adx) & (adx < a.strong_trend),
+                (a.strong_trend <= adx) & (adx < a.extreme_trend),
+            ],
+            ["unknown", "range", "emerging_trend", "strong_trend"],
+            default="extreme_trend",
+        )
+
+        # -------------------------
+        # Market-Regime
+        # -------------------------
+        market_regime = np.select(
+            [
+                adx_regime == "range",
+                adx_regime == "emerging_trend",
+                adx_regime == "strong_trend",
+                adx_regime == "extreme_trend",
+            ],
+            ["range_market", "transition_phase", "trend_market", "late_trend"],
+            default="unknown",
+        )
+        market_confidence = np.select(
+            [
+                market_regime == "range_market",
+                market_regime == "transition_phase",
+                market_regime == "trend_market",
+                market_regime == "late_trend",
+            ],
+            [0.4, 0.5, 0.75, 0.6],
+            default=0.0,
+        )
+
+        # -------------------------
+        # Trade-Entscheidung
+        # -------------------------
+        range_market = market_regime == "range_market"
+        trend_market = market_regime == "trend_market"
+        with np.errstate(invalid="ignore"):
+            trend_buy = trend_market & (macd_bias == "bullish") & (rsi_value > 50)
+            trend_sell = trend_market & ~trend_buy & (macd_bias == "bearish") & (rsi_value < 50)
+
+        bedingungen = [
+            range_market & (rsi_state == "oversold"),
+            range_market & (rsi_state == "overbought"),
+            market_regime == "transition_phase",
+            trend_buy,
+            trend_sell,
+            trend_market,
+            market_regime == "late_trend",
+        ]
+        action = np.select(
+            bedingungen,
+            ["BUY", "SELL", "WAIT", "BUY", "SELL", "HOLD", "REDUCE"],
+            default="NO_TRADE",
+        )
+        confidence = np.select(
+            bedingungen,
+            [0.55, 0.55, 0.4, market_confidence, market_confidence, 0.5, 0.6],
+            default=0.0,
+        )
+
+        return {
+            "rsi_value": rsi_value,
+            "rsi_state": rsi_state,
+            "macd_bias": macd_bias,
+            "adx_regime": adx_regime,
+            "market_regime": market_regime,
+            "action": action,
+            "confidence": np.round(confidence, 2),
+        }
+
+    def analyse_frame(self, full_data: pd.DataFrame) -> dict:
+        """
+        Wertet jede Zeile i so aus, als würde die Einzelanalyse mit
+        full_data.iloc[:i+1] aufgerufen.
+        """
+        n = len(full_data)
+        position = np.arange(n)
+        spalten = full_data.columns
+
+        def spalte(name):
+            if name in spalten:
+                return full_data[name].to_numpy(dtype=float)
+            return np.full(n, np.nan)
+
+        def vorwert(werte):
+            verschoben = np.full(n, np.nan)
+            verschoben[1:] = werte[:-1]
+            return verschoben
+
+        rsi = spalte("RSI")
+        hist = spalte("MACD_Hist")
+
+        return self.analyse(
+            rsi=rsi,
+            prev_rsi=vorwert(rsi),
+            macd=spalte("MACD"),
+            signal=spalte("MACD_Signal"),
+            hist=hist,
+            prev_hist=vorwert(hist),
+            adx=spalte("ADX"),
+            rsi_valid=("RSI" in spalten) & (position >= 1),
+            macd_valid={"MACD", "MACD_Signal", "MACD_Hist"}.issubset(spalten) & (position >= 2),
+            adx_valid={"ADX", "+DI", "-DI"}.issubset(spalten) & (position >= 1),
+        )
+
+
 class SignalGenerator:
 
     def __init__(self):
@@ -1211,9 +1434,13 @@ class SignalGenerator:
     def generate_signals(
         self,
         full_data: pd.DataFrame,
-        min_len_window: int = 20
+        min_len_window: int = 20,
+        vektorisiert: bool = True
     ) -> pd.DataFrame:
 
+        if vektorisiert:
+            return self.generate_signals_vektorisiert(full_data, min_len_window)
+
         signale = []
         rsi_analysis = RSIAnalysis()
         macd_analysis = MACDAnalysis()
@@ -1255,11 +1482,41 @@ class SignalGenerator:
 
         return pd.DataFrame(signale)
 
+    def generate_signals_vektorisiert(
+        self,
+        full_data: pd.DataFrame,
+        min_len_window: int = 20
+    ) -> pd.DataFrame:
+        """
+        Batch-Pfad von generate_signals: alle Tage werden in einem Durchlauf
+        über RegimeBatchAnalysis bewertet, ohne Fenster und ohne Interpretationstexte.
+        """
+        if len(full_data) <= min_len_window:
+            return pd.DataFrame()
+
+        ergebnis = RegimeBatchAnalysis().analyse_frame(full_data)
+        bereich = slice(min_len_window, len(full_data))
+
+        entscheidung = pd.Series(ergebnis["action"][bereich]).map(RegimeBatchAnalysis.ACTION_MAP)
+
+        return pd.DataFrame({
+            "Datum": full_data.index[bereich],
+            "Entscheidung": entscheidung.to_numpy(dtype=object),
+            "confidence": ergebnis["confidence"][bereich],
+            "market_regime": ergebnis["market_regime"][bereich].astype(object),
+            "rsi_state": ergebnis["rsi_state"][bereich].astype(object),
+            "rsi_value": ergebnis["rsi_value"][bereich],
+            "macd_bias": ergebnis["macd_bias"][bereich].astype(object),
+            "adx_value": np.full(len(full_data) - min_len_window, None, dtype=object),
+        })
+
 
 class BuySignalEvaluator:
 
     @staticmethod
-    def filter_buy_signals(signals_df: pd.DataFrame) -> pd.DataFrame:
+    def filter_buy_signals(signals_df):
+        if isinstance(signals_df, KompakteSignale):
+            return signals_df.auswahl(signals_df.kauf)
         return signals_df[
             signals_df["Entscheidung"].str.contains("Kaufen")
         ].copy()
@@ -1269,42 +1526,27 @@ class BuySignalEvaluator:
         # ⛔ Edge Case: keine Kaufsignale
         if kaufsignale_df is None or kaufsignale_df.empty:
             return []
-        daten = kaufsignale_df.sort_values("Datum")["Datum"].tolist()
-        # ⛔ zusätzliche Sicherheit (z.B. falls Datum-Spalte leer ist)
-        if not daten:
-            return []
-        perioden = []
-
-        start = prev = daten[0]
-        for d in daten[1:]:
-            if (d - prev).days <= max_gap_days:
-                prev = d
-            else:
-                perioden.append((start, prev))
-                start = prev = d
-
-        perioden.append((start, prev))
-        return perioden
+        # Abstände über np.diff statt Schleife, siehe cluster_indizes
+        return cluster_perioden(kaufsignale_df["Datum"], max_gap_days)
 
     @staticmethod
-    def evaluate_periods(perioden, full_data, Auswertung_tage, min_veraenderung):
-        bewertungen = []
-
-        for start, end in perioden:
-            start_kurs = full_data.loc[end, "Close"]
-            idx = full_data.index.get_loc(end)
-            max_kurs = full_data.iloc[idx:idx+Auswertung_tage+1]["Close"].max()
-
-            diff = (max_kurs - start_kurs) / start_kurs
-
-            bewertungen.append({
-                "Start": start,
-                "Ende": end,
-                "Signal": diff >= min_veraenderung,
-                "Kurs_Diff": diff,
-            })
-
-        return pd.DataFrame(bewertungen)
+    def evaluate_periods(perioden, full_data, Auswertung_tage, min_veraenderung, positionen=None):
+        if not perioden:
+            return pd.DataFrame()
+
+        # Vorwärts-Max aller Bars einmal berechnen, dann je Periode nur ein Array-Zugriff
+        fenster = VorwaertsFenster(full_data, Auswertung_tage)
+        enden = [end for _, end in perioden]
+        bewertung = fenster.bewerte(enden, min_veraenderung, positionen=positionen)
+        if not bewertung["gefunden"].all():
+            raise KeyError(enden[int(np.argmin(bewertung["gefunden"]))])
+
+        return pd.DataFrame({
+            "Start": [start for start, _ in perioden],
+            "Ende": enden,
+            "Signal": bewertung["getroffen"],
+            "Kurs_Diff": bewertung["kurs_diff"],
+        })
 
 class SwingSignalService:
 
@@ -1322,19 +1564,29 @@ class SwingSignalService:
         macd,
         adx
     ):
-        signals = self.generator.generate_signals(
-            full_data
+        # Signale sind unabhängig von Auswertung_tage/min_veraenderung → gecacht,
+        # bei einer neuen Bar wird nur diese berechnet (siehe signal_verlauf)
+        min_len_window = 20
+        verlauf = signal_verlauf(
+            full_data, "SignalGenerator",
+            lambda daten: self.generator.generate_signals(daten, min_len_window),
+            min_len_window=min_len_window
         )
+        signals = verlauf.signale
 
         buys = self.evaluator.filter_buy_signals(signals)
 
         if buys.empty:
             return {"signals": signals}
 
-        perioden = self.evaluator.cluster_periods(buys)
-        bewertung = self.evaluator.evaluate_periods(
-            perioden, full_data, Auswertung_tage, min_veraenderung
-        )
+        # Perioden und Bewertung aus dem Verlauf (geschlossene Perioden bleiben fest)
+        perioden_bewertung = verlauf.auswertung(Auswertung_tage, min_veraenderung)["Perioden_Bewertung"]
+        bewertung = pd.DataFrame({
+            "Start": [eintrag["Start_Datum"] for eintrag in perioden_bewertung],
+            "Ende": [eintrag["End_Datum"] for eintrag in perioden_bewertung],
+            "Signal": [eintrag["Bewertung"] for eintrag in perioden_bewertung],
+            "Kurs_Diff": [eintrag["Kurs_Diff"] for eintrag in perioden_bewertung],
+        })
 
         return {
             "signals": signals,
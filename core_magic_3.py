@@ -2,13 +2,31 @@ from pathlib import Path
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
 import streamlit as st
 import plotly.graph_objects as go
-from ta.trend import ADXIndicator
-from ta.momentum import StochasticOscillator
 import json
 from pathlib import Path
+from kursdaten_speicher import KursdatenSpeicher
+from ticker_metadaten import TickerMetadaten
+from indikator_zustand import IndikatorZustand
+from indikator_panel import IndikatorPanel
+from indikator_kernel import (
+    berechne_indikatoren_numpy,
+    parameter_spec,
+    INDIKATOR_GRUPPEN,
+    gruppen_parameter,
+    berechne_gruppe,
+    verbinde_indikatoren
+)
+from zwischenspeicher import LRUZwischenspeicher
+import threading
+from collections import OrderedDict
+
+# Persistenter Kursdaten-Speicher (Parquet je Symbol, Delta-Download)
+KURSDATEN_SPEICHER = KursdatenSpeicher("Kursdaten")
+
+# Gemeinsame Ticker-Metadaten (info, fast_info, Analysten) mit TTL
+TICKER_METADATEN = TickerMetadaten()
 
 # ------------------------------------------------------
 # Aktien aus der definierten Watchlist laden
@@ -50,19 +68,37 @@ def save_watchlist_json(watchlist, pfad="Watchlist.json"):
 # ------------------------------------------------------
 @st.cache_data(show_spinner=False)
 def lade_daten_aktie(symbol: str, period="3y") -> pd.DataFrame:
-    ticker = yf.Ticker(symbol)
-    data = ticker.history(period=period)
+    # Kurse aus dem lokalen Speicher, vom Provider wird nur das Delta geladen.
+    # Gleichzeitige Sessions: st.cache_data rechnet jeden Schlüssel nur einmal,
+    # der Speicher gleicht jedes Symbol nur einmal ab (auch für andere Perioden)
+    data = KURSDATEN_SPEICHER.lade(symbol, period=period)
     if data.empty:
         raise ValueError(f"Keine Daten für {symbol} gefunden.")
     return data
 
+# ------------------------------------------------------
+# Lade Daten der gesamten Watchlist (Sammel-Download)
+# ------------------------------------------------------
+def lade_watchlist_daten(period="4y", max_workers=4, aktien=None) -> dict:
+    """
+    Lädt die Kursdaten aller Watchlist-Aktien gebündelt (wenige Requests statt
+    einem je Symbol) und legt sie im Kursdaten-Speicher ab.
+    Danach liest lade_daten_aktie die Symbole ohne weiteren Netzwerkzugriff.
+
+    Rückgabe:
+    - Dict Symbol -> DataFrame (gleiches Format wie lade_daten_aktie)
+    """
+    if aktien is None:
+        aktien = lade_aktien()
+    symbole = [a["symbol"] for a in aktien]
+    return KURSDATEN_SPEICHER.lade_viele(symbole, period=period, max_workers=max_workers)
+
 # ------------------------------------------------------
 # Lade Fundamentaldaten
 # ------------------------------------------------------
-@st.cache_data(show_spinner=False)
 def lade_fundamentaldaten(ticker_symbol):
-    ticker = yf.Ticker(ticker_symbol)
-    info = ticker.info
+    # TICKER_METADATEN lädt je Symbol nur einmal, gleichzeitige Aufrufer warten darauf
+    info = TICKER_METADATEN.info(ticker_symbol)
     fundamentaldaten = {
         "sector": info.get("sector", "Unknown"),
         "kgv": info.get("trailingPE"),
@@ -94,12 +130,12 @@ def lade_fundamentaldaten(ticker_symbol):
     return fundamentaldaten
 
 def klassifiziere_aktie(symbol, data, fundamentaldaten):
-    ticker = yf.Ticker(symbol)
-    info = ticker.info
+    metadaten = TICKER_METADATEN.hole(symbol)
+    info = metadaten["info"]
 
     sector = info.get("sector")
     industry = info.get("industry")
-    marketcap = ticker.fast_info.get("market_cap") or info.get("marketCap")
+    marketcap = metadaten["market_cap"] or info.get("marketCap")
 
     kgv = fundamentaldaten.get("KGV")
     div = fundamentaldaten.get("Dividendenrendite (%)")
@@ -198,37 +234,15 @@ def klassifiziere_aktie(symbol, data, fundamentaldaten):
     }
 
 def lade_analystenbewertung(symbol):
-    ticker = yf.Ticker(symbol)
-    anal_data = {}
-
-    # Analysten-Empfehlungen (Buy/Hold/Sell)
-    try:
-        summary = ticker.recommendations_summary
-        # Falls summary nicht None und kein DataFrame, versuche Umwandlung
-        if summary is not None and not isinstance(summary, pd.DataFrame):
-            summary = pd.DataFrame(summary)
-        anal_data["summary"] = summary
-    except Exception as e:
-        anal_data["summary"] = None
-
-    # Historische Empfehlungen
-    try:
-        recs = ticker.recommendations
-        if recs is not None and not isinstance(recs, pd.DataFrame):
-            recs = pd.DataFrame(recs)
-        anal_data["recommendations"] = recs
-    except Exception as e:
-        anal_data["recommendations"] = None
-
-    # Tiefere Analyse wie Wachstum/Kennzahlen
-    try:
-        analysis = ticker.analysis
-        if analysis is not None and not isinstance(analysis, pd.DataFrame):
-            analysis = pd.DataFrame(analysis)
-        anal_data["analysis"] = analysis
-    except Exception as e:
-        anal_data["analysis"] = None
-
+    metadaten = TICKER_METADATEN.hole(symbol)
+
+    # Analysten-Empfehlungen (Buy/Hold/Sell), historische Empfehlungen
+    # und tiefere Analyse wie Wachstum/Kennzahlen
+    anal_data = {
+        "summary": metadaten["summary"],
+        "recommendations": metadaten["recommendations"],
+        "analysis": metadaten["analysis"]
+    }
     return anal_data
 
 
@@ -311,33 +325,116 @@ def erklaere_kategorien(profil: str, trading_status: str) -> str:
 # ------------------------------------------------------
 # Indikatoren berechnen
 # ------------------------------------------------------
-@st.cache_data(show_spinner=False)
-def berechne_indikatoren(data: pd.DataFrame) -> pd.DataFrame:
+# Backend: "numpy" (indikator_kernel, reine Array-Rechnung) oder "ta" (pandas + ta)
+INDIKATOR_BACKEND = "numpy"
+
+# Indikator-Cache (LRU, max. 256 MB) statt st.cache_data: kein Hashen des
+# DataFrames, kein Pickle/Kopie bei Treffern
+INDIKATOR_CACHE = LRUZwischenspeicher(max_bytes=256 * 1024 ** 2)
+
+def berechne_indikatoren(
+    data: pd.DataFrame,
+    backend: str = None,
+    symbol: str = None,
+    parameter: dict = None
+) -> pd.DataFrame:
+    """
+    Berechnet alle Indikatoren.
+    - parameter: Fensterlängen (siehe indikator_kernel.STANDARD_PARAMETER), z.B.
+      {"macd_kurz": 8, "macd_lang": 21, "macd_signal": 5}; fehlende Werte = Standard
+    - symbol: Ergebnis im INDIKATOR_CACHE ablegen, Schlüssel: (Symbol, letzte Bar
+      inkl. Schlusskurs, Zeilenzahl, Backend, Parameter). Beim NumPy-Backend wird
+      zusätzlich jede Spaltengruppe einzeln gecacht, so dass bei einer
+      Parameteränderung nur die betroffene Gruppe (z.B. MACD) neu berechnet wird.
+      Setzt `data` die zuletzt berechnete Historie fort (neue oder geänderte letzte
+      Bar), werden nur die neuen Bars fortgeschrieben (berechne_indikatoren_inkrementell).
+    Treffer teilen sich die Daten mit dem Cache und dürfen nicht in-place verändert werden.
+    Gleichzeitige Aufrufe mit demselben Schlüssel (z.B. mehrere Sessions) rechnen nur einmal.
+    """
+    backend = backend or INDIKATOR_BACKEND
+    parameter = parameter_spec(parameter)
+    if symbol is None or data.empty:
+        return _berechne_indikatoren(data, backend, parameter)
+
+    daten_schluessel = (symbol, data.index[-1], float(data["Close"].iat[-1]), len(data))
+    schluessel = daten_schluessel + (backend, tuple(sorted(parameter.items())))
+    if backend != "numpy":
+        return INDIKATOR_CACHE.hole_oder_berechne(
+            schluessel, lambda: _berechne_indikatoren(data, backend, parameter)
+        )
+
+    def berechne():
+        # Aktualisierung einer bekannten Historie: nur die neuen Bars fortschreiben
+        fortgeschrieben = _indikatoren_fortschreiben(symbol, data, parameter)
+        if fortgeschrieben is not None:
+            return fortgeschrieben
+        werte = {}
+        for gruppe in INDIKATOR_GRUPPEN:
+            gruppen_schluessel = daten_schluessel + ("gruppe", gruppe, gruppen_parameter(gruppe, parameter))
+            werte.update(INDIKATOR_CACHE.hole_oder_berechne(
+                gruppen_schluessel,
+                lambda: berechne_gruppe(
+                    gruppe, data["High"].to_numpy(), data["Low"].to_numpy(), data["Close"].to_numpy(), parameter
+                )
+            ))
+        return verbinde_indikatoren(data, werte)
+
+    return INDIKATOR_CACHE.hole_oder_berechne(schluessel, berechne)
+
+def berechne_indikatoren_panel(datensaetze: dict, parameter: dict = None) -> IndikatorPanel:
+    """
+    Indikatoren aller Symbole (Symbol -> Kurs-DataFrame) in einem 2-D-Durchlauf.
+    Das Panel liefert je Symbol Sichten ohne Kopie (frame/arrays) und je Spalte
+    eine (Datum × Symbol)-Matrix auf gemeinsamem Handelstag-Index.
+    Gecacht im INDIKATOR_CACHE, Schlüssel: Datenstand aller Symbole und Parameter.
+    """
+    parameter = parameter_spec(parameter)
+    daten_schluessel = tuple(
+        (symbol, data.index[-1], float(data["Close"].iat[-1]), len(data))
+        for symbol, data in datensaetze.items()
+        if data is not None and not data.empty
+    )
+    schluessel = ("panel", daten_schluessel, tuple(sorted(parameter.items())))
+    return INDIKATOR_CACHE.hole_oder_berechne(schluessel, lambda: IndikatorPanel(datensaetze, parameter))
+
+def _berechne_indikatoren(data: pd.DataFrame, backend: str, parameter: dict = None) -> pd.DataFrame:
+    if backend == "numpy":
+        return berechne_indikatoren_numpy(data, parameter)
+    if backend == "ta":
+        return berechne_indikatoren_ta(data, parameter)
+    raise ValueError(f"Unbekanntes Indikator-Backend: {backend}")
+
+def berechne_indikatoren_ta(data: pd.DataFrame, parameter: dict = None) -> pd.DataFrame:
+    # ta wird nur für dieses Backend geladen (Startzeit)
+    from ta.trend import ADXIndicator
+    from ta.momentum import StochasticOscillator
+    p = parameter_spec(parameter)
+
     # Berechne technische Indikatoren hier, z.B.:
     data = data.copy()
-    data["MA10"] = data["Close"].rolling(window=10).mean()
-    data["MA50"] = data["Close"].rolling(window=50).mean()
+    data["MA10"] = data["Close"].rolling(window=p["ma_kurz"]).mean()
+    data["MA50"] = data["Close"].rolling(window=p["ma_lang"]).mean()
 
     # Bollinger Bänder
-    ma20 = data["Close"].rolling(window=20).mean()
-    std20 = data["Close"].rolling(window=20).std()
+    ma20 = data["Close"].rolling(window=p["bb_fenster"]).mean()
+    std20 = data["Close"].rolling(window=p["bb_fenster"]).std()
     data["BB_Middle"] = ma20
-    data["BB_Upper"] = ma20 + 2 * std20
-    data["BB_Lower"] = ma20 - 2 * std20
+    data["BB_Upper"] = ma20 + p["bb_std"] * std20
+    data["BB_Lower"] = ma20 - p["bb_std"] * std20
 
     # MACD Beispiel (schnell/ langsam/ signal)
-    exp1 = data["Close"].ewm(span=12, adjust=False).mean()
-    exp2 = data["Close"].ewm(span=26, adjust=False).mean()
+    exp1 = data["Close"].ewm(span=p["macd_kurz"], adjust=False).mean()
+    exp2 = data["Close"].ewm(span=p["macd_lang"], adjust=False).mean()
     data["MACD"] = exp1 - exp2
-    data["MACD_Signal"] = data["MACD"].ewm(span=9, adjust=False).mean()
+    data["MACD_Signal"] = data["MACD"].ewm(span=p["macd_signal"], adjust=False).mean()
     data["MACD_Hist"] = data["MACD"] - data["MACD_Signal"]
 
     # RSI (14 Tage)
     delta = data["Close"].diff()
     gain = delta.clip(lower=0)
     loss = -delta.clip(upper=0)
-    avg_gain = gain.rolling(window=14).mean()
-    avg_loss = loss.rolling(window=14).mean()
+    avg_gain = gain.rolling(window=p["rsi_fenster"]).mean()
+    avg_loss = loss.rolling(window=p["rsi_fenster"]).mean()
     rs = avg_gain / avg_loss
     data["RSI"] = 100 - (100 / (1 + rs))
 
@@ -346,40 +443,105 @@ def berechne_indikatoren(data: pd.DataFrame) -> pd.DataFrame:
     high_close = (data["High"] - data["Close"].shift()).abs()
     low_close = (data["Low"] - data["Close"].shift()).abs()
     tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    data["ATR"] = tr.rolling(window=14).mean()
+    data["ATR"] = tr.rolling(window=p["atr_fenster"]).mean()
 
     # Beispiel Support/Resistance - hier Dummywerte (besser mit echter Methode berechnen)
-    data["Support1"] = data["Close"].rolling(window=20).min()
-    data["Support2"] = data["Close"].rolling(window=50).min()
-    data["Resistance1"] = data["Close"].rolling(window=20).max()
-    data["Resistance2"] = data["Close"].rolling(window=50).max()
+    data["Support1"] = data["Close"].rolling(window=p["support_kurz"]).min()
+    data["Support2"] = data["Close"].rolling(window=p["support_lang"]).min()
+    data["Resistance1"] = data["Close"].rolling(window=p["support_kurz"]).max()
+    data["Resistance2"] = data["Close"].rolling(window=p["support_lang"]).max()
 
     # Stochastic Oscillator
-    stoch = StochasticOscillator(data['High'], data['Low'], data['Close'], window=14, smooth_window=3)
+    stoch = StochasticOscillator(data['High'], data['Low'], data['Close'], window=p["stoch_fenster"], smooth_window=p["stoch_glaettung"])
     data['Stoch_%K'] = stoch.stoch()
     data['Stoch_%D'] = stoch.stoch_signal()
 
     # ADX
-    adx_ind = ADXIndicator(data['High'], data['Low'], data['Close'], window=14)
+    adx_ind = ADXIndicator(data['High'], data['Low'], data['Close'], window=p["adx_fenster"])
     data['ADX'] = adx_ind.adx()
     data['+DI'] = adx_ind.adx_pos()
     data['-DI'] = adx_ind.adx_neg()
 
     # Ichimoku Cloud berechnen 
-    high_9 = data['High'].rolling(window=9).max()
-    low_9 = data['Low'].rolling(window=9).min()
+    high_9 = data['High'].rolling(window=p["tenkan"]).max()
+    low_9 = data['Low'].rolling(window=p["tenkan"]).min()
     data['Tenkan_sen'] = (high_9 + low_9) / 2
     
-    high_26 = data['High'].rolling(window=26).max()
-    low_26 = data['Low'].rolling(window=26).min()
+    high_26 = data['High'].rolling(window=p["kijun"]).max()
+    low_26 = data['Low'].rolling(window=p["kijun"]).min()
     data['Kijun_sen'] = (high_26 + low_26) / 2
     
-    data['Senkou_Span_A'] = ((data['Tenkan_sen'] + data['Kijun_sen']) / 2).shift(26)
+    data['Senkou_Span_A'] = ((data['Tenkan_sen'] + data['Kijun_sen']) / 2).shift(p["kijun"])
     
-    high_52 = data['High'].rolling(window=52).max()
-    low_52 = data['Low'].rolling(window=52).min()
-    data['Senkou_Span_B'] = ((high_52 + low_52) / 2).shift(26)
+    high_52 = data['High'].rolling(window=p["senkou"]).max()
+    low_52 = data['Low'].rolling(window=p["senkou"]).min()
+    data['Senkou_Span_B'] = ((high_52 + low_52) / 2).shift(p["kijun"])
     
-    data['Chikou_Span'] = data['Close'].shift(-26)
+    data['Chikou_Span'] = data['Close'].shift(-p["kijun"])
 
-    return data
\ No newline at end of file
+    return data
+
+# ------------------------------------------------------
+# Indikatoren inkrementell fortschreiben (z.B. Intraday-Aktualisierung)
+# ------------------------------------------------------
+# (Symbol, Parameter) -> IndikatorZustand, die zuletzt genutzten bleiben erhalten
+INDIKATOR_ZUSTAENDE = OrderedDict()
+MAX_INDIKATOR_ZUSTAENDE = 64
+# (Symbol, Parameter) -> (erste, letzte Bar) der letzten vollständigen Berechnung
+_INDIKATOR_STAENDE = {}
+_ZUSTAND_SPERREN = {}
+_indikator_lock = threading.Lock()
+
+def _zustand_schluessel(symbol: str, parameter: dict) -> tuple:
+    return (symbol, tuple(sorted(parameter.items())))
+
+def _zustand_sperre(schluessel) -> threading.Lock:
+    with _indikator_lock:
+        return _ZUSTAND_SPERREN.setdefault(schluessel, threading.Lock())
+
+def berechne_indikatoren_inkrementell(symbol: str, data: pd.DataFrame, parameter: dict = None) -> pd.DataFrame:
+    """
+    Liefert dasselbe Ergebnis wie berechne_indikatoren(data, parameter=parameter),
+    rechnet aber nur die neuen (bzw. die geänderte letzte) Bars seit dem letzten
+    Aufruf für dieses Symbol und diese Parameter nach.
+
+    Der Zustand wird neu aufgebaut, wenn sich der Beginn der Daten verschoben hat
+    oder die Historie geändert wurde (z.B. neu adjustierte Kurse nach einem Split).
+    """
+    parameter = parameter_spec(parameter)
+    schluessel = _zustand_schluessel(symbol, parameter)
+    with _zustand_sperre(schluessel):
+        with _indikator_lock:
+            zustand = INDIKATOR_ZUSTAENDE.get(schluessel)
+        if zustand is not None and zustand.passt_zu(data):
+            frame = zustand.aktualisiere(data)
+        else:
+            zustand = IndikatorZustand(data, parameter)
+            frame = zustand.frame
+        with _indikator_lock:
+            INDIKATOR_ZUSTAENDE[schluessel] = zustand
+            INDIKATOR_ZUSTAENDE.move_to_end(schluessel)
+            while len(INDIKATOR_ZUSTAENDE) > MAX_INDIKATOR_ZUSTAENDE:
+                INDIKATOR_ZUSTAENDE.popitem(last=False)
+        return frame
+
+def _indikatoren_fortschreiben(symbol: str, data: pd.DataFrame, parameter: dict):
+    """
+    Refresh-Pfad von berechne_indikatoren: liefert den fortgeschriebenen Frame,
+    wenn es für (Symbol, Parameter) schon einen passenden Zustand gibt oder `data`
+    die zuletzt vollständig berechnete Historie fortsetzt (dann wird der Zustand
+    einmal aufgebaut, jede weitere Bar kostet nur noch konstante Zeit).
+    Sonst None: die erste Berechnung läuft vektorisiert.
+    """
+    schluessel = _zustand_schluessel(symbol, parameter)
+    with _indikator_lock:
+        zustand = INDIKATOR_ZUSTAENDE.get(schluessel)
+        stand = _INDIKATOR_STAENDE.get(schluessel)
+    fortsetzung = (zustand is not None and zustand.passt_zu(data)) or (
+        stand is not None and stand[0] == data.index[0] and data.index[-1] >= stand[1]
+    )
+    if fortsetzung:
+        return berechne_indikatoren_inkrementell(symbol, data, parameter)
+    with _indikator_lock:
+        _INDIKATOR_STAENDE[schluessel] = (data.index[0], data.index[-1])
+    return None
@@ -0,0 +1,417 @@
+import numpy as np
+import pandas as pd
+from signal_auswertung import ENTSCHEIDUNG_TEXTE, HALTEN, KAUFEN, VERKAUFEN, VorwaertsFenster, cluster_indizes, vorwaerts_max
+from signals_generation import Gewichtung
+
+# ------------------------------------------------------
+# Walk-Forward-Optimierung der Indikator-Gewichte
+# ------------------------------------------------------
+# Grundlage ist eine einmal berechnete Signalmatrix (Signale × Bars × Symbole)
+# mit den Werten -1/0/1 der IndikatorAnalyses.*_signal_2-Logik. Die Einzelsignale
+# werden dafür vektorisiert aus den Indikatorspalten berechnet, die Funktionen je
+# Zeile werden nie aufgerufen.
+#
+# Da jede Bar nur eines von 3^5 = 243 Signalmustern haben kann, wird je Zeitfenster
+# nur gezählt, wie oft jedes Muster vorkam und wie oft es ein Treffer war. Die
+# Bewertung aller Gewichtskandidaten ist danach eine Matrixmultiplikation über
+# die 243 Muster – unabhängig von der Anzahl Bars und Symbole.
+
+SIGNAL_NAMEN = ["RSI", "MACD", "ADX", "Bollinger", "Stochastic"]
+
+SIGNAL_TYPEN = {
+    "RSI": "Volatilitaet_Signale",
+    "MACD": "Trend_Signale",
+    "ADX": "Trend_Signale",
+    "Bollinger": "Volatilitaet_Signale",
+    "Stochastic": "Volatilitaet_Signale"
+}
+
+ANZAHL_MUSTER = 3 ** len(SIGNAL_NAMEN)
+
+# Alle Signalmuster als Matrix (243 × 5) mit Werten -1/0/1
+MUSTER = np.array(
+    [[(code // 3 ** i) % 3 - 1 for i in range(len(SIGNAL_NAMEN))] for code in range(ANZAHL_MUSTER)],
+    dtype=float
+)
+
+
+# ------------------------------------------------------
+# Einzelsignale je Bar (vektorisierte *_signal_2-Logik)
+# ------------------------------------------------------
+def _wert(data: pd.DataFrame, spalte: str) -> np.ndarray:
+    return data[spalte].to_numpy(dtype=float)
+
+
+def _vorher(werte: np.ndarray) -> np.ndarray:
+    vorher = np.empty_like(werte)
+    vorher[:1] = np.nan
+    vorher[1:] = werte[:-1]
+    return vorher
+
+
+def _signal(kauf: np.ndarray, verkauf: np.ndarray) -> np.ndarray:
+    return np.where(kauf, 1, np.where(verkauf, -1, 0)).astype(np.int8)
+
+
+def signal_matrix(data: pd.DataFrame) -> np.ndarray:
+    """
+    Einzelsignale aller Bars als Matrix (len(SIGNAL_NAMEN) × Bars), dtype int8.
+    Bars ohne gültiges Signal (zu wenig Vorlauf, fehlende Bänder) sind 0.
+    """
+    signale = np.zeros((len(SIGNAL_NAMEN), len(data)), dtype=np.int8)
+    if len(data) == 0:
+        return signale
+    mit_vorlauf = np.arange(len(data)) >= 1
+
+    # RSI
+    rsi = _wert(data, "RSI")
+    signale[0] = _signal(rsi < 35, rsi > 60)
+
+    # MACD (Kreuzung + Momentum + Mindestabstand, erst ab der dritten Bar)
+    macd, macd_signal = _wert(data, "MACD"), _wert(data, "MACD_Signal")
+    macd_vorher, signal_vorher = _vorher(macd), _vorher(macd_signal)
+    with np.errstate(invalid="ignore"):
+        momentum = macd - macd_vorher
+        abstand = np.abs(macd - macd_signal) > 0.1
+        bullish_cross = (macd_vorher < signal_vorher) & (macd > macd_signal)
+        bearish_cross = (macd_vorher > signal_vorher) & (macd < macd_signal)
+    signale[1] = _signal(bullish_cross & (momentum > 0) & abstand, bearish_cross & (momentum < 0) & abstand)
+    signale[1, :2] = 0
+
+    # ADX (unter der Schwelle kein Signal, sonst Richtung über +DI/-DI)
+    adx = _wert(data, "ADX")
+    trend = ~(adx < 25)
+    signale[2] = np.where(trend, np.where(_wert(data, "+DI") > _wert(data, "-DI"), 1, -1), 0)
+
+    # Bollinger (Nähe zum Band oder Rebound)
+    close, upper, lower = _wert(data, "Close"), _wert(data, "BB_Upper"), _wert(data, "BB_Lower")
+    close_vorher, upper_vorher, lower_vorher = _vorher(close), _vorher(upper), _vorher(lower)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kauf = ((close - lower) / lower <= 0.015) | ((close_vorher < lower_vorher) & (close > lower))
+        verkauf = ((upper - close) / upper <= 0.015) | ((close_vorher > upper_vorher) & (close < upper))
+    gueltig = mit_vorlauf & ~np.isnan(upper) & ~np.isnan(lower)
+    signale[3] = np.where(gueltig, _signal(kauf, verkauf), 0)
+
+    # Stochastic (Kreuzung im überverkauften/überkauften Bereich)
+    k, d = _wert(data, "Stoch_%K"), _wert(data, "Stoch_%D")
+    k_vorher, d_vorher = _vorher(k), _vorher(d)
+    kauf = (k_vorher < d_vorher) & (k > d) & (k < 20) & (d < 20)
+    verkauf = (k_vorher > d_vorher) & (k < d) & (k > 80) & (d > 80)
+    signale[4] = np.where(mit_vorlauf, _signal(kauf, verkauf), 0)
+    return signale
+
+
+def signal_tensor(datensaetze: dict) -> dict:
+    """
+    Signalmatrix für mehrere Symbole auf gemeinsamem Datumsindex.
+    datensaetze: Symbol -> DataFrame mit Indikatoren (berechne_indikatoren).
+    Rückgabe:
+    - signale: Signale × Bars × Symbole (int8, 0 an Tagen ohne Daten)
+    - kurse:   Bars × Symbole (Close, NaN an Tagen ohne Daten)
+    - index, symbole
+    """
+    symbole = list(datensaetze)
+    index = pd.DatetimeIndex([])
+    for data in datensaetze.values():
+        index = index.union(data.index)
+
+    signale = np.zeros((len(SIGNAL_NAMEN), len(index), len(symbole)), dtype=np.int8)
+    kurse = np.full((len(index), len(symbole)), np.nan)
+    for j, symbol in enumerate(symbole):
+        data = datensaetze[symbol]
+        zeilen = index.get_indexer(data.index)
+        signale[:, zeilen, j] = signal_matrix(data)
+        kurse[zeilen, j] = data["Close"].to_numpy(dtype=float)
+    return {"signale": signale, "kurse": kurse, "index": index, "symbole": symbole}
+
+
+# ------------------------------------------------------
+# Zählungen je Signalmuster
+# ------------------------------------------------------
+def _treffer_und_gueltig(kurse: np.ndarray, auswertung_tage: int, min_veraenderung: float):
+    """
+    Treffer je Bar und Symbol (Kursanstieg >= min_veraenderung innerhalb der nächsten
+    auswertung_tage Bars) und ob die Bar schon abschließend bewertet werden kann.
+    """
+    treffer = np.zeros(kurse.shape, dtype=bool)
+    gueltig = np.zeros(kurse.shape, dtype=bool)
+    for j in range(kurse.shape[1]):
+        kurs = kurse[:, j]
+        vorhanden = np.flatnonzero(~np.isnan(kurs))
+        if len(vorhanden) == 0:
+            continue
+        max_kurs = vorwaerts_max(kurs, auswertung_tage)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kurs_diff = (max_kurs - kurs) / kurs
+        treffer[:, j] = kurs_diff >= min_veraenderung
+        # Nur Bars, deren Auswertungsfenster vollständig in den Daten liegt
+        abgeschlossen = np.arange(len(kurs)) + auswertung_tage <= vorhanden[-1]
+        gueltig[:, j] = ~np.isnan(kurs_diff) & abgeschlossen
+    return treffer, gueltig
+
+
+def muster_zaehlungen(signale: np.ndarray, kurse: np.ndarray, auswertung_tage: int, min_veraenderung: float) -> dict:
+    """
+    Kumulierte Zählungen je Signalmuster über die Bars (Bars+1 × 243):
+    anzahl[b] - anzahl[a] = Vorkommen jedes Musters in den Bars [a, b) über alle Symbole.
+    """
+    code = np.zeros(signale.shape[1:], dtype=np.int64)
+    for i in range(len(SIGNAL_NAMEN)):
+        code += (signale[i].astype(np.int64) + 1) * 3 ** i
+
+    treffer, gueltig = _treffer_und_gueltig(kurse, auswertung_tage, min_veraenderung)
+    bars = np.broadcast_to(np.arange(code.shape[0])[:, None], code.shape)
+    schluessel = bars * ANZAHL_MUSTER + code
+
+    groesse = code.shape[0] * ANZAHL_MUSTER
+    anzahl = np.bincount(schluessel[gueltig], minlength=groesse).reshape(code.shape[0], ANZAHL_MUSTER)
+    treffer = np.bincount(schluessel[gueltig & treffer], minlength=groesse).reshape(code.shape[0], ANZAHL_MUSTER)
+
+    def kumuliert(werte):
+        return np.vstack([np.zeros((1, ANZAHL_MUSTER)), np.cumsum(werte, axis=0)])
+
+    return {"anzahl": kumuliert(anzahl), "treffer": kumuliert(treffer)}
+
+
+# ------------------------------------------------------
+# Gewichtskandidaten und Bewertung
+# ------------------------------------------------------
+def effektive_gewichte(weights: dict, trading_status: str = "Keine") -> np.ndarray:
+    """
+    Gewichte in SIGNAL_NAMEN-Reihenfolge inkl. Trading-Status-Faktor
+    (wie SwingTrading.kombiniertes_signal_2).
+    """
+    modifikator = Gewichtung.TRADING_STATUS_MODIFIKATOR[trading_status]
+    return np.array([
+        weights.get(name, 0.0) * modifikator.get(SIGNAL_TYPEN[name], 1.0) for name in SIGNAL_NAMEN
+    ])
+
+
+def gewichts_kandidaten(kategorie: str, anzahl: int = 2000, seed: int = 0) -> np.ndarray:
+    """
+    Basisgewichte (Kandidaten × SIGNAL_NAMEN), Summe je Kandidat 1 wie in
+    Gewichtung.KATEGORIE_STRATEGIEN. Nur die Signale der Kategorie erhalten Gewicht;
+    Kandidat 0 sind die aktuellen Gewichte.
+    """
+    strategie = Gewichtung.KATEGORIE_STRATEGIEN[kategorie]
+    spalten = [SIGNAL_NAMEN.index(name) for name in strategie["signale"]]
+
+    kandidaten = np.zeros((anzahl, len(SIGNAL_NAMEN)))
+    kandidaten[0, spalten] = [strategie["weights"][name] for name in strategie["signale"]]
+    rng = np.random.default_rng(seed)
+    kandidaten[1:, spalten] = rng.dirichlet(np.ones(len(spalten)), size=anzahl - 1)
+    return kandidaten
+
+
+def bewerte_kandidaten(gewichte: np.ndarray, schwellen: np.ndarray, anzahl: np.ndarray, treffer: np.ndarray) -> dict:
+    """
+    Kaufsignale und Treffer aller Kandidaten auf einmal.
+    gewichte: Kandidaten × Signale (effektiv), schwellen: Schwellen,
+    anzahl/treffer: Vorkommen je Muster im Zeitfenster.
+    Kaufsignal = Score > Schwelle (Verkauf analog bei < -Schwelle).
+    Rückgabe: Arrays Kandidaten × Schwellen.
+    """
+    score = gewichte @ MUSTER.T                                  # Kandidaten × Muster
+    kauf = (score[:, None, :] > schwellen[None, :, None]).astype(float)
+    signale = kauf @ anzahl
+    getroffen = kauf @ treffer
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quote = np.where(signale > 0, getroffen / signale * 100, np.nan)
+    return {"signale": signale, "treffer": getroffen, "trefferquote": quote}
+
+
+def optimiere_walk_forward(signale: np.ndarray,
+                           kurse: np.ndarray,
+                           kategorie: str,
+                           trading_status: str = "Keine",
+                           index=None,
+                           auswertung_tage: int = 61,
+                           min_veraenderung: float = 0.08,
+                           train_bars: int = 250,
+                           test_bars: int = 60,
+                           anzahl_kandidaten: int = 2000,
+                           schwellen=np.round(np.arange(0.05, 0.80, 0.05), 2),
+                           min_signale: int = 10,
+                           seed: int = 0,
+                           zaehlungen: dict = None) -> pd.DataFrame:
+    """
+    Walk-Forward-Optimierung der Gewichte und der Kaufschwelle einer Kategorie.
+    - signale: Signale × Bars × Symbole (signal_tensor / signal_matrix[..., None])
+    - kurse:   Bars × Symbole
+    Je Fold werden Gewichte und Schwelle mit der höchsten Trefferquote
+    (mindestens min_signale Kaufsignale) auf dem Trainingsfenster gewählt und auf dem
+    direkt folgenden Testfenster bewertet. Zwischen Training und Test liegen
+    auswertung_tage Bars, damit die Trainingsbewertung keine Testkurse sieht.
+    Zum Vergleich wird die aktuelle Gewichtung (Schwelle 0.25) mitbewertet.
+    """
+    schwellen = np.asarray(schwellen, dtype=float)
+    if zaehlungen is None:
+        zaehlungen = muster_zaehlungen(signale, kurse, auswertung_tage, min_veraenderung)
+    anzahl, treffer = zaehlungen["anzahl"], zaehlungen["treffer"]
+
+    basisgewichte = gewichts_kandidaten(kategorie, anzahl_kandidaten, seed)
+    faktoren = effektive_gewichte(dict.fromkeys(SIGNAL_NAMEN, 1.0), trading_status)
+    gewichte = basisgewichte * faktoren
+
+    bars = signale.shape[1]
+    index = pd.RangeIndex(bars) if index is None else index
+    folds = []
+    test_start = train_bars + auswertung_tage
+    while test_start < bars:
+        test_ende = min(test_start + test_bars, bars)
+        train_start, train_ende = test_start - auswertung_tage - train_bars, test_start - auswertung_tage
+
+        train_anzahl, train_treffer = anzahl[train_ende] - anzahl[train_start], treffer[train_ende] - treffer[train_start]
+        train = bewerte_kandidaten(gewichte, schwellen, train_anzahl, train_treffer)
+        quote = np.where(train["signale"] >= min_signale, train["trefferquote"], np.nan)
+        if np.all(np.isnan(quote)):
+            bester, schwelle = 0, 0.25       # kein Kandidat mit genug Signalen → aktuelle Gewichtung
+        else:
+            # Höchste Trefferquote, bei Gleichstand die meisten Signale
+            rang = np.nan_to_num(quote, nan=-1.0) * 1e6 + train["signale"]
+            bester, beste_schwelle = np.unravel_index(np.argmax(rang), rang.shape)
+            schwelle = schwellen[beste_schwelle]
+
+        test_anzahl, test_treffer = anzahl[test_ende] - anzahl[test_start], treffer[test_ende] - treffer[test_start]
+        train = bewerte_kandidaten(gewichte[[bester]], np.array([schwelle]), train_anzahl, train_treffer)
+        test = bewerte_kandidaten(gewichte[[bester]], np.array([schwelle]), test_anzahl, test_treffer)
+        basis = bewerte_kandidaten(gewichte[[0]], np.array([0.25]), test_anzahl, test_treffer)
+
+        folds.append({
+            "Train_Start": index[train_start],
+            "Train_Ende": index[train_ende - 1],
+            "Test_Start": index[test_start],
+            "Test_Ende": index[test_ende - 1],
+            **{name: basisgewichte[bester, i] for i, name in enumerate(SIGNAL_NAMEN)},
+            "Schwelle": schwelle,
+            "Train_Trefferquote": train["trefferquote"][0, 0],
+            "Train_Signale": int(train["signale"][0, 0]),
+            "Test_Trefferquote": test["trefferquote"][0, 0],
+            "Test_Signale": int(test["signale"][0, 0]),
+            "Basis_Test_Trefferquote": basis["trefferquote"][0, 0],
+            "Basis_Test_Signale": int(basis["signale"][0, 0]),
+        })
+        test_start = test_ende
+
+    return pd.DataFrame(folds)
+
+
+def empfohlene_gewichtung(folds: pd.DataFrame, kategorie: str) -> dict:
+    """
+    Fasst die Folds zu einem Eintrag im Format von Gewichtung.KATEGORIE_STRATEGIEN
+    zusammen (Median der Gewichte, normiert auf Summe 1) plus Median-Schwelle.
+    """
+    strategie = Gewichtung.KATEGORIE_STRATEGIEN[kategorie]
+    if folds.empty:
+        return {"signale": list(strategie["signale"]), "weights": dict(strategie["weights"]), "schwelle": 0.25}
+
+    median = folds[strategie["signale"]].median()
+    summe = median.sum()
+    weights = {name: round(float(median[name] / summe), 3) if summe > 0 else strategie["weights"][name] for name in strategie["signale"]}
+    return {"signale": list(strategie["signale"]), "weights": weights, "schwelle": float(folds["Schwelle"].median())}
+
+
+def optimiere_alle_kategorien(signale: np.ndarray, kurse: np.ndarray, trading_status: str = "Keine", **parameter) -> dict:
+    """
+    Walk-Forward-Optimierung für jede Kategorie aus Gewichtung.KATEGORIE_STRATEGIEN.
+    Die Musterzählungen hängen nicht von der Kategorie ab und werden nur einmal berechnet.
+    Rückgabe: Kategorie -> {"folds": DataFrame, "empfehlung": dict}
+    """
+    zaehlungen = muster_zaehlungen(
+        signale, kurse, parameter.get("auswertung_tage", 61), parameter.get("min_veraenderung", 0.08)
+    )
+    ergebnisse = {}
+    for kategorie in Gewichtung.KATEGORIE_STRATEGIEN:
+        folds = optimiere_walk_forward(signale, kurse, kategorie, trading_status, zaehlungen=zaehlungen, **parameter)
+        ergebnisse[kategorie] = {"folds": folds, "empfehlung": empfohlene_gewichtung(folds, kategorie)}
+    return ergebnisse
+
+
+# ------------------------------------------------------
+# Alle Kategorie-Strategien auf einmal (kombiniertes_signal_2)
+# ------------------------------------------------------
+def strategie_kombinationen() -> list:
+    """
+    Alle (Kategorie, Trading_Status)-Paare aus Gewichtung (6 × 3).
+    """
+    return [
+        (kategorie, trading_status)
+        for kategorie in Gewichtung.KATEGORIE_STRATEGIEN
+        for trading_status in Gewichtung.TRADING_STATUS_MODIFIKATOR
+    ]
+
+
+def strategie_entscheidungen(data: pd.DataFrame, min_len_window: int = 20) -> dict:
+    """
+    Entscheidung jeder Kategorie × Trading-Status-Kombination für jede Bar ab
+    min_len_window (wie SwingTrading.kombiniertes_signal_2 mit data.iloc[:i+1]).
+    Die fünf Einzelsignale werden einmal berechnet, alle Gewichtungen inkl.
+    Status-Faktor sind eine Matrix (Strategien × Signale) → ein Matrixprodukt.
+    Rückgabe:
+    - strategien: Liste (Kategorie, Trading_Status)
+    - score: Strategien × Bars (float), entscheidung: Strategien × Bars (int8, HALTEN/KAUFEN/VERKAUFEN)
+    - index: Datum der Bars
+    """
+    strategien = strategie_kombinationen()
+    gewichte = np.array([
+        effektive_gewichte(Gewichtung.KATEGORIE_STRATEGIEN[kategorie]["weights"], trading_status)
+        for kategorie, trading_status in strategien
+    ])
+    signale = signal_matrix(data)[:, min_len_window:].astype(float)
+
+    score = gewichte @ signale
+    entscheidung = np.select([score > 0.25, score < -0.25], [KAUFEN, VERKAUFEN], default=HALTEN).astype(np.int8)
+    return {"strategien": strategien, "score": score, "entscheidung": entscheidung, "index": data.index[min_len_window:]}
+
+
+def vergleiche_strategien(full_data: pd.DataFrame,
+                          auswertung_tage: int = 61,
+                          min_veraenderung: float = 0.08,
+                          min_len_window: int = 20,
+                          max_gap_days: int = 5) -> pd.DataFrame:
+    """
+    Backtest aller Kategorie × Trading-Status-Kombinationen für eine Aktie in einem Durchlauf.
+    Kennzahlen wie PeriodAnalysis.analyse_kaufsignal_perioden bzw. Algorithmus-Tab:
+    Trefferquote der Kaufsignale und der abgeschlossenen Kaufperioden.
+    Das Vorwärts-Fenster wird einmal berechnet, die Perioden aller Strategien
+    werden in einem Aufruf geclustert (je Strategie getrennt).
+    """
+    ergebnis = strategie_entscheidungen(full_data, min_len_window)
+    strategien, index = ergebnis["strategien"], ergebnis["index"]
+    anzahl_strategien = len(strategien)
+
+    fenster = VorwaertsFenster(full_data, auswertung_tage)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kurs_diff = ((fenster.max_kurse - fenster.kurse) / fenster.kurse)[min_len_window:]
+    getroffen = kurs_diff >= min_veraenderung
+
+    # Einzelsignale
+    kauf = ergebnis["entscheidung"] == KAUFEN
+    kaufsignale = kauf.sum(axis=1)
+    treffer = (kauf & getroffen).sum(axis=1)
+
+    # Perioden: alle (Strategie, Bar)-Kaufsignale auf einmal, Strategie als Gruppe
+    strategie_nr, bar = np.nonzero(kauf)
+    reihenfolge, _, ende = cluster_indizes(index[bar], max_gap_days, gruppen=strategie_nr)
+    ende_bar = bar[reihenfolge][ende]
+    ende_strategie = strategie_nr[reihenfolge][ende]
+    abgeschlossen = np.asarray(index[ende_bar] + pd.Timedelta(days=auswertung_tage) <= full_data.index[-1])
+    perioden = np.bincount(ende_strategie, minlength=anzahl_strategien)
+    perioden_abgeschlossen = np.bincount(ende_strategie[abgeschlossen], minlength=anzahl_strategien)
+    perioden_treffer = np.bincount(ende_strategie[abgeschlossen & getroffen[ende_bar]], minlength=anzahl_strategien)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quote_kauf = np.where(kaufsignale > 0, treffer / kaufsignale * 100, np.nan)
+        quote_perioden = np.where(perioden_abgeschlossen > 0, perioden_treffer / perioden_abgeschlossen * 100, np.nan)
+    letzte = ergebnis["entscheidung"][:, -1] if len(index) else np.full(anzahl_strategien, HALTEN, dtype=np.int8)
+
+    return pd.DataFrame({
+        "Kategorie": [kategorie for kategorie, _ in strategien],
+        "Trading_Status": [trading_status for _, trading_status in strategien],
+        "Kaufsignale": kaufsignale,
+        "Trefferquote_Kauf (%)": quote_kauf,
+        "Perioden": perioden,
+        "Perioden_abgeschlossen": perioden_abgeschlossen,
+        "Trefferquote_Perioden (%)": quote_perioden,
+        "Aktuelle_Entscheidung": np.array(ENTSCHEIDUNG_TEXTE, dtype=object)[letzte],
+    })
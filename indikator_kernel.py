@@ -0,0 +1,369 @@
+import math
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ------------------------------------------------------
+# NumPy-Kernels für die Indikatoren aus berechne_indikatoren
+# ------------------------------------------------------
+# Alle Funktionen arbeiten entlang Achse 0 (Zeit). Zusätzliche Achsen
+# (z.B. mehrere Symbole als Spalten) werden unverändert mitgerechnet.
+
+
+def _rollend(x: np.ndarray, fenster: int, funktion) -> np.ndarray:
+    """
+    Wendet `funktion` (z.B. np.mean, np.max) auf jedes Fenster an.
+    Die ersten fenster-1 Werte sind NaN (wie rolling(fenster) in pandas).
+    """
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.shape, np.nan)
+    if x.shape[0] >= fenster:
+        fenster_view = sliding_window_view(x, fenster, axis=0)
+        out[fenster - 1:] = funktion(fenster_view, axis=-1)
+    return out
+
+
+def rolling_mean(x, fenster: int) -> np.ndarray:
+    return _rollend(x, fenster, np.mean)
+
+
+def rolling_std(x, fenster: int) -> np.ndarray:
+    return _rollend(x, fenster, lambda w, axis: np.std(w, axis=axis, ddof=1))
+
+
+def rolling_min(x, fenster: int) -> np.ndarray:
+    return _rollend(x, fenster, np.min)
+
+
+def rolling_max(x, fenster: int) -> np.ndarray:
+    return _rollend(x, fenster, np.max)
+
+
+def verschiebe(x, n: int) -> np.ndarray:
+    """
+    Entspricht Series.shift(n) (positiv: nach hinten, negativ: nach vorne).
+    """
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.shape, np.nan)
+    if n > 0:
+        out[n:] = x[:-n]
+    elif n < 0:
+        out[:n] = x[-n:]
+    else:
+        out[:] = x
+    return out
+
+
+def rekursiver_filter(x, faktor: float, start=0.0) -> np.ndarray:
+    """
+    Berechnet y[t] = faktor * y[t-1] + x[t] mit y[-1] = start.
+
+    Statt einer Python-Schleife je Wert wird blockweise die geschlossene Form
+    y[s+j] = faktor^(j+1) * y[s-1] + faktor^j * cumsum(x[s+k] / faktor^k)
+    verwendet. Die Blocklänge ist so gewählt, dass faktor^-k klein bleibt.
+    """
+    x = np.asarray(x, dtype=float)
+    n = x.shape[0]
+    y = np.empty_like(x)
+    if n == 0:
+        return y
+    if not 0 <= faktor <= 1:
+        raise ValueError("faktor muss zwischen 0 und 1 liegen")
+    if faktor == 0:
+        y[:] = x
+        return y
+
+    block = n if faktor >= 1 else max(1, min(n, int(math.log(1e4) / -math.log(faktor))))
+    k = np.arange(block, dtype=float)
+    form = (block,) + (1,) * (x.ndim - 1)
+    potenz = (faktor ** k).reshape(form)              # faktor^j
+    inverse = (faktor ** -k).reshape(form)            # faktor^-k
+
+    vorher = np.broadcast_to(np.asarray(start, dtype=float), x.shape[1:]).copy()
+    for s in range(0, n, block):
+        e = min(s + block, n)
+        m = e - s
+        teil = potenz[:m] * np.cumsum(x[s:e] * inverse[:m], axis=0)
+        y[s:e] = teil + (faktor * potenz[:m]) * vorher
+        vorher = y[e - 1]
+    return y
+
+
+def ewm_mean(x, span: int) -> np.ndarray:
+    """
+    Entspricht Series.ewm(span=span, adjust=False).mean() (ohne NaN-Werte).
+    """
+    x = np.asarray(x, dtype=float)
+    alpha = 2.0 / (span + 1.0)
+    if x.shape[0] == 0:
+        return x.copy()
+    # y[0] = x[0]; y[t] = (1-alpha) * y[t-1] + alpha * x[t]
+    eingang = alpha * x
+    eingang[0] = x[0]
+    return rekursiver_filter(eingang, 1.0 - alpha)
+
+
+def _teile(zaehler, nenner) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.asarray(zaehler, dtype=float) / nenner
+
+
+# ------------------------------------------------------
+# Einzelne Indikatoren
+# ------------------------------------------------------
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9):
+    linie = ewm_mean(close, fast) - ewm_mean(close, slow)
+    signal_linie = ewm_mean(linie, signal)
+    return linie, signal_linie, linie - signal_linie
+
+
+def rsi(close, fenster: int = 14) -> np.ndarray:
+    """
+    RSI mit einfachem gleitenden Mittelwert (wie in berechne_indikatoren).
+    """
+    close = np.asarray(close, dtype=float)
+    delta = close - verschiebe(close, 1)
+    gain = np.where(np.isnan(delta), np.nan, np.clip(delta, 0, None))
+    loss = np.where(np.isnan(delta), np.nan, -np.clip(delta, None, 0))
+    rs = _teile(rolling_mean(gain, fenster), rolling_mean(loss, fenster))
+    return 100 - (100 / (1 + rs))
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """
+    True Range; die erste Bar hat keinen Vorschlusskurs und nutzt High - Low.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    vor_close = verschiebe(close, 1)
+    return np.fmax(np.fmax(high - low, np.abs(high - vor_close)), np.abs(low - vor_close))
+
+
+def stochastic(high, low, close, fenster: int = 14, glaettung: int = 3):
+    """
+    %K und %D wie ta.momentum.StochasticOscillator.
+    """
+    smin = rolling_min(low, fenster)
+    smax = rolling_max(high, fenster)
+    k = 100 * _teile(np.asarray(close, dtype=float) - smin, smax - smin)
+    return k, rolling_mean(k, glaettung)
+
+
+def adx(high, low, close, fenster: int = 14):
+    """
+    ADX, +DI und -DI wie ta.trend.ADXIndicator (Wilder-Glättung):
+    - die geglätteten Summen starten bei Bar `fenster` mit der Summe der Bars 1..fenster
+    - +DI/-DI sind bis einschließlich Bar `fenster` 0
+    - der ADX startet bei Bar 2*fenster-1 mit dem Mittelwert der DX-Werte ab Bar `fenster`
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    n = high.shape[0]
+    w = fenster
+    adx_werte = np.zeros(high.shape)
+    di_pos = np.zeros(high.shape)
+    di_neg = np.zeros(high.shape)
+    if n <= w:
+        return adx_werte, di_pos, di_neg
+
+    vor_close = close[:-1]
+    tr = np.maximum(high[1:], vor_close) - np.minimum(low[1:], vor_close)
+    diff_up = high[1:] - high[:-1]
+    diff_down = low[:-1] - low[1:]
+    pos = np.where((diff_up > diff_down) & (diff_up > 0), diff_up, 0.0)
+    neg = np.where((diff_down > diff_up) & (diff_down > 0), diff_down, 0.0)
+
+    # Bewegungen ab Bar 1 → Index i entspricht Bar i+1
+    faktor = 1.0 - 1.0 / w
+    geglaettet = []
+    for bewegung in (tr, pos, neg):
+        eingang = bewegung[w - 1:].copy()
+        eingang[0] = bewegung[:w].sum(axis=0)
+        geglaettet.append(rekursiver_filter(eingang, faktor))
+    trs, dip, din = geglaettet                        # Bars w..n-1
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dip_prozent = np.where(trs != 0, 100 * (dip / trs), 0.0)
+        din_prozent = np.where(trs != 0, 100 * (din / trs), 0.0)
+        summe = dip_prozent + din_prozent
+        dx = np.where(summe != 0, 100 * np.abs((dip_prozent - din_prozent) / summe), 0.0)
+
+    di_pos[w + 1:] = dip_prozent[1:]
+    di_neg[w + 1:] = din_prozent[1:]
+
+    if n >= 2 * w:
+        eingang = dx[w - 1:] / w
+        eingang[0] = dx[:w].mean(axis=0)
+        adx_werte[2 * w - 1:] = rekursiver_filter(eingang, (w - 1) / w)
+    return adx_werte, di_pos, di_neg
+
+
+# ------------------------------------------------------
+# Parameter und Spaltengruppen der Indikator-Pipeline
+# ------------------------------------------------------
+# Standardwerte (entsprechen den bisher fest eingebauten Fensterlängen).
+# Die Spaltennamen bleiben unabhängig von den Parametern gleich (z.B. "MA10").
+STANDARD_PARAMETER = {
+    "ma_kurz": 10,
+    "ma_lang": 50,
+    "bb_fenster": 20,
+    "bb_std": 2,
+    "macd_kurz": 12,
+    "macd_lang": 26,
+    "macd_signal": 9,
+    "rsi_fenster": 14,
+    "atr_fenster": 14,
+    "support_kurz": 20,
+    "support_lang": 50,
+    "stoch_fenster": 14,
+    "stoch_glaettung": 3,
+    "adx_fenster": 14,
+    "tenkan": 9,
+    "kijun": 26,
+    "senkou": 52,
+}
+
+
+def parameter_spec(parameter: dict = None) -> dict:
+    """
+    Ergänzt die übergebenen Parameter um die Standardwerte.
+    Unbekannte Parameter führen zu einem ValueError.
+    """
+    parameter = dict(parameter or {})
+    unbekannt = set(parameter) - set(STANDARD_PARAMETER)
+    if unbekannt:
+        raise ValueError(f"Unbekannte Indikator-Parameter: {', '.join(sorted(unbekannt))}")
+    return {**STANDARD_PARAMETER, **parameter}
+
+
+def _gruppe_ma(high, low, close, p):
+    return {"MA10": rolling_mean(close, p["ma_kurz"]), "MA50": rolling_mean(close, p["ma_lang"])}
+
+
+def _gruppe_bollinger(high, low, close, p):
+    mitte = rolling_mean(close, p["bb_fenster"])
+    std = rolling_std(close, p["bb_fenster"])
+    return {
+        "BB_Middle": mitte,
+        "BB_Upper": mitte + p["bb_std"] * std,
+        "BB_Lower": mitte - p["bb_std"] * std,
+    }
+
+
+def _gruppe_macd(high, low, close, p):
+    linie, signal, hist = macd(close, p["macd_kurz"], p["macd_lang"], p["macd_signal"])
+    return {"MACD": linie, "MACD_Signal": signal, "MACD_Hist": hist}
+
+
+def _gruppe_rsi(high, low, close, p):
+    return {"RSI": rsi(close, p["rsi_fenster"])}
+
+
+def _gruppe_atr(high, low, close, p):
+    return {"ATR": rolling_mean(true_range(high, low, close), p["atr_fenster"])}
+
+
+def _gruppe_support(high, low, close, p):
+    return {
+        "Support1": rolling_min(close, p["support_kurz"]),
+        "Support2": rolling_min(close, p["support_lang"]),
+        "Resistance1": rolling_max(close, p["support_kurz"]),
+        "Resistance2": rolling_max(close, p["support_lang"]),
+    }
+
+
+def _gruppe_stochastic(high, low, close, p):
+    k, d = stochastic(high, low, close, p["stoch_fenster"], p["stoch_glaettung"])
+    return {"Stoch_%K": k, "Stoch_%D": d}
+
+
+def _gruppe_adx(high, low, close, p):
+    adx_werte, di_pos, di_neg = adx(high, low, close, p["adx_fenster"])
+    return {"ADX": adx_werte, "+DI": di_pos, "-DI": di_neg}
+
+
+def _gruppe_ichimoku(high, low, close, p):
+    tenkan = (rolling_max(high, p["tenkan"]) + rolling_min(low, p["tenkan"])) / 2
+    kijun = (rolling_max(high, p["kijun"]) + rolling_min(low, p["kijun"])) / 2
+    senkou_b = (rolling_max(high, p["senkou"]) + rolling_min(low, p["senkou"])) / 2
+    return {
+        "Tenkan_sen": tenkan,
+        "Kijun_sen": kijun,
+        "Senkou_Span_A": verschiebe((tenkan + kijun) / 2, p["kijun"]),
+        "Senkou_Span_B": verschiebe(senkou_b, p["kijun"]),
+        "Chikou_Span": verschiebe(close, -p["kijun"]),
+    }
+
+
+# Gruppe -> (Parameter, von denen sie abhängt, Berechnung); Reihenfolge = Spaltenreihenfolge
+INDIKATOR_GRUPPEN = {
+    "MA": (("ma_kurz", "ma_lang"), _gruppe_ma),
+    "Bollinger": (("bb_fenster", "bb_std"), _gruppe_bollinger),
+    "MACD": (("macd_kurz", "macd_lang", "macd_signal"), _gruppe_macd),
+    "RSI": (("rsi_fenster",), _gruppe_rsi),
+    "ATR": (("atr_fenster",), _gruppe_atr),
+    "Support": (("support_kurz", "support_lang"), _gruppe_support),
+    "Stochastic": (("stoch_fenster", "stoch_glaettung"), _gruppe_stochastic),
+    "ADX": (("adx_fenster",), _gruppe_adx),
+    "Ichimoku": (("tenkan", "kijun", "senkou"), _gruppe_ichimoku),
+}
+
+
+def gruppen_parameter(gruppe: str, parameter: dict) -> tuple:
+    """
+    Die Parameterwerte, von denen eine Spaltengruppe abhängt (für Cache-Schlüssel).
+    """
+    namen, _ = INDIKATOR_GRUPPEN[gruppe]
+    return tuple((name, parameter[name]) for name in namen)
+
+
+def berechne_gruppe(gruppe: str, high, low, close, parameter: dict = None) -> dict:
+    """
+    Berechnet nur die Spalten einer Gruppe (z.B. "MACD" → MACD, MACD_Signal, MACD_Hist).
+    """
+    _, funktion = INDIKATOR_GRUPPEN[gruppe]
+    return funktion(
+        np.asarray(high, dtype=float),
+        np.asarray(low, dtype=float),
+        np.asarray(close, dtype=float),
+        parameter_spec(parameter),
+    )
+
+
+# ------------------------------------------------------
+# Alle Indikatoren aus berechne_indikatoren
+# ------------------------------------------------------
+def indikator_arrays(high, low, close, parameter: dict = None) -> dict:
+    """
+    Berechnet alle Indikatorspalten von berechne_indikatoren als Arrays
+    (Reihenfolge wie dort). Eingaben können 1D (eine Aktie) oder
+    2D (Zeit x Symbole) sein.
+    """
+    parameter = parameter_spec(parameter)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    werte = {}
+    for _, funktion in INDIKATOR_GRUPPEN.values():
+        werte.update(funktion(high, low, close, parameter))
+    return werte
+
+
+def verbinde_indikatoren(data: pd.DataFrame, werte: dict) -> pd.DataFrame:
+    """
+    Hängt die Indikatorspalten an die Kursdaten an (bestehende gleichnamige Spalten werden ersetzt).
+    """
+    indikatoren = pd.DataFrame(werte, index=data.index)
+    vorhanden = [spalte for spalte in data.columns if spalte not in werte]
+    return pd.concat([data[vorhanden], indikatoren], axis=1)
+
+
+def berechne_indikatoren_numpy(data: pd.DataFrame, parameter: dict = None) -> pd.DataFrame:
+    """
+    NumPy-Backend für berechne_indikatoren: gleiche Spalten, ohne pandas-Rolling und ohne `ta`.
+    """
+    werte = indikator_arrays(
+        data["High"].to_numpy(), data["Low"].to_numpy(), data["Close"].to_numpy(), parameter
+    )
+    return verbinde_indikatoren(data, werte)
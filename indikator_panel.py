@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+from indikator_kernel import indikator_arrays, parameter_spec
+
+# ------------------------------------------------------
+# Indikatoren für viele Symbole in einem 2-D-Durchlauf
+# ------------------------------------------------------
+# Die Kernels aus indikator_kernel rechnen entlang Achse 0 und nehmen weitere
+# Achsen einfach mit. Damit Rolling-Fenster und Glättungen im Handelskalender
+# des jeweiligen Symbols laufen (Feiertage von RHM.DE und NOW sind verschieden),
+# wird nicht auf dem gemeinsamen Datumsindex gerechnet, sondern auf der
+# Bar-Nummer: Zeile i = i-te Bar jedes Symbols, kürzere Historien werden am Ende
+# mit NaN aufgefüllt. Alle Kernels sind kausal (bis auf Chikou, das ohnehin
+# über das Datenende hinaus NaN ist), die Auffüllung verändert also nichts.
+# Erst danach werden die Ergebnisse auf den gemeinsamen Datumsindex gelegt.
+
+
+def handelstage(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """
+    Lokaler Handelstag je Bar (ohne Zeitzone und Uhrzeit).
+    """
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+class IndikatorPanel:
+    """
+    Indikatoren aller Symbole aus einem Aufruf
+    ------------------------------------------
+    - Speicher: ein Array (Symbole × Bars × Spalten), Spalten wie berechne_indikatoren
+    - je Symbol: werte()/arrays()/frame() sind Sichten ohne Kopie auf diesen Speicher
+    - ausgerichtet(spalte): (Datum × Symbol) auf dem gemeinsamen Handelstag-Index
+    Die Sichten teilen sich den Speicher mit dem Panel und dürfen nicht verändert werden.
+    """
+
+    def __init__(self, datensaetze: dict, parameter: dict = None):
+        datensaetze = {s: d for s, d in datensaetze.items() if d is not None and not d.empty}
+        self.parameter = parameter_spec(parameter)
+        self.symbole = list(datensaetze)
+        self.laengen = np.array([len(d) for d in datensaetze.values()], dtype=np.int64)
+        self.indizes = {s: d.index for s, d in datensaetze.items()}
+
+        # Rohspalten (Kurse, Volumen, ...) in der Reihenfolge des ersten Auftretens
+        roh = []
+        for data in datensaetze.values():
+            for spalte in data.columns:
+                if spalte not in roh and pd.api.types.is_numeric_dtype(data[spalte]):
+                    roh.append(spalte)
+
+        bars = int(self.laengen.max()) if len(self.laengen) else 0
+        eingaben = {spalte: np.full((bars, len(self.symbole)), np.nan) for spalte in roh}
+        for j, data in enumerate(datensaetze.values()):
+            for spalte in roh:
+                if spalte in data.columns:
+                    eingaben[spalte][:len(data), j] = data[spalte].to_numpy(dtype=float)
+
+        # Ein 2-D-Durchlauf für alle Symbole
+        if bars:
+            indikatoren = indikator_arrays(eingaben["High"], eingaben["Low"], eingaben["Close"], self.parameter)
+        else:
+            indikatoren = {}
+        self.spalten = [s for s in roh if s not in indikatoren] + list(indikatoren)
+        self._position = {spalte: k for k, spalte in enumerate(self.spalten)}
+
+        self._daten = np.empty((len(self.symbole), bars, len(self.spalten)))
+        for k, spalte in enumerate(self.spalten):
+            quelle = indikatoren[spalte] if spalte in indikatoren else eingaben[spalte]
+            self._daten[:, :, k] = quelle.T
+
+        # Gemeinsamer Datumsindex (lokaler Handelstag) und Zeile jeder Bar darin
+        tage = [handelstage(self.indizes[s]) for s in self.symbole]
+        index = pd.DatetimeIndex([])
+        for datum in tage:
+            index = index.union(datum)
+        self.index = index
+        self._zeilen = [index.get_indexer(datum) for datum in tage]
+        self._ausgerichtet = {}
+
+    def __len__(self):
+        return len(self.symbole)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._daten.nbytes + sum(werte.nbytes for werte in self._ausgerichtet.values()))
+
+    def __contains__(self, symbol):
+        return symbol in self.indizes
+
+    def _j(self, symbol: str) -> int:
+        return self.symbole.index(symbol)
+
+    # --- Sichten je Symbol (ohne Kopie) ---
+    def werte(self, symbol: str) -> np.ndarray:
+        """
+        (Bars × Spalten) des Symbols als Sicht auf den Panel-Speicher.
+        """
+        j = self._j(symbol)
+        return self._daten[j, :self.laengen[j]]
+
+    def arrays(self, symbol: str) -> dict:
+        """
+        Spalte -> 1-D-Sicht für ein Symbol.
+        """
+        werte = self.werte(symbol)
+        return {spalte: werte[:, k] for k, spalte in enumerate(self.spalten)}
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """
+        DataFrame des Symbols (gleiche Spalten und Index wie berechne_indikatoren),
+        die Werte sind eine Sicht auf den Panel-Speicher.
+        """
+        return pd.DataFrame(self.werte(symbol), index=self.indizes[symbol], columns=self.spalten, copy=False)
+
+    # --- Ausgerichtete Sicht über alle Symbole ---
+    @property
+    def position(self) -> np.ndarray:
+        """
+        (Datum × Symbol): Bar-Nummer des Symbols an diesem Handelstag, -1 ohne Kurs.
+        """
+        if "__position__" not in self._ausgerichtet:
+            position = np.full((len(self.index), len(self.symbole)), -1, dtype=np.int64)
+            for j, zeilen in enumerate(self._zeilen):
+                position[zeilen, j] = np.arange(len(zeilen))
+            self._ausgerichtet["__position__"] = position
+        return self._ausgerichtet["__position__"]
+
+    def ausgerichtet(self, spalte: str) -> np.ndarray:
+        """
+        (Datum × Symbol) einer Spalte auf dem gemeinsamen Index, NaN an Tagen ohne Kurs.
+        """
+        if not self.symbole:
+            return np.full((len(self.index), 0), np.nan)
+        if spalte not in self._ausgerichtet:
+            k = self._position[spalte]
+            werte = np.full((len(self.index), len(self.symbole)), np.nan)
+            for j, zeilen in enumerate(self._zeilen):
+                werte[zeilen, j] = self._daten[j, :len(zeilen), k]
+            self._ausgerichtet[spalte] = werte
+        return self._ausgerichtet[spalte]
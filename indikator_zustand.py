@@ -0,0 +1,571 @@
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+from indikator_kernel import parameter_spec
+
+# Reihenfolge der Spalten wie in core_magic_3.berechne_indikatoren
+INDIKATOR_SPALTEN = [
+    "MA10", "MA50",
+    "BB_Middle", "BB_Upper", "BB_Lower",
+    "MACD", "MACD_Signal", "MACD_Hist",
+    "RSI", "ATR",
+    "Support1", "Support2", "Resistance1", "Resistance2",
+    "Stoch_%K", "Stoch_%D",
+    "ADX", "+DI", "-DI",
+    "Tenkan_sen", "Kijun_sen", "Senkou_Span_A", "Senkou_Span_B", "Chikou_Span",
+]
+
+NAN = float("nan")
+
+
+# ------------------------------------------------------
+# Bausteine: laufende Fenster-Zustände (O(1) je Bar)
+# ------------------------------------------------------
+class RollendeSumme:
+    """
+    Summe und Quadratsumme über ein festes Fenster (wie rolling(fenster).mean()/.std()).
+    Alle `fenster` Schritte werden die Summen aus dem Fenster neu gebildet,
+    damit sich keine Rundungsfehler aufsummieren.
+    """
+
+    __slots__ = ("fenster", "werte", "summe", "quadrate", "gueltig", "schritte")
+
+    def __init__(self, fenster: int):
+        self.fenster = fenster
+        self.werte = deque()
+        self.summe = 0.0
+        self.quadrate = 0.0
+        self.gueltig = 0
+        self.schritte = 0
+
+    def neu(self, x: float):
+        self.werte.append(x)
+        if x == x:
+            self.summe += x
+            self.quadrate += x * x
+            self.gueltig += 1
+        if len(self.werte) > self.fenster:
+            alt = self.werte.popleft()
+            if alt == alt:
+                self.summe -= alt
+                self.quadrate -= alt * alt
+                self.gueltig -= 1
+
+        self.schritte += 1
+        if self.schritte >= self.fenster:
+            gueltige = [w for w in self.werte if w == w]
+            self.summe = math.fsum(gueltige)
+            self.quadrate = math.fsum(w * w for w in gueltige)
+            self.schritte = 0
+
+    def kopie(self):
+        neu = RollendeSumme.__new__(RollendeSumme)
+        neu.fenster = self.fenster
+        neu.werte = self.werte.copy()
+        neu.summe = self.summe
+        neu.quadrate = self.quadrate
+        neu.gueltig = self.gueltig
+        neu.schritte = self.schritte
+        return neu
+
+    def mittel(self) -> float:
+        if self.gueltig < self.fenster:
+            return NAN
+        return self.summe / self.gueltig
+
+    def std(self) -> float:
+        if self.gueltig < self.fenster or self.gueltig < 2:
+            return NAN
+        varianz = (self.quadrate - self.summe * self.summe / self.gueltig) / (self.gueltig - 1)
+        return math.sqrt(varianz) if varianz > 0 else 0.0
+
+
+class RollendesExtrem:
+    """
+    Minimum oder Maximum über ein festes Fenster mit monotoner Deque
+    (wie rolling(fenster).min()/.max()).
+    """
+
+    __slots__ = ("fenster", "ist_max", "kandidaten", "position")
+
+    def __init__(self, fenster: int, ist_max: bool):
+        self.fenster = fenster
+        self.ist_max = ist_max
+        self.kandidaten = deque()   # (Position, Wert), Werte monoton
+        self.position = -1
+
+    def neu(self, x: float):
+        self.position += 1
+        if x == x:
+            if self.ist_max:
+                while self.kandidaten and self.kandidaten[-1][1] <= x:
+                    self.kandidaten.pop()
+            else:
+                while self.kandidaten and self.kandidaten[-1][1] >= x:
+                    self.kandidaten.pop()
+            self.kandidaten.append((self.position, x))
+        while self.kandidaten and self.kandidaten[0][0] <= self.position - self.fenster:
+            self.kandidaten.popleft()
+
+    def kopie(self):
+        neu = RollendesExtrem.__new__(RollendesExtrem)
+        neu.fenster = self.fenster
+        neu.ist_max = self.ist_max
+        neu.kandidaten = self.kandidaten.copy()
+        neu.position = self.position
+        return neu
+
+    def wert(self) -> float:
+        if self.position < self.fenster - 1 or not self.kandidaten:
+            return NAN
+        return self.kandidaten[0][1]
+
+
+class EMA:
+    """
+    Exponentieller Mittelwert wie ewm(span=..., adjust=False).mean().
+    """
+
+    __slots__ = ("alpha", "wert")
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self.wert = None
+
+    def kopie(self):
+        neu = EMA.__new__(EMA)
+        neu.alpha = self.alpha
+        neu.wert = self.wert
+        return neu
+
+    def neu(self, x: float) -> float:
+        if self.wert is None:
+            self.wert = x
+        else:
+            self.wert = (1.0 - self.alpha) * self.wert + self.alpha * x
+        return self.wert
+
+
+class WilderADX:
+    """
+    +DI, -DI und ADX mit Wilder-Glättung, Bar für Bar wie ta.trend.ADXIndicator:
+    - die geglätteten Summen starten bei Bar `fenster` mit der Summe der Bars 1..fenster
+    - +DI/-DI sind bis einschließlich Bar `fenster` 0
+    - der ADX ist bis Bar 2*fenster-2 0, danach Mittelwert bzw. Wilder-Glättung der DX-Werte
+    """
+
+    __slots__ = ("fenster", "position", "vorher", "trs", "dip", "din", "dx_start", "adx")
+
+    def __init__(self, fenster: int = 14):
+        self.fenster = fenster
+        self.position = -1
+        self.vorher = None      # (High, Low, Close) der Vorbar
+        self.trs = 0.0
+        self.dip = 0.0
+        self.din = 0.0
+        self.dx_start = []
+        self.adx = 0.0
+
+    def kopie(self):
+        neu = WilderADX.__new__(WilderADX)
+        for feld in WilderADX.__slots__:
+            setattr(neu, feld, getattr(self, feld))
+        neu.dx_start = list(self.dx_start)
+        return neu
+
+    def neu(self, high: float, low: float, close: float):
+        """
+        Liefert (ADX, +DI, -DI) für die neue Bar.
+        """
+        self.position += 1
+        p = self.position
+        w = self.fenster
+        vorher = self.vorher
+        self.vorher = (high, low, close)
+        if vorher is None:
+            return 0.0, 0.0, 0.0
+
+        v_high, v_low, v_close = vorher
+        tr = max(high, v_close) - min(low, v_close)
+        diff_up = high - v_high
+        diff_down = v_low - low
+        pos = diff_up if (diff_up > diff_down and diff_up > 0) else 0.0
+        neg = diff_down if (diff_down > diff_up and diff_down > 0) else 0.0
+
+        if p <= w:
+            self.trs += tr
+            self.dip += pos
+            self.din += neg
+            if p < w:
+                return 0.0, 0.0, 0.0
+        else:
+            self.trs = self.trs - (self.trs / float(w)) + tr
+            self.dip = self.dip - (self.dip / float(w)) + pos
+            self.din = self.din - (self.din / float(w)) + neg
+
+        if self.trs != 0:
+            di_pos = 100 * (self.dip / self.trs)
+            di_neg = 100 * (self.din / self.trs)
+        else:
+            di_pos = di_neg = 0.0
+
+        if di_pos + di_neg != 0:
+            dx = 100 * abs((di_pos - di_neg) / (di_pos + di_neg))
+        else:
+            dx = 0.0
+
+        if p < 2 * w - 1:
+            self.dx_start.append(dx)
+            adx = 0.0
+        elif p == 2 * w - 1:
+            self.dx_start.append(dx)
+            self.adx = float(np.mean(self.dx_start))
+            self.dx_start = []
+            adx = self.adx
+        else:
+            self.adx = ((self.adx * (w - 1)) + dx) / float(w)
+            adx = self.adx
+
+        if p == w:
+            # ta setzt +DI/-DI der ersten geglätteten Bar auf 0
+            return adx, 0.0, 0.0
+        return adx, di_pos, di_neg
+
+
+class _Zustand:
+    """
+    Alle laufenden Zustände für eine Bar-Folge (wird vor jeder neuen Bar kopiert,
+    damit die letzte, noch offene Bar ersetzt werden kann).
+    Fensterlängen aus der Parameter-Spezifikation (siehe indikator_kernel.parameter_spec).
+    """
+
+    def __init__(self, p: dict):
+        self.p = p
+        self.position = -1
+        self.vor_close = None
+        self.ma_kurz = RollendeSumme(p["ma_kurz"])
+        self.ma_lang = RollendeSumme(p["ma_lang"])
+        self.bb = RollendeSumme(p["bb_fenster"])
+        self.ema_kurz = EMA(p["macd_kurz"])
+        self.ema_lang = EMA(p["macd_lang"])
+        self.ema_signal = EMA(p["macd_signal"])
+        self.gewinn = RollendeSumme(p["rsi_fenster"])
+        self.verlust = RollendeSumme(p["rsi_fenster"])
+        self.tr = RollendeSumme(p["atr_fenster"])
+        self.support_kurz = RollendesExtrem(p["support_kurz"], False)
+        self.support_lang = RollendesExtrem(p["support_lang"], False)
+        self.resistance_kurz = RollendesExtrem(p["support_kurz"], True)
+        self.resistance_lang = RollendesExtrem(p["support_lang"], True)
+        self.stoch_low = RollendesExtrem(p["stoch_fenster"], False)
+        self.stoch_high = RollendesExtrem(p["stoch_fenster"], True)
+        self.stoch_d = RollendeSumme(p["stoch_glaettung"])
+        self.adx = WilderADX(p["adx_fenster"])
+        ichimoku = {p["tenkan"], p["kijun"], p["senkou"]}
+        self.high_max = {f: RollendesExtrem(f, True) for f in ichimoku}
+        self.low_min = {f: RollendesExtrem(f, False) for f in ichimoku}
+        self.senkou_a = deque(maxlen=p["kijun"] + 1)
+        self.senkou_b = deque(maxlen=p["kijun"] + 1)
+
+    def kopie(self):
+        neu = _Zustand.__new__(_Zustand)
+        for feld, wert in self.__dict__.items():
+            if feld == "p":
+                pass
+            elif hasattr(wert, "kopie"):
+                wert = wert.kopie()
+            elif isinstance(wert, dict):
+                wert = {k: v.kopie() for k, v in wert.items()}
+            elif isinstance(wert, deque):
+                wert = wert.copy()
+            setattr(neu, feld, wert)
+        return neu
+
+
+def _quotient(zaehler: float, nenner: float) -> float:
+    # Division mit pandas-Semantik (x/0 → ±inf, 0/0 → NaN)
+    if nenner == 0:
+        if zaehler == 0 or zaehler != zaehler:
+            return NAN
+        return math.copysign(math.inf, zaehler) * math.copysign(1.0, nenner)
+    return zaehler / nenner
+
+
+def _neue_bar(z: _Zustand, high: float, low: float, close: float) -> dict:
+    """
+    Schreibt eine Bar in den Zustand fort und liefert die Indikatorwerte der Bar.
+    """
+    p = z.p
+    z.position += 1
+    werte = {}
+
+    z.ma_kurz.neu(close)
+    z.ma_lang.neu(close)
+    z.bb.neu(close)
+    werte["MA10"] = z.ma_kurz.mittel()
+    werte["MA50"] = z.ma_lang.mittel()
+
+    # Bollinger Bänder
+    mitte = z.bb.mittel()
+    std = z.bb.std()
+    werte["BB_Middle"] = mitte
+    werte["BB_Upper"] = mitte + p["bb_std"] * std
+    werte["BB_Lower"] = mitte - p["bb_std"] * std
+
+    # MACD
+    macd = z.ema_kurz.neu(close) - z.ema_lang.neu(close)
+    signal = z.ema_signal.neu(macd)
+    werte["MACD"] = macd
+    werte["MACD_Signal"] = signal
+    werte["MACD_Hist"] = macd - signal
+
+    # RSI (einfacher gleitender Mittelwert)
+    vor_close = z.vor_close
+    if vor_close is None:
+        z.gewinn.neu(NAN)
+        z.verlust.neu(NAN)
+    else:
+        delta = close - vor_close
+        z.gewinn.neu(delta if delta > 0 else 0.0)
+        z.verlust.neu(-delta if delta < 0 else 0.0)
+    rs = _quotient(z.gewinn.mittel(), z.verlust.mittel())
+    werte["RSI"] = 100 - (100 / (1 + rs)) if rs == rs else NAN
+
+    # ATR
+    if vor_close is None:
+        tr = high - low
+    else:
+        tr = max(high - low, abs(high - vor_close), abs(low - vor_close))
+    z.tr.neu(tr)
+    werte["ATR"] = z.tr.mittel()
+
+    # Support/Resistance
+    for extrem in (z.support_kurz, z.support_lang, z.resistance_kurz, z.resistance_lang):
+        extrem.neu(close)
+    werte["Support1"] = z.support_kurz.wert()
+    werte["Support2"] = z.support_lang.wert()
+    werte["Resistance1"] = z.resistance_kurz.wert()
+    werte["Resistance2"] = z.resistance_lang.wert()
+
+    # Stochastic Oscillator
+    z.stoch_low.neu(low)
+    z.stoch_high.neu(high)
+    smin = z.stoch_low.wert()
+    smax = z.stoch_high.wert()
+    stoch_k = 100 * _quotient(close - smin, smax - smin) if smin == smin else NAN
+    z.stoch_d.neu(stoch_k)
+    werte["Stoch_%K"] = stoch_k
+    werte["Stoch_%D"] = z.stoch_d.mittel()
+
+    # ADX
+    werte["ADX"], werte["+DI"], werte["-DI"] = z.adx.neu(high, low, close)
+
+    # Ichimoku (Chikou Span wird im IndikatorZustand aus dem Close nachgetragen)
+    for fenster in z.high_max:
+        z.high_max[fenster].neu(high)
+        z.low_min[fenster].neu(low)
+    tenkan = (z.high_max[p["tenkan"]].wert() + z.low_min[p["tenkan"]].wert()) / 2
+    kijun = (z.high_max[p["kijun"]].wert() + z.low_min[p["kijun"]].wert()) / 2
+    werte["Tenkan_sen"] = tenkan
+    werte["Kijun_sen"] = kijun
+    z.senkou_a.append((tenkan + kijun) / 2)
+    z.senkou_b.append((z.high_max[p["senkou"]].wert() + z.low_min[p["senkou"]].wert()) / 2)
+    voll = len(z.senkou_a) == z.senkou_a.maxlen
+    werte["Senkou_Span_A"] = z.senkou_a[0] if voll else NAN
+    werte["Senkou_Span_B"] = z.senkou_b[0] if voll else NAN
+    werte["Chikou_Span"] = NAN
+
+    z.vor_close = close
+    return werte
+
+
+class _Spaltenpuffer:
+    """
+    Spalten eines wachsenden Frames als vorab angelegte Arrays
+    ----------------------------------------------------------
+    - schreibe(ab, ...): schreibt Zeilen ab Position `ab`, die Kapazität
+      verdoppelt sich bei Bedarf (Anhängen kostet amortisiert konstante Zeit)
+    - sicht(): schreibgeschützte Arrays der bisherigen Zeilen, ohne Kopie
+    Ausgegebene Sichten teilen sich den Anfang der Arrays und sehen später
+    angehängte Zeilen nicht. Muss eine schon ausgegebene Zeile überschrieben
+    werden (ersetzte letzte Bar), wird vorher in neue Arrays umkopiert.
+    """
+
+    KAPAZITAET = 256
+
+    def __init__(self, spalten: list):
+        self.spalten = list(spalten)
+        self._arrays = {}
+        self._zeit = np.empty(0, dtype=np.int64)
+        self._laenge = 0
+        self._ausgegeben = 0
+
+    def _umkopieren(self, kapazitaet: int, behalten: int):
+        zeit = np.empty(kapazitaet, dtype=np.int64)
+        zeit[:behalten] = self._zeit[:behalten]
+        self._zeit = zeit
+        for spalte, alt in self._arrays.items():
+            neu = np.empty(kapazitaet, dtype=alt.dtype)
+            neu[:behalten] = alt[:behalten]
+            self._arrays[spalte] = neu
+        self._ausgegeben = 0
+
+    def schreibe(self, ab: int, zeit: np.ndarray, werte: dict):
+        """
+        Schreibt len(zeit) Zeilen ab Position `ab`, alles dahinter entfällt.
+        zeit: Zeitstempel als int64 (DatetimeIndex.asi8), werte: Spalte -> Array
+        """
+        ende = ab + len(zeit)
+        if ende > len(self._zeit):
+            self._umkopieren(max(self.KAPAZITAET, 2 * ende), ab)
+        elif ab < self._ausgegeben:
+            self._umkopieren(len(self._zeit), ab)
+        self._zeit[ab:ende] = zeit
+        for spalte in self.spalten:
+            neu = np.asarray(werte[spalte])
+            alt = self._arrays.get(spalte)
+            if alt is None or not np.can_cast(neu.dtype, alt.dtype, "safe"):
+                dtype = neu.dtype if alt is None else np.result_type(alt.dtype, neu.dtype)
+                puffer = np.empty(len(self._zeit), dtype=dtype)
+                if alt is not None:
+                    puffer[:ab] = alt[:ab]
+                self._arrays[spalte] = alt = puffer
+            alt[ab:ende] = neu
+        self._laenge = ende
+
+    def sicht(self) -> tuple:
+        """
+        (Zeitstempel, Spalte -> Array) der bisherigen Zeilen, schreibgeschützt und ohne Kopie.
+        """
+        n = self._laenge
+        self._ausgegeben = n
+        arrays = {}
+        for spalte in self.spalten:
+            arrays[spalte] = self._arrays[spalte][:n]
+            arrays[spalte].flags.writeable = False
+        zeit = self._zeit[:n]
+        zeit.flags.writeable = False
+        return zeit, arrays
+
+
+class IndikatorZustand:
+    """
+    Inkrementelle Indikatorberechnung
+    ---------------------------------
+    Hält für jede Spalte von berechne_indikatoren den laufenden Zustand
+    (Fenstersummen, EMA-Werte, Wilder-Glättung, Min/Max-Deques) für eine
+    Parameter-Spezifikation. Eine neue Bar kostet damit konstante Zeit statt
+    einer Neuberechnung über die ganze Historie. Die Spalten liegen in
+    wachsenden Arrays (_Spaltenpuffer); ein neuer Frame ist eine Sicht auf
+    deren Anfang, nur die Chikou Span (Close um `kijun` Bars zurückversetzt)
+    wird je Frame neu gebildet. Die Werte entsprechen berechne_indikatoren(data,
+    parameter=parameter) bis auf Rundungsdifferenzen.
+
+    Eine Bar mit dem Zeitstempel der letzten Bar ersetzt diese (offener Handelstag);
+    dafür werden die Arrays einmal umkopiert, weil ausgegebene Frames die alte Bar behalten.
+    Erwartet einen DatetimeIndex.
+    """
+
+    def __init__(self, data: pd.DataFrame, parameter: dict = None):
+        self.parameter = parameter_spec(parameter)
+        self._zustand = _Zustand(self.parameter)
+        self._vor_letzter_bar = None
+        self._rohspalten = list(data.columns)
+        self._index_dtype = data.index.dtype
+        self._index_name = data.index.name
+        self._puffer = _Spaltenpuffer(self._rohspalten + INDIKATOR_SPALTEN[:-1])
+        self._schreibe(0, data)
+
+    def __len__(self):
+        return len(self._frame)
+
+    @property
+    def rohspalten(self) -> list:
+        return list(self._rohspalten)
+
+    @property
+    def letzter_zeitpunkt(self):
+        return self._frame.index[-1] if len(self._frame) else None
+
+    def passt_zu(self, data: pd.DataFrame) -> bool:
+        """
+        True, wenn `data` die bekannte Historie fortsetzt: gleicher Beginn, gleiche
+        Rohspalten und unveränderte vorletzte Bar (sonst z.B. neu adjustierte Kurse).
+        """
+        if len(self) < 2 or data.empty:
+            return False
+        if list(data.columns[:len(self._rohspalten)]) != self._rohspalten:
+            return False
+        vorletzter = self._frame.index[-2]
+        return bool(
+            self._frame.index[0] == data.index[0]
+            and vorletzter in data.index
+            and data.at[vorletzter, "Close"] == self._frame.at[vorletzter, "Close"]
+        )
+
+    def _fortschreiben(self, neu: pd.DataFrame) -> dict:
+        """
+        Schreibt die Bars aus `neu` in den Zustand fort und liefert die
+        Indikatorwerte dieser Bars (Spalte -> Liste).
+        """
+        werte = {spalte: [] for spalte in INDIKATOR_SPALTEN}
+        letzte = len(neu) - 1
+        high = neu["High"].to_numpy(dtype=float)
+        low = neu["Low"].to_numpy(dtype=float)
+        close = neu["Close"].to_numpy(dtype=float)
+        for i in range(len(neu)):
+            # Nur der Zustand vor der letzten Bar muss gesichert werden
+            self._vor_letzter_bar = self._zustand.kopie() if i == letzte else None
+            bar = _neue_bar(self._zustand, high[i], low[i], close[i])
+            for spalte in INDIKATOR_SPALTEN:
+                werte[spalte].append(bar[spalte])
+        return werte
+
+    def _schreibe(self, ab: int, neu: pd.DataFrame):
+        # Bars aus `neu` ab Zeile `ab` in den Puffer schreiben und den Frame neu bilden
+        werte = {spalte: np.asarray(liste, dtype=float) for spalte, liste in self._fortschreiben(neu).items()}
+        for spalte in self._rohspalten:
+            werte[spalte] = neu[spalte].to_numpy()
+        self._puffer.schreibe(ab, neu.index.asi8, werte)
+
+        zeit, arrays = self._puffer.sicht()
+        kijun = self.parameter["kijun"]
+        close = arrays["Close"]
+        chikou = np.full(len(close), NAN)
+        if len(close) > kijun:
+            chikou[:-kijun] = close[kijun:]
+        arrays["Chikou_Span"] = chikou
+        index = pd.DatetimeIndex(zeit, dtype=self._index_dtype, name=self._index_name, copy=False)
+        self._frame = pd.DataFrame(arrays, index=index, copy=False)
+
+    def aktualisiere(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Übernimmt alle Bars aus `data`, die ab der letzten bekannten Bar liegen
+        (die letzte bekannte Bar wird dabei ersetzt), und liefert den vollständigen Frame.
+        Der bisherige Frame bleibt unverändert, es wird ein neuer geliefert, der
+        sich die unveränderten Zeilen mit ihm teilt.
+        """
+        neu = data.iloc[data.index.searchsorted(self.letzter_zeitpunkt):] if len(self) else data
+        if neu.empty:
+            return self._frame
+        behalten = len(self._frame)
+        if neu.index[0] == self.letzter_zeitpunkt:
+            if neu.iloc[:1][self._rohspalten].equals(self._frame.iloc[-1:][self._rohspalten]):
+                # Letzte Bar unverändert: nur anhängen
+                neu = neu.iloc[1:]
+                if neu.empty:
+                    return self._frame
+            else:
+                # Letzte Bar ersetzen: Zustand vor dieser Bar wiederherstellen
+                self._zustand = self._vor_letzter_bar
+                behalten -= 1
+        self._schreibe(behalten, neu)
+        return self._frame
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        Kursdaten mit allen Indikatoren (gleiche Spalten wie berechne_indikatoren).
+        Der Frame wird geteilt und darf nicht verändert werden.
+        """
+        return self._frame
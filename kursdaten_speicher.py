@@ -0,0 +1,348 @@
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yfinance as yf
+
+# ------------------------------------------------------
+# Standard-Provider: Kursdaten über yfinance laden
+# ------------------------------------------------------
+def yfinance_provider(symbol: str, period: str = None, start=None) -> pd.DataFrame:
+    """
+    Lädt Kursdaten für ein Symbol.
+    - period: Zeitraum wie bei yfinance ("3y", "4y", ...) für einen Voll-Download
+    - start: Startdatum (inklusive) für einen Delta-Download
+    """
+    ticker = yf.Ticker(symbol)
+    if start is not None:
+        return ticker.history(start=start)
+    return ticker.history(period=period)
+
+
+def yfinance_download(symbole: list, period: str = None, start=None) -> dict:
+    """
+    Lädt Kursdaten für mehrere Symbole in einem Request und liefert ein
+    Dict Symbol → DataFrame (gleiches Format wie Ticker.history).
+    """
+    zeitraum = {"start": start} if start is not None else {"period": period}
+    data = yf.download(
+        tickers=list(symbole),
+        group_by="ticker",
+        actions=True,
+        auto_adjust=True,
+        ignore_tz=False,
+        threads=False,
+        progress=False,
+        **zeitraum
+    )
+    ergebnis = teile_download(data, symbole)
+
+    # yf.download rechnet alle Symbole in die häufigste Zeitzone um
+    # → jede Börse wieder in ihre eigene Zeitzone zurückrechnen
+    tz_cache = yf.cache.get_tz_cache()
+    for symbol, einzel in ergebnis.items():
+        tz = tz_cache.lookup(symbol)
+        if tz and isinstance(einzel.index, pd.DatetimeIndex) and einzel.index.tz is not None:
+            einzel.index = einzel.index.tz_convert(tz)
+    return ergebnis
+
+
+def teile_download(data: pd.DataFrame, symbole: list) -> dict:
+    """
+    Zerlegt das Ergebnis eines Sammel-Downloads in einzelne DataFrames je Symbol
+    (gleiches Format wie Ticker.history).
+    """
+    ergebnis = {}
+    if data is None or data.empty:
+        return ergebnis
+
+    for symbol in symbole:
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            einzel = data[symbol]
+        elif len(symbole) == 1:
+            einzel = data
+        else:
+            continue
+
+        # Zeilen aus dem gemeinsamen Index der anderen Symbole entfernen
+        einzel = einzel.dropna(subset=["Close"])
+        if einzel.empty:
+            continue
+        spalten = [s for s in ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"] if s in einzel.columns]
+        spalten += [s for s in einzel.columns if s not in spalten]
+        einzel = einzel[spalten].copy()
+        einzel.columns.name = None
+        ergebnis[symbol] = einzel
+    return ergebnis
+
+
+def period_start(period: str, jetzt: pd.Timestamp):
+    """
+    Rechnet einen yfinance-Zeitraum ("5d", "6mo", "1y", "4y", "max") in ein Startdatum um.
+    Für "max" wird None zurückgegeben.
+    """
+    if period is None or period == "max":
+        return None
+    for endung, einheit in [("mo", "months"), ("wk", "weeks"), ("y", "years"), ("d", "days")]:
+        if period.endswith(endung):
+            anzahl = int(period[: -len(endung)])
+            return jetzt - pd.DateOffset(**{einheit: anzahl})
+    raise ValueError(f"Unbekannter Zeitraum: {period}")
+
+
+class KursdatenSpeicher:
+    """
+    Persistenter Kursdaten-Speicher (eine Parquet-Datei je Symbol)
+    -------------------------------------------------------------
+    - Beim ersten Aufruf wird die komplette Historie geladen und gespeichert
+    - Danach werden nur noch die Kurse ab dem letzten gespeicherten Tag nachgeladen
+      und angehängt (der letzte Tag wird dabei aktualisiert, da er noch offen sein kann)
+    - Gelesen wird spaltenweise über eine memory-mapped Parquet-Datei
+    """
+
+    # Toleranz zwischen gewünschtem Startdatum und erstem gespeicherten Handelstag
+    # (Wochenenden, Feiertage)
+    START_TOLERANZ = pd.Timedelta(days=7)
+
+    # Zeitraum, in dem ein frisch synchronisiertes Symbol ohne Delta-Request gelesen wird
+    AKTUALITAET = pd.Timedelta(minutes=15)
+
+    def __init__(
+        self,
+        verzeichnis="Kursdaten",
+        provider=yfinance_provider,
+        sammel_provider=yfinance_download
+    ):
+        self.verzeichnis = Path(verzeichnis)
+        self.provider = provider
+        self.sammel_provider = sammel_provider
+        self._synchronisiert = {}
+        self._sperren = {}        # Symbol -> Lock (ein Abgleich je Symbol)
+        self._lock = threading.Lock()
+
+    def _sperre(self, symbol: str) -> threading.Lock:
+        with self._lock:
+            return self._sperren.setdefault(symbol, threading.Lock())
+
+    def pfad(self, symbol: str) -> Path:
+        dateiname = symbol.replace("/", "_").replace("\\", "_")
+        return self.verzeichnis / f"{dateiname}.parquet"
+
+    def lese(self, symbol: str):
+        file = self.pfad(symbol)
+        if not file.exists():
+            return None
+        tabelle = pq.read_table(file, memory_map=True)
+        return tabelle.to_pandas()
+
+    def schreibe(self, symbol: str, data: pd.DataFrame):
+        self.verzeichnis.mkdir(parents=True, exist_ok=True)
+        file = self.pfad(symbol)
+        # Eindeutige Temp-Datei im selben Verzeichnis, dann atomar ersetzen
+        with tempfile.NamedTemporaryFile(dir=self.verzeichnis, prefix=file.stem + ".", suffix=".tmp", delete=False) as tmp:
+            tmp_pfad = Path(tmp.name)
+        try:
+            pq.write_table(pa.Table.from_pandas(data), tmp_pfad)
+            os.replace(tmp_pfad, file)
+        except BaseException:
+            tmp_pfad.unlink(missing_ok=True)
+            raise
+
+    def letzter_zeitpunkt(self, symbol: str):
+        """
+        Liefert den letzten gespeicherten Zeitstempel, ohne die Kursdaten zu laden.
+        """
+        file = self.pfad(symbol)
+        if not file.exists():
+            return None
+        index_name = pq.read_schema(file).pandas_metadata["index_columns"][0]
+        spalte = pq.read_table(file, columns=[index_name], memory_map=True).column(0)
+        if len(spalte) == 0:
+            return None
+        return pd.Timestamp(spalte[len(spalte) - 1].as_py())
+
+    def ergaenze(self, symbol: str, gespeichert: pd.DataFrame, neu: pd.DataFrame) -> pd.DataFrame:
+        """
+        Hängt neue Kurse an die gespeicherten an (doppelte Tage werden überschrieben)
+        und speichert das Ergebnis.
+        """
+        if neu is None or neu.empty:
+            return gespeichert
+        if gespeichert is None or gespeichert.empty:
+            kombiniert = neu
+        else:
+            kombiniert = pd.concat([gespeichert, neu])
+            kombiniert = kombiniert[~kombiniert.index.duplicated(keep="last")].sort_index()
+        self.schreibe(symbol, kombiniert)
+        return kombiniert
+
+    def ist_aktuell(self, symbol: str) -> bool:
+        zeitpunkt = self._synchronisiert.get(symbol)
+        return zeitpunkt is not None and time.time() - zeitpunkt < self.AKTUALITAET.total_seconds()
+
+    def _merke_synchronisiert(self, symbol: str):
+        self._synchronisiert[symbol] = time.time()
+
+    def braucht_volldownload(self, gespeichert, start, delta: pd.DataFrame = None) -> bool:
+        if gespeichert is None or gespeichert.empty:
+            return True
+        if start is not None and gespeichert.index[0] > start + self.START_TOLERANZ:
+            return True
+        if delta is not None and not delta.empty:
+            # Dividenden/Splits verschieben die adjustierten Kurse der gesamten Historie
+            neu = delta.loc[delta.index > gespeichert.index[-1]]
+            for spalte in ["Dividends", "Stock Splits"]:
+                if spalte in neu.columns and (neu[spalte].fillna(0) != 0).any():
+                    return True
+        return False
+
+    def lade(self, symbol: str, period: str = "3y") -> pd.DataFrame:
+        """
+        Liefert die Kursdaten des Zeitraums. Beim ersten Aufruf (oder wenn der
+        gespeicherte Zeitraum nicht reicht) wird die Historie komplett geladen,
+        sonst nur ein Delta ab dem letzten gespeicherten Tag.
+        Gleichzeitige Aufrufe für dasselbe Symbol laufen nacheinander: wer wartet,
+        findet das Symbol frisch synchronisiert vor und liest es ohne Request.
+        """
+        with self._sperre(symbol):
+            return self._lade(symbol, period)
+
+    def _lade(self, symbol: str, period: str) -> pd.DataFrame:
+        gespeichert = self.lese(symbol)
+        tz = gespeichert.index.tz if gespeichert is not None and not gespeichert.empty else None
+        start = period_start(period, pd.Timestamp.now(tz=tz))
+
+        if self.braucht_volldownload(gespeichert, start):
+            data = self.provider(symbol, period=period)
+            if data is None or data.empty:
+                return pd.DataFrame() if data is None else data
+            self.schreibe(symbol, data)
+            self._merke_synchronisiert(symbol)
+            return data
+
+        if self.ist_aktuell(symbol):
+            # Gerade erst (z.B. über lade_viele) synchronisiert → kein Request nötig
+            return gespeichert.loc[gespeichert.index >= start] if start is not None else gespeichert
+
+        delta_start = gespeichert.index[-1].strftime("%Y-%m-%d")
+        delta = self.provider(symbol, start=delta_start)
+
+        if self.braucht_volldownload(gespeichert, start, delta):
+            data = self.provider(symbol, period=period)
+            if data is None or data.empty:
+                return gespeichert.loc[gespeichert.index >= start] if start is not None else gespeichert
+            self.schreibe(symbol, data)
+            self._merke_synchronisiert(symbol)
+            return data
+
+        data = self.ergaenze(symbol, gespeichert, delta)
+        self._merke_synchronisiert(symbol)
+        if start is not None:
+            data = data.loc[data.index >= start]
+        return data
+
+    # ------------------------------------------------------
+    # Sammel-Download für viele Symbole (z.B. die ganze Watchlist)
+    # ------------------------------------------------------
+    def _sammel_download(self, symbole: list, max_workers: int, batch_groesse: int, **zeitraum) -> dict:
+        """
+        Teilt die Symbole in Pakete auf und lädt jedes Paket mit einem Request
+        (sammel_provider liefert ein Dict Symbol → DataFrame).
+        Die Pakete laufen in einem begrenzten Thread-Pool.
+        """
+        if not symbole:
+            return {}
+        pakete = [symbole[i:i + batch_groesse] for i in range(0, len(symbole), batch_groesse)]
+
+        def lade_paket(paket):
+            return self.sammel_provider(paket, **zeitraum)
+
+        ergebnis = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pakete)))) as pool:
+            for teil in pool.map(lade_paket, pakete):
+                ergebnis.update(teil)
+        return ergebnis
+
+    def lade_viele(
+        self,
+        symbole: list,
+        period: str = "3y",
+        max_workers: int = 4,
+        batch_groesse: int = 50
+    ) -> dict:
+        """
+        Synchronisiert viele Symbole auf einmal und liefert ein Dict Symbol → DataFrame
+        (gleicher Inhalt wie lade(symbol, period)).
+
+        - Symbole ohne (ausreichende) Historie: ein Sammel-Download über den ganzen Zeitraum
+        - gerade erst synchronisierte Symbole (ist_aktuell): direkt aus dem Speicher
+        - alle übrigen: ein Sammel-Delta ab dem ältesten letzten gespeicherten Tag
+        Symbole, für die der Provider nichts liefert, fehlen im Ergebnis.
+        """
+        symbole = list(dict.fromkeys(symbole))
+        gespeichert = {symbol: self.lese(symbol) for symbol in symbole}
+
+        aktuell = {}
+        start = {}
+        for symbol, data in gespeichert.items():
+            tz = data.index.tz if data is not None and not data.empty else None
+            start[symbol] = period_start(period, pd.Timestamp.now(tz=tz))
+
+        voll = [s for s in symbole if self.braucht_volldownload(gespeichert[s], start[s])]
+        delta_symbole = []
+        for symbol in symbole:
+            if symbol in voll:
+                continue
+            if self.ist_aktuell(symbol):
+                # Gerade erst (z.B. über lade) synchronisiert → kein Request nötig
+                aktuell[symbol] = gespeichert[symbol]
+            else:
+                delta_symbole.append(symbol)
+
+        if delta_symbole:
+            delta_start = min(gespeichert[s].index[-1].date() for s in delta_symbole)
+            deltas = self._sammel_download(
+                delta_symbole, max_workers, batch_groesse, start=delta_start.strftime("%Y-%m-%d")
+            )
+            for symbol in delta_symbole:
+                # Lesen, Zusammenführen und Schreiben unter der Sperre des Symbols
+                # (lade() kann das Symbol inzwischen aktualisiert haben)
+                with self._sperre(symbol):
+                    alt = self.lese(symbol)
+                    if alt is None or alt.empty:
+                        voll.append(symbol)
+                        continue
+                    delta = deltas.get(symbol)
+                    if delta is not None and not delta.empty:
+                        if alt.index.tz is not None and delta.index.tz is not None:
+                            delta = delta.tz_convert(alt.index.tz)
+                        delta = delta.loc[delta.index >= alt.index[-1].normalize()]
+                    if self.braucht_volldownload(alt, start[symbol], delta):
+                        voll.append(symbol)
+                        continue
+                    aktuell[symbol] = self.ergaenze(symbol, alt, delta)
+                    self._merke_synchronisiert(symbol)
+
+        for symbol, data in self._sammel_download(voll, max_workers, batch_groesse, period=period).items():
+            with self._sperre(symbol):
+                self.schreibe(symbol, data)
+                self._merke_synchronisiert(symbol)
+            aktuell[symbol] = data
+
+        ergebnis = {}
+        for symbol in symbole:
+            if symbol not in aktuell:
+                continue
+            data = aktuell[symbol]
+            zeitraum_start = period_start(period, pd.Timestamp.now(tz=data.index.tz))
+            if zeitraum_start is not None:
+                data = data.loc[data.index >= zeitraum_start]
+            ergebnis[symbol] = data
+        return ergebnis
@@ -0,0 +1,254 @@
+import math
+import numpy as np
+import pandas as pd
+from core_magic_3 import berechne_indikatoren_panel
+from screener import bewerte_panel, screener_panel
+from SwingtradingSignale import PositionSizer, TradeRiskManager
+
+# ------------------------------------------------------
+# Portfolio-Backtest über die ganze Watchlist
+# ------------------------------------------------------
+# Spielt die Kaufentscheidungen der TradeDecisionEngine (über RegimeBatchAnalysis)
+# Tag für Tag über alle Symbole mit einem gemeinsamen Kontostand nach:
+# - Einstieg zum Schlusskurs des Signaltags, Größe über PositionSizer
+#   (Risiko je Trade in % des aktuellen Depotwerts, Konfidenz, Risiko-Level)
+# - Stop-Loss/Take-Profit über TradeRiskManager je Market-Regime und/oder
+#   ATR-Stop wie auf der Aktienseite (Schlusskurs - 1.5 × ATR)
+# - Ausstieg, sobald eine Folge-Bar Stop oder Ziel berührt (bei Kurslücke zum
+#   Eröffnungskurs; berührt eine Bar beides, gilt vorsichtig der Stop)
+# Die Ausstiegsprüfung läuft je Tag als Array-Operation über alle Symbole,
+# nur die (wenigen) Einstiege und Ausstiege werden einzeln verbucht.
+
+# Market-Regime der RegimeBatchAnalysis -> Regime des TradeRiskManager (Long-Einstieg)
+REGIME_RISIKO = {"range_market": "sideways", "trend_market": "bullish"}
+
+# Risiko-Level der TradeDecisionEngine für ein BUY im jeweiligen Market-Regime
+RISIKO_LEVEL = {"range_market": "moderate", "trend_market": "low"}
+
+TRADE_SPALTEN = [
+    "Symbol", "Einstieg_Datum", "Einstiegskurs", "Stueck", "Stop_Loss", "Take_Profit", "Regime",
+    "Konfidenz", "Ausstieg_Datum", "Ausstiegskurs", "Grund", "Haltedauer (Bars)", "PnL", "PnL (%)",
+]
+
+
+def _fortgeschrieben(werte: np.ndarray) -> np.ndarray:
+    """
+    Letzter bekannter Wert je Symbol (NaN an Tagen ohne Kurs vorwärts gefüllt).
+    """
+    return pd.DataFrame(werte).ffill().to_numpy()
+
+
+def portfolio_backtest(datensaetze: dict,
+                       startkapital: float = 10000.0,
+                       risiko_prozent: float = 1.0,
+                       atr_faktor: float = 1.5,
+                       stop_modus: str = "beide",
+                       max_haltedauer: int = None,
+                       max_positionen: int = None,
+                       gebuehr_prozent: float = 0.0,
+                       tage: int = None,
+                       min_len_window: int = 20,
+                       parameter: dict = None) -> dict:
+    """
+    Portfolio-Backtest aller Symbole (Symbol -> Kurs-DataFrame) mit gemeinsamem Konto.
+    - stop_modus: "regime" (TradeRiskManager), "atr" (atr_faktor × ATR) oder
+      "beide" (der engere der beiden Stops)
+    - max_haltedauer: Ausstieg zum Schlusskurs nach so vielen Bars (None = nur Stop/Ziel)
+    - max_positionen: höchstens so viele gleichzeitig offene Positionen (None = nur Kasse begrenzt)
+    - gebuehr_prozent: Gebühr je Kauf und Verkauf in % vom Umsatz
+    - tage: wie die Sidebar nur die letzten `tage` Kalendertage handeln (None = alles)
+    Rückgabe:
+    - equity: DataFrame je Handelstag mit Equity, Cash, Investiert, Drawdown (%)
+    - trades: ein Eintrag je Trade (offene Positionen am Ende mit Grund "offen")
+    - kennzahlen: Endkapital, Rendite, maximaler Drawdown, Trefferquote, Profit-Faktor, ...
+    """
+    if stop_modus not in ("regime", "atr", "beide"):
+        raise ValueError("stop_modus muss 'regime', 'atr' oder 'beide' sein")
+
+    indikatoren = berechne_indikatoren_panel(datensaetze, parameter)
+    panel = screener_panel(datensaetze, parameter)
+    index, symbole, position = panel["index"], panel["symbole"], panel["position"]
+    if not symbole:
+        return {"equity": pd.DataFrame(), "trades": pd.DataFrame(columns=TRADE_SPALTEN), "kennzahlen": {}}
+
+    ergebnis = bewerte_panel(panel)
+    close = panel["werte"]["Close"]
+    atr = panel["werte"]["ATR"]
+    eroeffnung = indikatoren.ausgerichtet("Open")
+    hoch = indikatoren.ausgerichtet("High")
+    tief = indikatoren.ausgerichtet("Low")
+    bewertungskurs = _fortgeschrieben(close)
+
+    kauf = (ergebnis["action"] == "BUY") & (position >= min_len_window)
+    konfidenz = ergebnis["confidence"]
+    regime = ergebnis["market_regime"]
+    gebuehr = gebuehr_prozent / 100
+
+    start = 0
+    if tage is not None:
+        start = int(np.searchsorted(index, index[-1] - pd.Timedelta(days=tage)))
+
+    # Zustand je Symbol (höchstens eine offene Position je Symbol)
+    n_symbole = len(symbole)
+    offen = np.zeros(n_symbole, dtype=bool)
+    stueck = np.zeros(n_symbole)
+    stop = np.full(n_symbole, np.nan)
+    ziel = np.full(n_symbole, np.inf)
+    einstieg_bar = np.zeros(n_symbole, dtype=np.int64)
+    offene_trades = {}
+
+    cash = float(startkapital)
+    equity = np.full(len(index), np.nan)
+    investiert = np.full(len(index), np.nan)
+    kassenbestand = np.full(len(index), np.nan)
+    trades = []
+
+    def schliesse(j, t, preis, grund):
+        trade = offene_trades.pop(j)
+        erloes = stueck[j] * preis * (1 - gebuehr)
+        trade.update({
+            "Ausstieg_Datum": index[t],
+            "Ausstiegskurs": preis,
+            "Grund": grund,
+            "Haltedauer (Bars)": int(position[t, j] - einstieg_bar[j]),
+            "PnL": erloes - trade["_kosten"],
+            "PnL (%)": (erloes / trade["_kosten"] - 1) * 100,
+        })
+        trades.append(trade)
+        return erloes
+
+    for t in range(start, len(index)):
+        vorhanden = position[t] >= 0
+
+        # --- Ausstiege: alle offenen Positionen auf einmal prüfen ---
+        pruefen = offen & vorhanden & (position[t] > einstieg_bar)
+        if pruefen.any():
+            stop_treffer = pruefen & (tief[t] <= stop)
+            ziel_treffer = pruefen & ~stop_treffer & (hoch[t] >= ziel)
+            zeit_treffer = np.zeros(n_symbole, dtype=bool)
+            if max_haltedauer is not None:
+                zeit_treffer = pruefen & ~stop_treffer & ~ziel_treffer & (position[t] - einstieg_bar >= max_haltedauer)
+            preis = np.where(
+                stop_treffer, np.fmin(eroeffnung[t], stop),
+                np.where(ziel_treffer, np.fmax(eroeffnung[t], ziel), close[t])
+            )
+            grund = np.where(stop_treffer, "Stop-Loss", np.where(ziel_treffer, "Take-Profit", "Haltedauer"))
+            for j in np.flatnonzero(stop_treffer | ziel_treffer | zeit_treffer):
+                cash += schliesse(j, t, float(preis[j]), str(grund[j]))
+                offen[j] = False
+                stueck[j] = 0.0
+
+        # --- Einstiege: Kandidaten nach Konfidenz ---
+        kandidaten = np.flatnonzero(kauf[t] & ~offen & vorhanden)
+        if len(kandidaten):
+            depotwert = cash + np.nansum(stueck * bewertungskurs[t])
+            for j in kandidaten[np.argsort(-konfidenz[t, kandidaten], kind="stable")]:
+                if max_positionen is not None and offen.sum() >= max_positionen:
+                    break
+                einstieg = float(close[t, j])
+                risiko = TradeRiskManager(einstieg, REGIME_RISIKO.get(regime[t, j], "unknown")).stop_loss_take_profit("long")
+                atr_stop = einstieg - atr_faktor * atr[t, j]
+                if stop_modus == "regime":
+                    stop_kurs = risiko["stop_loss"]
+                elif stop_modus == "atr":
+                    stop_kurs = atr_stop
+                else:
+                    stop_kurs = np.fmax(risiko["stop_loss"], atr_stop)
+                if not np.isfinite(stop_kurs) or stop_kurs >= einstieg:
+                    continue
+
+                pos = PositionSizer(konto_groesse=depotwert).berechne_positionsgroesse(
+                    einstiegskurs=einstieg,
+                    stop_loss_kurs=float(stop_kurs),
+                    risiko_prozent=risiko_prozent,
+                    confidence=float(konfidenz[t, j]),
+                    risiko_level=RISIKO_LEVEL.get(regime[t, j], "high")
+                )
+                if "error" in pos:
+                    continue
+                anzahl = min(math.floor(pos["position_size"]), math.floor(cash / (einstieg * (1 + gebuehr))))
+                if anzahl <= 0:
+                    continue
+
+                kosten = anzahl * einstieg * (1 + gebuehr)
+                cash -= kosten
+                offen[j] = True
+                stueck[j] = anzahl
+                stop[j] = stop_kurs
+                ziel[j] = risiko["take_profit"]
+                einstieg_bar[j] = position[t, j]
+                offene_trades[j] = {
+                    "Symbol": symbole[j],
+                    "Einstieg_Datum": index[t],
+                    "Einstiegskurs": einstieg,
+                    "Stueck": anzahl,
+                    "Stop_Loss": float(stop_kurs),
+                    "Take_Profit": risiko["take_profit"],
+                    "Regime": risiko["regime"],
+                    "Konfidenz": float(konfidenz[t, j]),
+                    "_kosten": kosten,
+                }
+
+        kassenbestand[t] = cash
+        investiert[t] = np.nansum(stueck * bewertungskurs[t])
+        equity[t] = cash + investiert[t]
+
+    # Offene Positionen zum letzten Kurs bewerten
+    letzte = len(index) - 1
+    for j in list(offene_trades):
+        zeilen = np.flatnonzero(position[:, j] >= 0)
+        trade = offene_trades.pop(j)
+        wert = stueck[j] * bewertungskurs[letzte, j] * (1 - gebuehr)
+        trade.update({
+            "Ausstieg_Datum": index[zeilen[-1]],
+            "Ausstiegskurs": float(bewertungskurs[letzte, j]),
+            "Grund": "offen",
+            "Haltedauer (Bars)": int(position[zeilen[-1], j] - einstieg_bar[j]),
+            "PnL": wert - trade["_kosten"],
+            "PnL (%)": (wert / trade["_kosten"] - 1) * 100,
+        })
+        trades.append(trade)
+
+    verlauf = pd.DataFrame(
+        {"Equity": equity, "Cash": kassenbestand, "Investiert": investiert}, index=index
+    ).iloc[start:]
+    verlauf["Drawdown (%)"] = (verlauf["Equity"] / verlauf["Equity"].cummax() - 1) * 100
+
+    trades = pd.DataFrame(trades, columns=TRADE_SPALTEN).sort_values("Einstieg_Datum", kind="stable").reset_index(drop=True)
+    return {"equity": verlauf, "trades": trades, "kennzahlen": _kennzahlen(verlauf, trades, startkapital)}
+
+
+def _kennzahlen(verlauf: pd.DataFrame, trades: pd.DataFrame, startkapital: float) -> dict:
+    geschlossen = trades[trades["Grund"] != "offen"]
+    gewinne = geschlossen.loc[geschlossen["PnL"] > 0, "PnL"].sum()
+    verluste = -geschlossen.loc[geschlossen["PnL"] < 0, "PnL"].sum()
+    endkapital = float(verlauf["Equity"].iloc[-1]) if len(verlauf) else startkapital
+    return {
+        "Startkapital": startkapital,
+        "Endkapital": round(endkapital, 2),
+        "Rendite (%)": round((endkapital / startkapital - 1) * 100, 2),
+        "Max_Drawdown (%)": round(float(verlauf["Drawdown (%)"].min()), 2) if len(verlauf) else 0.0,
+        "Trades": len(trades),
+        "Trades_geschlossen": len(geschlossen),
+        "Trefferquote (%)": round(float((geschlossen["PnL"] > 0).mean() * 100), 2) if len(geschlossen) else None,
+        "Profit_Faktor": round(float(gewinne / verluste), 2) if verluste > 0 else None,
+        "Mittlere_Haltedauer (Bars)": round(float(geschlossen["Haltedauer (Bars)"].mean()), 1) if len(geschlossen) else None,
+    }
+
+
+if __name__ == "__main__":
+    # Portfolio-Backtest der Watchlist: python portfolio_backtest.py [trades.csv]
+    import sys
+    import time
+    from core_magic_3 import lade_aktien, lade_watchlist_daten
+
+    beginn = time.perf_counter()
+    datensaetze = lade_watchlist_daten(period="4y", aktien=lade_aktien())
+    geladen = time.perf_counter()
+    ergebnis = portfolio_backtest(datensaetze)
+    print(ergebnis["trades"].to_string())
+    for name, wert in ergebnis["kennzahlen"].items():
+        print(f"{name}: {wert}")
+    print(f"{len(datensaetze)} Symbole: Laden {geladen - beginn:.1f} s, Backtest {time.perf_counter() - geladen:.1f} s")
+    if len(sys.argv) > 1:
+        ergebnis["trades"].to_csv(sys.argv[1], index=False)
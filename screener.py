@@ -0,0 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from core_magic_3 import TICKER_METADATEN, berechne_indikatoren_panel, klassifiziere_aktie, lade_fundamentaldaten
+from indikator_panel import IndikatorPanel
+from signal_auswertung import vorwaerts_max
+from SwingtradingSignale import RegimeBatchAnalysis
+
+# ------------------------------------------------------
+# Screener: aktuelles Signal aller Watchlist-Aktien
+# ------------------------------------------------------
+# Alle Symbole liegen als Panel (Datum × Symbol) auf einem gemeinsamen Datumsindex.
+# Die Kette RSI → MACD → ADX → Market-Regime → Trade-Entscheidung wird über
+# RegimeBatchAnalysis einmal für alle Tage und Symbole gleichzeitig bewertet;
+# daraus ergeben sich der aktuelle Stand je Symbol und die Trefferquote der
+# Kaufsignale im Rückblickzeitraum.
+
+PANEL_SPALTEN = ["Close", "RSI", "MACD", "MACD_Signal", "MACD_Hist", "ADX", "+DI", "-DI", "ATR"]
+
+
+def screener_panel(datensaetze: dict, parameter: dict = None) -> dict:
+    """
+    Indikatoren aller Symbole als Panel auf gemeinsamem Datumsindex
+    (ein 2-D-Durchlauf über berechne_indikatoren_panel).
+    datensaetze: Symbol -> Kurs-DataFrame (lade_daten_aktie/lade_watchlist_daten)
+    Rückgabe:
+    - werte: Spalte -> Array (Datum × Symbol), NaN an Tagen ohne Kurs des Symbols
+    - position: laufende Bar-Nummer je Symbol (-1 an Tagen ohne Kurs), damit
+      Vorwerte und Vorwärts-Fenster im eigenen Handelskalender des Symbols bleiben
+    - index (Handelstage ohne Zeitzone), symbole
+    - indikatoren: das IndikatorPanel selbst (Sichten je Symbol über panel.frame)
+    Verschiedene Börsenkalender (z.B. RHM.DE und NOW) werden über den lokalen
+    Handelstag ausgerichtet, nicht über den UTC-Zeitpunkt.
+    """
+    panel = berechne_indikatoren_panel(datensaetze, parameter)
+    return {
+        "werte": {spalte: panel.ausgerichtet(spalte) for spalte in PANEL_SPALTEN},
+        "position": panel.position,
+        "index": panel.index,
+        "symbole": panel.symbole,
+        "indikatoren": panel,
+    }
+
+
+def _vorwert(werte: np.ndarray, position: np.ndarray) -> np.ndarray:
+    """
+    Wert der vorherigen Bar desselben Symbols (Tage ohne Kurs werden übersprungen).
+    """
+    vorher = np.full(werte.shape, np.nan)
+    for j in range(werte.shape[1]):
+        zeilen = np.flatnonzero(position[:, j] >= 0)
+        vorher[zeilen[1:], j] = werte[zeilen[:-1], j]
+    return vorher
+
+
+def _kursanstieg(close: np.ndarray, position: np.ndarray, auswertung_tage: int) -> tuple:
+    """
+    Maximaler Kursanstieg der nächsten auswertung_tage Bars je Symbol und ob
+    das Auswertungsfenster schon vollständig in den Daten liegt.
+    """
+    kurs_diff = np.full(close.shape, np.nan)
+    abgeschlossen = np.zeros(close.shape, dtype=bool)
+    for j in range(close.shape[1]):
+        zeilen = np.flatnonzero(position[:, j] >= 0)
+        if len(zeilen) == 0:
+            continue
+        kurse = close[zeilen, j]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kurs_diff[zeilen, j] = (vorwaerts_max(kurse, auswertung_tage) - kurse) / kurse
+        abgeschlossen[zeilen, j] = np.arange(len(zeilen)) + auswertung_tage <= len(zeilen) - 1
+    return kurs_diff, abgeschlossen
+
+
+def bewerte_panel(panel: dict) -> dict:
+    """
+    RegimeBatchAnalysis für alle Tage × Symbole des Panels in einem Aufruf.
+    Rückgabe: Ergebnis-Spalte -> Array (Datum × Symbol), wie RegimeBatchAnalysis.analyse.
+    """
+    werte, position = panel["werte"], panel["position"]
+    rsi, hist = werte["RSI"], werte["MACD_Hist"]
+    ergebnis = RegimeBatchAnalysis().analyse(
+        rsi=rsi.ravel(),
+        prev_rsi=_vorwert(rsi, position).ravel(),
+        macd=werte["MACD"].ravel(),
+        signal=werte["MACD_Signal"].ravel(),
+        hist=hist.ravel(),
+        prev_hist=_vorwert(hist, position).ravel(),
+        adx=werte["ADX"].ravel(),
+        rsi_valid=(position >= 1).ravel(),
+        macd_valid=(position >= 2).ravel(),
+        adx_valid=(position >= 1).ravel(),
+    )
+    return {name: wert.reshape(position.shape) for name, wert in ergebnis.items()}
+
+
+def screener_tabelle(panel: dict,
+                     namen: dict = None,
+                     klassifikationen: dict = None,
+                     auswertung_tage: int = 61,
+                     min_veraenderung: float = 0.08,
+                     rueckblick_tage: int = 365,
+                     min_len_window: int = 20) -> pd.DataFrame:
+    """
+    Eine Zeile je Symbol mit dem aktuellen Stand (letzter Kurs, RSI, MACD-Bias,
+    ADX-Regime, Aktion der TradeDecisionEngine) und der Trefferquote aller
+    Kaufsignale der letzten rueckblick_tage (wie SwingSignalService: Kurs steigt
+    innerhalb von auswertung_tage um mindestens min_veraenderung).
+    """
+    werte, position, index, symbole = panel["werte"], panel["position"], panel["index"], panel["symbole"]
+    if not symbole:
+        return pd.DataFrame()
+    namen = namen or {}
+    klassifikationen = klassifikationen or {}
+
+    # Eine Bewertung für alle Tage × Symbole
+    vorhanden = position >= 0
+    ergebnis = bewerte_panel(panel)
+
+    # Trefferquote der Kaufsignale im Rückblickzeitraum
+    kurs_diff, abgeschlossen = _kursanstieg(werte["Close"], position, auswertung_tage)
+    im_rueckblick = (index >= index[-1] - pd.Timedelta(days=rueckblick_tage))[:, None]
+    kauf = (ergebnis["action"] == "BUY") & (position >= min_len_window) & im_rueckblick
+    geprueft = kauf & abgeschlossen
+    anzahl = geprueft.sum(axis=0)
+    treffer = (geprueft & (kurs_diff >= min_veraenderung)).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        trefferquote = np.where(anzahl > 0, treffer / anzahl * 100, np.nan)
+
+    # Aktueller Stand = letzte Zeile mit Kurs je Symbol
+    spalten = np.arange(len(symbole))
+    letzte = len(index) - 1 - np.argmax(vorhanden[::-1], axis=0)
+    vorletzte_close = _vorwert(werte["Close"], position)[letzte, spalten]
+    close = werte["Close"][letzte, spalten]
+
+    def aktuell(name):
+        return ergebnis[name][letzte, spalten]
+
+    tabelle = pd.DataFrame({
+        "Symbol": symbole,
+        "Name": [namen.get(s, s) for s in symbole],
+        "Datum": index[letzte],
+        "Kurs": close,
+        "Veränderung (%)": (close / vorletzte_close - 1) * 100,
+        "RSI": aktuell("rsi_value"),
+        "RSI_Status": aktuell("rsi_state"),
+        "MACD_Bias": aktuell("macd_bias"),
+        "ADX": werte["ADX"][letzte, spalten],
+        "ADX_Regime": aktuell("adx_regime"),
+        "Marktphase": aktuell("market_regime"),
+        "Aktion": aktuell("action"),
+        "Konfidenz": aktuell("confidence"),
+        "Profil": None,
+        "Trading_Status": None,
+        "Kaufsignale": anzahl,
+        "Trefferquote (%)": trefferquote,
+    })
+    return ergaenze_klassifikation(tabelle, klassifikationen)
+
+
+def ergaenze_klassifikation(tabelle: pd.DataFrame, klassifikationen: dict) -> pd.DataFrame:
+    """
+    Setzt Profil und Trading_Status der Screener-Tabelle aus klassifiziere_watchlist
+    (Symbole ohne Klassifizierung bleiben leer). Liefert eine neue Tabelle.
+    """
+    if tabelle.empty:
+        return tabelle
+    return tabelle.assign(**{
+        spalte: [klassifikationen.get(s, {}).get(spalte) for s in tabelle["Symbol"]]
+        for spalte in ("Profil", "Trading_Status")
+    })
+
+
+def klassifiziere_watchlist(panel: IndikatorPanel, nur_vorhandene: bool = True, max_workers: int = 8) -> dict:
+    """
+    Klassifizierung (Profil/Trading-Status) aller Symbole des Panels. Kurse und
+    Indikatoren kommen ohne Neuberechnung aus dem Panel (panel.frame), die
+    Metadaten aus TICKER_METADATEN; Fehler ergeben einen leeren Eintrag.
+    - nur_vorhandene: nur Symbole mit bereits geladenen Metadaten (kein Request),
+      die übrigen fehlen im Ergebnis
+    - sonst werden fehlende Metadaten parallel geladen
+    """
+    def klassifiziere(symbol):
+        try:
+            return symbol, klassifiziere_aktie(symbol, panel.frame(symbol), lade_fundamentaldaten(symbol))
+        except Exception:
+            return symbol, {}
+
+    symbole = [s for s in panel.symbole if not nur_vorhandene or TICKER_METADATEN.ist_vorhanden(s)]
+    if not symbole:
+        return {}
+    if nur_vorhandene:
+        return dict(map(klassifiziere, symbole))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbole))) as pool:
+        return dict(pool.map(klassifiziere, symbole))
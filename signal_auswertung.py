@@ -0,0 +1,803 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from zwischenspeicher import LRUZwischenspeicher
+
+# ------------------------------------------------------
+# Vorwärts-Fenster: höchster/niedrigster Schlusskurs der
+# nächsten Auswertung_tage für jede Bar
+# ------------------------------------------------------
+def vorwaerts_max(werte, fenster: int) -> np.ndarray:
+    """
+    Für jede Position i das Maximum von werte[i : i+fenster+1] (am Ende gekürzt),
+    NaN-Werte werden wie bei Series.max() übersprungen.
+    Umgekehrtes rolling().max() → O(n) statt eines Slices je Signal.
+    """
+    umgekehrt = pd.Series(np.asarray(werte, dtype=float)[::-1])
+    return umgekehrt.rolling(max(int(fenster), 0) + 1, min_periods=1).max().to_numpy()[::-1]
+
+
+def vorwaerts_min(werte, fenster: int) -> np.ndarray:
+    umgekehrt = pd.Series(np.asarray(werte, dtype=float)[::-1])
+    return umgekehrt.rolling(max(int(fenster), 0) + 1, min_periods=1).min().to_numpy()[::-1]
+
+
+class VorwaertsFenster:
+    """
+    Bewertet beliebig viele Signale/Perioden gegen die Kursentwicklung der
+    folgenden `auswertung_tage` Handelstage:
+    - Vorwärts-Max/-Min werden einmal für alle Bars berechnet
+    - jede Abfrage ist danach nur noch ein Array-Zugriff über die Position des Datums
+    """
+
+    def __init__(self, full_data: pd.DataFrame, auswertung_tage: int, spalte: str = "Close"):
+        self.index = full_data.index
+        self.auswertung_tage = auswertung_tage
+        self.kurse = full_data[spalte].to_numpy(dtype=float)
+        self.max_kurse = vorwaerts_max(self.kurse, auswertung_tage)
+        self._min_kurse = None
+
+    @property
+    def min_kurse(self) -> np.ndarray:
+        if self._min_kurse is None:
+            self._min_kurse = vorwaerts_min(self.kurse, self.auswertung_tage)
+        return self._min_kurse
+
+    def positionen(self, daten) -> np.ndarray:
+        """
+        Position jedes Datums im Index (-1, wenn das Datum fehlt).
+        """
+        return self.index.get_indexer(pd.Index(daten))
+
+    def bewerte(self, daten, min_veraenderung: float = None, mit_min: bool = False, positionen=None) -> dict:
+        """
+        Liefert je Datum (Arrays gleicher Länge):
+        - gefunden, position, start_kurs, max_kurs, kurs_diff
+        - min_kurs (niedrigster Kurs im Fenster), falls mit_min
+        - getroffen (kurs_diff >= min_veraenderung), falls min_veraenderung angegeben ist
+        Für fehlende Daten sind die Kurswerte NaN.
+        Sind die Positionen der Daten schon bekannt (positionen), entfällt die Index-Suche.
+        """
+        position = self.positionen(daten) if positionen is None else np.asarray(positionen, dtype=np.int64)
+        gefunden = position >= 0
+        sicher = np.where(gefunden, position, 0)
+
+        start_kurs = np.where(gefunden, self.kurse[sicher], np.nan)
+        max_kurs = np.where(gefunden, self.max_kurse[sicher], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kurs_diff = (max_kurs - start_kurs) / start_kurs
+
+        ergebnis = {
+            "gefunden": gefunden,
+            "position": position,
+            "start_kurs": start_kurs,
+            "max_kurs": max_kurs,
+            "kurs_diff": kurs_diff,
+        }
+        if mit_min:
+            ergebnis["min_kurs"] = np.where(gefunden, self.min_kurse[sicher], np.nan)
+        if min_veraenderung is not None:
+            ergebnis["getroffen"] = kurs_diff >= min_veraenderung
+        return ergebnis
+
+
+# ------------------------------------------------------
+# Bewertung von Kaufsignalen und Kaufperioden
+# ------------------------------------------------------
+def bewerte_kaufsignale(full_data, kaufsignale_df, Auswertung_tage, min_veraenderung, fenster: VorwaertsFenster = None,
+                        positionen=None) -> dict:
+    """
+    Trefferquote einzelner Kaufsignale (gleiches Ergebnis wie evaluate_buy_signals).
+    Signale, deren Datum nicht in full_data vorkommt, werden übersprungen.
+    """
+    if fenster is None:
+        fenster = VorwaertsFenster(full_data, Auswertung_tage)
+    if kaufsignale_df is None or len(kaufsignale_df) == 0:
+        bewertung = {"gefunden": np.zeros(0, dtype=bool), "kurs_diff": np.zeros(0)}
+    else:
+        bewertung = fenster.bewerte(kaufsignale_df["Datum"], positionen=positionen)
+
+    kurs_diff = bewertung["kurs_diff"][bewertung["gefunden"]]
+    treffer = int(np.count_nonzero(kurs_diff >= min_veraenderung))
+    anzahl = int(len(kurs_diff))
+
+    trefferquote = (treffer / anzahl * 100) if anzahl > 0 else None
+
+    return {
+        "Trefferquote_Kauf (%)": trefferquote,
+        "Anzahl_geprüfter_Signale": anzahl,
+        "Treffer": treffer
+    }
+
+
+def bewerte_kaufperioden(perioden, full_data, Auswertung_tage, min_veraenderung, fenster: VorwaertsFenster = None,
+                         positionen=None) -> list:
+    """
+    Bewertet jede Periode ab ihrem letzten Signaltag
+    (gleiches Ergebnis wie evaluate_buy_periods).
+    positionen: Bar-Position des letzten Signaltags je Periode (optional, z.B. aus cluster_indizes).
+    """
+    if fenster is None:
+        fenster = VorwaertsFenster(full_data, Auswertung_tage)
+    if not perioden:
+        return []
+
+    bewertung = fenster.bewerte([ende for _, ende in perioden], positionen=positionen)
+    return perioden_eintraege(perioden, bewertung, min_veraenderung)
+
+
+def perioden_eintraege(perioden, bewertung: dict, min_veraenderung) -> list:
+    """
+    Ein Eintrag je Periode aus der Bewertung ihrer letzten Signaltage (VorwaertsFenster.bewerte).
+    """
+    bewertungen = []
+    for i, (start_datum, end_datum) in enumerate(perioden):
+        if not bewertung["gefunden"][i]:
+            bewertungen.append({
+                "Start_Datum": start_datum,
+                "End_Datum": end_datum,
+                "Bewertung": None,
+                "Kommentar": "Datum nicht in Daten gefunden"
+            })
+            continue
+
+        start_kurs = bewertung["start_kurs"][i]
+        max_kurs = bewertung["max_kurs"][i]
+        kurs_diff = bewertung["kurs_diff"][i]
+        getroffen = kurs_diff >= min_veraenderung
+
+        bewertungen.append({
+            "Start_Datum": start_datum,
+            "End_Datum": end_datum,
+            "Bewertung": getroffen,
+            "Max_Kurs": max_kurs,
+            "Start_Kurs": start_kurs,
+            "Kurs_Diff": kurs_diff,
+            "Kommentar": f"Kursanstieg >= {min_veraenderung*100:.1f}%: {getroffen}"
+        })
+
+    return bewertungen
+
+
+# ------------------------------------------------------
+# Kaufsignale zu Perioden zusammenfassen
+# ------------------------------------------------------
+_TAG_NS = 86_400 * 10 ** 9
+
+
+def cluster_indizes(daten, max_gap_days: int = 5, gruppen=None) -> tuple:
+    """
+    Fasst Signaldaten zu Perioden zusammen: eine neue Periode beginnt, wenn der
+    Abstand zum vorherigen Signal mehr als max_gap_days ganze Tage beträgt
+    (wie (current - prev).days) oder – mit gruppen, z.B. Symbol-Codes – die Gruppe wechselt.
+    Rückgabe (int64-Arrays):
+    - reihenfolge: sortiert die Daten (nach Gruppe, dann Zeit)
+    - start, ende: Positionen des ersten/letzten Signals jeder Periode in der sortierten Folge
+    """
+    index = pd.DatetimeIndex(daten)
+    leer = np.zeros(0, dtype=np.int64)
+    if len(index) == 0:
+        return leer, leer, leer
+
+    ns = index.as_unit("ns").asi8
+    if gruppen is None:
+        reihenfolge = np.argsort(ns, kind="stable")
+    else:
+        gruppen = np.asarray(gruppen)
+        reihenfolge = np.lexsort((ns, gruppen))
+    ns = ns[reihenfolge]
+
+    neu = np.empty(len(ns), dtype=bool)
+    neu[0] = True
+    neu[1:] = np.diff(ns) // _TAG_NS > max_gap_days
+    if gruppen is not None:
+        sortierte_gruppen = gruppen[reihenfolge]
+        neu[1:] |= sortierte_gruppen[1:] != sortierte_gruppen[:-1]
+
+    # Periodennummer je Signal über die kumulierte Summe der Periodenanfänge;
+    # das Ende einer Periode liegt direkt vor dem Start der nächsten
+    nummer = np.cumsum(neu) - 1
+    start = np.searchsorted(nummer, np.arange(nummer[-1] + 1))
+    ende = np.append(start[1:] - 1, len(ns) - 1)
+    return reihenfolge.astype(np.int64), start.astype(np.int64), ende.astype(np.int64)
+
+
+def cluster_perioden(daten, max_gap_days: int = 5) -> list:
+    """
+    Perioden als Liste (Start_Datum, End_Datum), gleiches Ergebnis wie die
+    bisherigen cluster_buy_signal_periods/cluster_periods.
+    """
+    daten = pd.DatetimeIndex(daten)
+    reihenfolge, start, ende = cluster_indizes(daten, max_gap_days)
+    sortiert = daten[reihenfolge]
+    return list(zip(sortiert[start], sortiert[ende]))
+
+
+# ------------------------------------------------------
+# Trefferquote über alle Schwellen (min_veraenderung) auf einmal
+# ------------------------------------------------------
+def trefferquoten_kurve(kurs_diff, schwellen, anzahl: int = None) -> np.ndarray:
+    """
+    Trefferquote (%) je Schwelle = Anteil der kurs_diff >= Schwelle.
+    Die Kursanstiege werden einmal sortiert (empirische Verteilungsfunktion),
+    jede Schwelle ist danach nur noch eine binäre Suche.
+    NaN zählt wie in bewerte_kaufsignale als geprüft, aber nicht getroffen.
+    """
+    kurs_diff = np.asarray(kurs_diff, dtype=float)
+    schwellen = np.asarray(schwellen, dtype=float)
+    if anzahl is None:
+        anzahl = len(kurs_diff)
+    if anzahl == 0:
+        return np.full(len(schwellen), np.nan)
+
+    sortiert = np.sort(kurs_diff[~np.isnan(kurs_diff)])
+    treffer = len(sortiert) - np.searchsorted(sortiert, schwellen, side="left")
+    return treffer / anzahl * 100
+
+
+def trefferquoten_flaeche(full_data: pd.DataFrame, signal_daten, perioden, tage_raster, schwellen) -> dict:
+    """
+    Trefferquoten für jede Kombination aus Auswertung_tage (Zeilen) und
+    min_veraenderung (Spalten), ohne die Auswertung je Kombination neu zu starten:
+    - je Auswertung_tage wird das Vorwärts-Maximum einmal berechnet
+    - die Kurve über alle Schwellen kommt aus trefferquoten_kurve
+    "Signale" entspricht bewerte_kaufsignale, "Perioden" der Trefferquote nur
+    abgeschlossener Perioden (Ende + Auswertung_tage <= letztes Datum) wie im Algorithmus-Tab.
+    Ohne auswertbare Signale/Perioden ist die Zeile NaN.
+    """
+    tage_raster = [int(t) for t in tage_raster]
+    schwellen = np.asarray(schwellen, dtype=float)
+    signal_daten = pd.Index(signal_daten)
+    perioden_ende = pd.Index([ende for _, ende in perioden])
+    letztes_datum = full_data.index[-1] if len(full_data) else None
+
+    signal_zeilen = []
+    perioden_zeilen = []
+    for auswertung_tage in tage_raster:
+        fenster = VorwaertsFenster(full_data, auswertung_tage)
+
+        bewertung = fenster.bewerte(signal_daten)
+        kurs_diff = bewertung["kurs_diff"][bewertung["gefunden"]]
+        signal_zeilen.append(trefferquoten_kurve(kurs_diff, schwellen))
+
+        bewertung = fenster.bewerte(perioden_ende)
+        abgeschlossen = (perioden_ende + pd.Timedelta(days=auswertung_tage)) <= letztes_datum if len(perioden_ende) else np.zeros(0, dtype=bool)
+        # Nicht gefundene Perioden zählen mit, aber nie als Treffer (Bewertung None)
+        kurs_diff = np.where(bewertung["gefunden"], bewertung["kurs_diff"], np.nan)[abgeschlossen]
+        perioden_zeilen.append(trefferquoten_kurve(kurs_diff, schwellen))
+
+    def als_frame(zeilen):
+        return pd.DataFrame(
+            np.array(zeilen).reshape(len(tage_raster), len(schwellen)),
+            index=pd.Index(tage_raster, name="Auswertung_tage"),
+            columns=pd.Index(schwellen, name="min_veraenderung"),
+        )
+
+    return {"Signale": als_frame(signal_zeilen), "Perioden": als_frame(perioden_zeilen)}
+
+
+# ------------------------------------------------------
+# Kompakte Signal-Tabelle
+# ------------------------------------------------------
+# Statt einer Zeile mit Emoji-Texten und Detail-Dicts je Bar werden die Signale
+# spaltenweise gespeichert: Entscheidung als int8-Code, Texte/Labels/Gewichte
+# als Kategorie-Code mit Nachschlagetabelle, übrige Werte als float32.
+# Lesbare Texte und die Detail-Dicts entstehen erst beim Anzeigen (als_frame).
+HALTEN, KAUFEN, VERKAUFEN = 0, 1, 2
+ENTSCHEIDUNG_TEXTE = ("🟡 Halten", "🟢 Kaufen", "🔴 Verkaufen")
+
+# Höchstzahl verschiedener Werte, bis zu der eine Spalte als Kategorie gespeichert wird
+MAX_KATEGORIEN = 127
+
+
+def entscheidung_codes(texte) -> np.ndarray:
+    """
+    Entscheidungstexte -> int8-Code (Kaufen/Verkaufen wie bisher über "Kauf"/"Verkauf" erkannt).
+    """
+    codes, eindeutig = pd.factorize(pd.Series(texte, dtype=object), use_na_sentinel=False)
+    tabelle = np.array([
+        KAUFEN if "Kauf" in str(text) else VERKAUFEN if "Verkauf" in str(text) else HALTEN
+        for text in eindeutig
+    ], dtype=np.int8)
+    return tabelle[codes] if len(tabelle) else np.zeros(0, dtype=np.int8)
+
+
+def _kategorie_schluessel(wert):
+    # NaN ist nicht gleich sich selbst → als ein gemeinsamer Schlüssel (wie factorize)
+    return _NAN_SCHLUESSEL if isinstance(wert, float) and wert != wert else wert
+
+
+_NAN_SCHLUESSEL = object()
+
+
+def _kleinster_code_typ(anzahl: int):
+    for typ in (np.int8, np.int16, np.int32):
+        if anzahl <= np.iinfo(typ).max:
+            return typ
+    return np.int64
+
+
+class KompakteSignale:
+    """
+    Signale aller Bars in Spalten:
+    - datum, entscheidung (int8: HALTEN/KAUFEN/VERKAUFEN), score (float32, optional)
+    - spalten: Name -> Codes (int8/int16) oder float32-Werte
+    - kategorien: Name -> Nachschlagetabelle der Codes (Originalwerte)
+    - verschachtelt: Spalte -> Schlüssel, falls die Spalte ursprünglich Detail-Dicts
+      enthielt (gespeichert als Unterspalten "Spalte.Schlüssel")
+    Kaufsignale filtern ist ein Integer-Vergleich (kauf), Texte gibt es erst in als_frame().
+    """
+
+    def __init__(self, datum, entscheidung, spalten: dict = None, kategorien: dict = None,
+                 verschachtelt: dict = None, reihenfolge: list = None, score=None):
+        self.datum = pd.Index(datum)
+        self.entscheidung = np.asarray(entscheidung, dtype=np.int8)
+        self.spalten = spalten or {}
+        self.kategorien = kategorien or {}
+        self.verschachtelt = verschachtelt or {}
+        self.reihenfolge = list(self.spalten) if reihenfolge is None else list(reihenfolge)
+        self.score = None if score is None else np.asarray(score, dtype=np.float32)
+
+    # --- Aufbau aus der bisherigen Zeilen-Darstellung ---
+    @classmethod
+    def aus_frame(cls, signale_df: pd.DataFrame, score=None) -> "KompakteSignale":
+        """
+        Wandelt ein Signal-DataFrame (Datum, Entscheidung, Einzelsignale/Detail-Dicts) um.
+        """
+        if signale_df is None or signale_df.empty:
+            return cls(pd.DatetimeIndex([]), np.zeros(0, dtype=np.int8))
+
+        spalten, kategorien, verschachtelt = {}, {}, {}
+        reihenfolge = [name for name in signale_df.columns if name not in ("Datum", "Entscheidung")]
+        for name in reihenfolge:
+            werte = signale_df[name]
+            if werte.dtype == object and all(isinstance(w, dict) for w in werte):
+                schluessel = list(werte.iloc[0])
+                verschachtelt[name] = schluessel
+                for s in schluessel:
+                    cls._packe(f"{name}.{s}", pd.Series([w.get(s) for w in werte], dtype=object), spalten, kategorien)
+            else:
+                cls._packe(name, werte, spalten, kategorien)
+
+        return cls(signale_df["Datum"], entscheidung_codes(signale_df["Entscheidung"]),
+                   spalten, kategorien, verschachtelt, reihenfolge, score)
+
+    @staticmethod
+    def _packe(name: str, werte: pd.Series, spalten: dict, kategorien: dict):
+        codes, eindeutig = pd.factorize(werte, use_na_sentinel=False)
+        numerisch = pd.api.types.infer_dtype(werte, skipna=True) in ("integer", "floating", "mixed-integer-float")
+        if numerisch and len(eindeutig) > MAX_KATEGORIEN:
+            spalten[name] = werte.to_numpy(dtype=np.float32)
+        else:
+            tabelle = np.array(eindeutig, dtype=object)
+            if werte.dtype == object:
+                # factorize macht aus None ein NaN: den ursprünglichen Wert behalten
+                for code in np.flatnonzero(pd.isna(tabelle)):
+                    tabelle[code] = werte.iloc[int(np.argmax(codes == code))]
+            spalten[name] = codes.astype(_kleinster_code_typ(len(eindeutig)))
+            kategorien[name] = tabelle
+
+    # --- Zugriff ---
+    def __len__(self):
+        return len(self.entscheidung)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def kauf(self) -> np.ndarray:
+        return self.entscheidung == KAUFEN
+
+    @property
+    def nbytes(self) -> int:
+        groesse = self.entscheidung.nbytes + len(self.datum) * 8
+        groesse += sum(werte.nbytes for werte in self.spalten.values())
+        groesse += sum(tabelle.nbytes for tabelle in self.kategorien.values())
+        return int(groesse + (self.score.nbytes if self.score is not None else 0))
+
+    def auswahl(self, maske) -> "KompakteSignale":
+        """
+        Teilmenge der Zeilen (boolesche Maske oder Positionen), z.B. auswahl(signale.kauf).
+        """
+        return KompakteSignale(
+            self.datum[maske], self.entscheidung[maske],
+            {name: werte[maske] for name, werte in self.spalten.items()},
+            self.kategorien, self.verschachtelt, self.reihenfolge,
+            None if self.score is None else self.score[maske],
+        )
+
+    def anhaengen(self, neu: "KompakteSignale") -> "KompakteSignale":
+        """
+        Hängt die Zeilen von `neu` (gleiche Spalten, z.B. Signale neuer Bars) an.
+        Die Codes von `neu` werden auf die eigenen Nachschlagetabellen umgeschlüsselt,
+        neue Werte kommen hinten dazu – wie bei einem aus_frame über alle Zeilen.
+        """
+        if self.empty:
+            return neu
+        if neu.empty:
+            return self
+
+        spalten, kategorien = {}, {}
+        for name, werte in self.spalten.items():
+            neue_werte = neu.spalten[name]
+            if name in self.kategorien and name in neu.kategorien:
+                tabelle = {_kategorie_schluessel(wert): i for i, wert in enumerate(self.kategorien[name])}
+                neue_tabelle = neu.kategorien[name]
+                position = np.array([tabelle.get(_kategorie_schluessel(wert), -1) for wert in neue_tabelle], dtype=np.int64)
+                fehlt = position < 0
+                zusammen = np.concatenate([self.kategorien[name], neue_tabelle[fehlt]])
+                position[fehlt] = len(tabelle) + np.arange(np.count_nonzero(fehlt))
+                numerisch = pd.api.types.infer_dtype(zusammen, skipna=True) in ("integer", "floating", "mixed-integer-float")
+                if not (numerisch and len(zusammen) > MAX_KATEGORIEN):
+                    typ = _kleinster_code_typ(len(zusammen))
+                    spalten[name] = np.concatenate([werte.astype(typ), position[neue_werte].astype(typ)])
+                    kategorien[name] = zusammen
+                    continue
+            # Mindestens eine Seite als float32 (oder zu viele verschiedene Zahlenwerte)
+            spalten[name] = np.concatenate([self._als_float32(name), neu._als_float32(name)])
+
+        return KompakteSignale(
+            self.datum.append(neu.datum),
+            np.concatenate([self.entscheidung, neu.entscheidung]),
+            spalten, kategorien, self.verschachtelt, self.reihenfolge,
+            None if self.score is None or neu.score is None else np.concatenate([self.score, neu.score]),
+        )
+
+    def _als_float32(self, name: str) -> np.ndarray:
+        werte = self.spalten[name]
+        if name in self.kategorien:
+            return self.kategorien[name][werte].astype(np.float32)
+        return werte
+
+    def _entpacke(self, name: str) -> np.ndarray:
+        werte = self.spalten[name]
+        if name in self.kategorien:
+            return self.kategorien[name][werte]
+        # float32 über die kürzeste Darstellung zurück (45.28 statt 45.279998779)
+        return werte.astype(str).astype(float)
+
+    def als_frame(self, mit_score: bool = False) -> pd.DataFrame:
+        """
+        Anzeige-Form: dieselben Spalten wie die ursprüngliche Signal-Tabelle
+        (mit_score: zusätzlich der Gesamt-Score als Spalte "Score").
+        """
+        daten = {
+            "Datum": self.datum,
+            "Entscheidung": np.array(ENTSCHEIDUNG_TEXTE, dtype=object)[self.entscheidung],
+        }
+        for name in self.reihenfolge:
+            if name in self.verschachtelt:
+                teile = {s: self._entpacke(f"{name}.{s}") for s in self.verschachtelt[name]}
+                daten[name] = [dict(zip(teile, zeile)) for zeile in zip(*teile.values())]
+            else:
+                daten[name] = self._entpacke(name)
+        if mit_score and self.score is not None:
+            daten["Score"] = self.score.astype(str).astype(float)
+        return pd.DataFrame(daten)
+
+
+# ------------------------------------------------------
+# Cache für generierte Signale
+# ------------------------------------------------------
+# Die Signalgenerierung hängt nur von den Kurs-/Indikatordaten und der Strategie ab,
+# nicht von Auswertung_tage oder min_veraenderung. Ändern sich nur die
+# Auswertungsparameter (Sidebar-Slider), wird nur noch die Bewertung neu gerechnet.
+SIGNAL_CACHE = LRUZwischenspeicher(max_bytes=128 * 1024 ** 2)
+
+
+def daten_version(full_data: pd.DataFrame) -> tuple:
+    """
+    Kennung des Datenstands: Zeitraum, Zeilenzahl und ein Fingerabdruck aller
+    numerischen Spalten (z.B. geänderte MACD-Parameter → andere Version).
+    Deutlich günstiger als das Hashen/Picklen des ganzen DataFrames.
+    """
+    if full_data.empty:
+        return (0,)
+    pruefsumme = hashlib.blake2b(digest_size=16)
+    for spalte in full_data.columns:
+        werte = full_data[spalte].to_numpy()
+        if werte.dtype.kind in "biuf":
+            pruefsumme.update(str(spalte).encode())
+            pruefsumme.update(np.ascontiguousarray(werte).tobytes())
+    return (full_data.index[0], full_data.index[-1], len(full_data), pruefsumme.hexdigest())
+
+
+def _kompakt(signale) -> KompakteSignale:
+    return signale if isinstance(signale, KompakteSignale) else KompakteSignale.aus_frame(signale)
+
+
+def generiere_signale(full_data: pd.DataFrame, strategie: str, berechne, **merkmale) -> KompakteSignale:
+    """
+    Liefert die Signale aus dem SIGNAL_CACHE oder erzeugt sie mit `berechne(daten)`.
+    `berechne` liefert für einen Kurs-DataFrame KompakteSignale oder ein
+    Signal-DataFrame (wird umgewandelt), im Cache liegt immer die kompakte Form.
+    Schlüssel: (Datenstand, Strategie, Merkmale wie Kategorie/Trading-Status/min_len_window).
+    Neue Bars werden inkrementell angehängt, siehe signal_verlauf.
+    """
+    return signal_verlauf(full_data, strategie, berechne, **merkmale).signale
+
+
+# ------------------------------------------------------
+# Signale inkrementell fortschreiben (neue Tages-Bar)
+# ------------------------------------------------------
+# Alle Signal-Strategien bewerten Bar i nur anhand der Bars i-2..i (Vorwerte für
+# Kreuzungen/Rebounds). Kommt eine Bar dazu, ändern sich die Signale früherer Bars
+# also nicht: berechnet wird nur das Ende der Daten (mit etwas Vorlauf), die
+# bisherigen Signale, Kaufperioden und festen Treffer werden übernommen.
+# Rückt der Datenbeginn nach (gleitender Zeitraum), bleiben auch die Signale der
+# ersten Bars so, wie sie berechnet wurden – eine Neuberechnung könnte dort wegen
+# der anderen Einschwingphase der Indikatoren leicht abweichen.
+
+# Bars vor einer Bar, die eine Signal-Strategie höchstens braucht (iloc[-3])
+SIGNAL_RUECKBLICK = 2
+
+# Spalten, die für frühere Bars Werte späterer Bars enthalten (Chikou = Close in 26 Bars)
+NICHT_KAUSALE_SPALTEN = ("Chikou_Span",)
+
+# Wie viele Datenstände je Strategie als möglicher Vorgänger gemerkt werden
+MAX_STAENDE_JE_STRATEGIE = 64
+
+# Wie viele Auswertungen (Auswertung_tage, min_veraenderung) ein SignalVerlauf
+# höchstens behält, und die dafür in nbytes reservierte Größe je Kaufperiode
+MAX_AUSWERTUNGEN = 8
+BYTES_JE_PERIODE = 1024
+
+SIGNAL_STAENDE = {}
+_signal_lock = threading.Lock()
+
+
+class SignalVerlauf:
+    """
+    Signale einer Strategie über alle Bars plus Zustand zum Fortschreiben
+    ---------------------------------------------------------------------
+    - signale: KompakteSignale der Bars ab `versatz` (= min_len_window)
+    - kauf_positionen: Bar-Position jedes Kaufsignals
+    - perioden_start/perioden_ende: Kaufperioden (wie cluster_indizes) als Positionen in kauf_positionen
+    - auswertung(): Trefferquoten je (Auswertung_tage, min_veraenderung). Signale und
+      geschlossene Perioden mit vollständigem Vorwärts-Fenster gelten als fest und
+      werden beim Fortschreiben nicht mehr bewertet.
+    Der Verlauf liegt geteilt im SIGNAL_CACHE: die Auswertungen stehen hinter einer
+    Sperre, es bleiben die letzten MAX_AUSWERTUNGEN, und nbytes reserviert ihren Platz.
+    """
+
+    def __init__(self, full_data: pd.DataFrame, signale: KompakteSignale, max_gap_days: int = 5,
+                 kauf_positionen=None, perioden=None, feste=None):
+        self.index = full_data.index
+        self.spalten = list(full_data.columns)
+        self.kurse = full_data["Close"].to_numpy(dtype=float, copy=True)
+        self.signale = signale
+        self.versatz = len(full_data) - len(signale)
+        self.max_gap_days = max_gap_days
+
+        if kauf_positionen is None:
+            kauf_positionen = self.versatz + np.flatnonzero(signale.kauf)
+        self.kauf_positionen = kauf_positionen.astype(np.int64)
+        if perioden is None:
+            _, start, ende = cluster_indizes(self.index[self.kauf_positionen], max_gap_days)
+            perioden = (start, ende)
+        self.perioden_start, self.perioden_ende = perioden
+
+        # Vorletzte Bar (die letzte kann ein noch offener Handelstag sein) zum Wiedererkennen
+        self._pruef_spalten = [
+            k for k, (spalte, typ) in enumerate(full_data.dtypes.items())
+            if spalte not in NICHT_KAUSALE_SPALTEN and pd.api.types.is_numeric_dtype(typ)
+        ]
+        self._pruefwerte = self._pruefzeile(full_data, len(full_data) - 2)
+
+        # (Auswertung_tage, min_veraenderung) -> (Treffer fester Signale, Bewertung fester Perioden)
+        self._feste = OrderedDict(feste or {})
+        self._auswertungen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def nbytes(self) -> int:
+        # Die Auswertungen entstehen erst nach dem Einfügen in den Cache: Platz für
+        # MAX_AUSWERTUNGEN (feste Treffer je Kaufsignal, Einträge je Periode) ist eingerechnet
+        auswertung = len(self.kauf_positionen) + len(self.perioden_start) * BYTES_JE_PERIODE
+        return int(self.signale.nbytes + self.kurse.nbytes + len(self.index) * 8 + self.kauf_positionen.nbytes
+                   + self.perioden_start.nbytes + self.perioden_ende.nbytes + MAX_AUSWERTUNGEN * auswertung)
+
+    def _pruefzeile(self, full_data: pd.DataFrame, position: int) -> np.ndarray:
+        if position < 0:
+            return np.zeros(0)
+        return np.array([full_data.iat[position, k] for k in self._pruef_spalten], dtype=float)
+
+    # --- Fortschreiben ---
+    def fortsetzung(self, full_data: pd.DataFrame):
+        """
+        Prüft, ob full_data diese Daten fortsetzt (gleiche Bars, evtl. vorne gekürzt
+        und hinten verlängert). Rückgabe (vorne, ab) oder None:
+        - vorne: Anzahl der am Anfang weggefallenen Bars
+        - ab: erste neu zu berechnende Bar in full_data (die bisher letzte Bar,
+          sie kann sich als offener Handelstag noch geändert haben)
+        Verglichen wird die vorletzte bisherige Bar mit relativer Toleranz, damit
+        ein verschobener Datenbeginn (andere Einschwingphase der EMAs) nicht stört.
+        """
+        n_alt = len(self.index)
+        index = full_data.index
+        if n_alt < 2 or self.signale.empty or full_data.empty or list(full_data.columns) != self.spalten:
+            return None
+        if self.versatz < SIGNAL_RUECKBLICK:
+            # Ohne Vorlauf vor der ersten Signal-Bar lassen sich neue Bars nicht einzeln berechnen
+            return None
+        if getattr(index, "tz", None) != getattr(self.index, "tz", None):
+            return None
+
+        vorne = int(self.index.searchsorted(index[0]))
+        if vorne >= n_alt or self.index[vorne] != index[0] or index[-1] < self.index[-1]:
+            return None
+        ab = n_alt - 1 - vorne
+        if ab < self.versatz or index[ab - 1] != self.index[n_alt - 2]:
+            return None
+        if not np.allclose(self._pruefzeile(full_data, ab - 1), self._pruefwerte, rtol=1e-9, atol=0, equal_nan=True):
+            return None
+        return vorne, ab
+
+    def fortgeschrieben(self, full_data: pd.DataFrame, neue_signale: KompakteSignale, vorne: int, ab: int) -> "SignalVerlauf":
+        """
+        Neuer Verlauf für full_data aus den bisherigen Signalen (ohne die vorne
+        weggefallenen und die ab `ab` neu berechneten Bars) und neue_signale (Bars ab `ab`).
+        Die letzte Kaufperiode wird verlängert oder geschlossen, feste Treffer übernommen.
+        """
+        alt_ab = ab + vorne
+        signale = self.signale.auswahl(slice(vorne, alt_ab - self.versatz)).anhaengen(neue_signale)
+
+        # Kaufsignale: weggefallene und neu berechnete Bars entfernen, neue anhängen
+        k0 = int(np.searchsorted(self.kauf_positionen, vorne + self.versatz))
+        k1 = int(np.searchsorted(self.kauf_positionen, alt_ab))
+        neue_kaeufe = ab + np.flatnonzero(neue_signale.kauf)
+        kauf_positionen = np.concatenate([self.kauf_positionen[k0:k1] - vorne, neue_kaeufe])
+
+        # Perioden auf die behaltenen Kaufsignale kürzen
+        p0 = int(np.searchsorted(self.perioden_ende, k0))
+        p1 = int(np.searchsorted(self.perioden_start, k1))
+        start = np.maximum(self.perioden_start[p0:p1], k0) - k0
+        ende = np.minimum(self.perioden_ende[p0:p1], k1 - 1) - k0
+
+        # Neue Kaufsignale ab dem letzten behaltenen clustern: der erste Cluster setzt dessen Periode fort
+        if len(neue_kaeufe):
+            erstes = k1 - k0 - 1 if k1 > k0 else 0
+            _, neu_start, neu_ende = cluster_indizes(full_data.index[kauf_positionen[erstes:]], self.max_gap_days)
+            neu_start, neu_ende = neu_start + erstes, neu_ende + erstes
+            if k1 > k0:
+                ende[-1] = neu_ende[0]
+                neu_start, neu_ende = neu_start[1:], neu_ende[1:]
+            start = np.concatenate([start, neu_start])
+            ende = np.concatenate([ende, neu_ende])
+
+        # Feste Bewertungen liegen alle vor der bisher letzten Bar, nur vorne kürzen
+        with self._lock:
+            bisher = list(self._feste.items())
+        feste = {}
+        for schluessel, (getroffen, bewertungen) in bisher:
+            bewertungen = bewertungen[p0:]
+            if bewertungen and self.perioden_start[p0] < k0:
+                bewertungen[0] = {**bewertungen[0], "Start_Datum": full_data.index[kauf_positionen[0]]}
+            feste[schluessel] = (getroffen[k0:], bewertungen)
+
+        return SignalVerlauf(full_data, signale, self.max_gap_days, kauf_positionen, (start, ende), feste)
+
+    # --- Auswertung ---
+    def auswertung(self, auswertung_tage: int, min_veraenderung: float) -> dict:
+        """
+        Kaufperioden und Trefferquoten wie bewerte_kaufsignale/bewerte_kaufperioden:
+        - Perioden: Liste (Start_Datum, End_Datum), Perioden_Bewertung: Einträge wie bewerte_kaufperioden
+        - Einzelbewertung: wie bewerte_kaufsignale
+        Neu bewertet werden nur die noch nicht festen Signale/Perioden am Ende.
+        """
+        schluessel = (int(auswertung_tage), float(min_veraenderung))
+        with self._lock:
+            ergebnis = self._auswertungen.get(schluessel)
+            if ergebnis is not None:
+                self._auswertungen.move_to_end(schluessel)
+                return ergebnis
+            fest_getroffen, fest_bewertungen = self._feste.get(schluessel, (np.zeros(0, dtype=bool), []))
+        n = len(self.index)
+        enden = self.kauf_positionen[self.perioden_ende]
+        offene_kaeufe = self.kauf_positionen[len(fest_getroffen):]
+        offene_enden = enden[len(fest_bewertungen):]
+
+        # Vorwärts-Maximum nur ab dem ersten offenen Signal
+        von = min([n] + offene_kaeufe[:1].tolist() + offene_enden[:1].tolist())
+        max_kurse = vorwaerts_max(self.kurse[von:], auswertung_tage)
+
+        def bewerte(positionen):
+            start_kurs = self.kurse[positionen]
+            max_kurs = max_kurse[positionen - von]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                kurs_diff = (max_kurs - start_kurs) / start_kurs
+            return {"gefunden": np.ones(len(positionen), dtype=bool), "position": positionen,
+                    "start_kurs": start_kurs, "max_kurs": max_kurs, "kurs_diff": kurs_diff}
+
+        getroffen = bewerte(offene_kaeufe)["kurs_diff"] >= min_veraenderung
+        perioden = list(zip(self.index[self.kauf_positionen[self.perioden_start]], self.index[enden]))
+        offene_bewertungen = perioden_eintraege(perioden[len(fest_bewertungen):], bewerte(offene_enden), min_veraenderung)
+
+        treffer = int(np.count_nonzero(fest_getroffen) + np.count_nonzero(getroffen))
+        anzahl = len(self.kauf_positionen)
+        ergebnis = {
+            "Perioden": perioden,
+            "Perioden_Bewertung": fest_bewertungen + offene_bewertungen,
+            "Einzelbewertung": {
+                "Trefferquote_Kauf (%)": (treffer / anzahl * 100) if anzahl > 0 else None,
+                "Anzahl_geprüfter_Signale": anzahl,
+                "Treffer": treffer,
+            },
+        }
+
+        # Fest: Vorwärts-Fenster endet vor der letzten Bar; Perioden zusätzlich so weit
+        # zurück, dass kein Kaufsignal ab der letzten Bar sie noch verlängern kann
+        letzte_feste_bar = n - 2 - int(auswertung_tage)
+        neu_fest = int(np.count_nonzero(offene_kaeufe <= letzte_feste_bar))
+        neu_fest_perioden = 0
+        if len(offene_enden):
+            ns = self.index.as_unit("ns").asi8
+            abstand = (ns[-1] - ns[offene_enden]) // _TAG_NS
+            neu_fest_perioden = int(np.count_nonzero((offene_enden <= letzte_feste_bar) & (abstand > self.max_gap_days)))
+        with self._lock:
+            self._feste[schluessel] = (
+                np.concatenate([fest_getroffen, getroffen[:neu_fest]]),
+                ergebnis["Perioden_Bewertung"][:len(fest_bewertungen) + neu_fest_perioden],
+            )
+            self._auswertungen[schluessel] = ergebnis
+            for gemerkt in (self._feste, self._auswertungen):
+                gemerkt.move_to_end(schluessel)
+                while len(gemerkt) > MAX_AUSWERTUNGEN:
+                    gemerkt.popitem(last=False)
+        return ergebnis
+
+
+def _vorgaenger(strategie_schluessel) -> list:
+    with _signal_lock:
+        staende = list(SIGNAL_STAENDE.get(strategie_schluessel, ()))
+    verlaeufe = []
+    for schluessel in reversed(staende):
+        verlauf = SIGNAL_CACHE.hole(schluessel)
+        if verlauf is not None:
+            verlaeufe.append(verlauf)
+    return verlaeufe
+
+
+def _merke_stand(strategie_schluessel, schluessel):
+    with _signal_lock:
+        staende = SIGNAL_STAENDE.setdefault(strategie_schluessel, OrderedDict())
+        staende[schluessel] = True
+        staende.move_to_end(schluessel)
+        while len(staende) > MAX_STAENDE_JE_STRATEGIE:
+            staende.popitem(last=False)
+
+
+def signal_verlauf(full_data: pd.DataFrame, strategie: str, berechne, **merkmale) -> SignalVerlauf:
+    """
+    SignalVerlauf für full_data aus dem SIGNAL_CACHE. Fehlt der Datenstand, wird ein
+    gemerkter Vorgänger derselben Strategie gesucht, den full_data fortsetzt
+    (z.B. gestrige Daten + neue Tages-Bar); dann berechnet `berechne` nur die
+    neuen Bars, sonst alle.
+    """
+    strategie_schluessel = (strategie, tuple(sorted(merkmale.items())))
+    schluessel = (daten_version(full_data),) + strategie_schluessel
+    verlauf = SIGNAL_CACHE.hole(schluessel)
+    if verlauf is not None:
+        return verlauf
+
+    for vorgaenger in _vorgaenger(strategie_schluessel):
+        fortsetzung = vorgaenger.fortsetzung(full_data)
+        if fortsetzung is None:
+            continue
+        vorne, ab = fortsetzung
+        neue_signale = _kompakt(berechne(full_data.iloc[ab - vorgaenger.versatz:]))
+        if len(neue_signale) == len(full_data) - ab:
+            verlauf = vorgaenger.fortgeschrieben(full_data, neue_signale, vorne, ab)
+        break
+
+    if verlauf is None:
+        verlauf = SignalVerlauf(full_data, _kompakt(berechne(full_data)))
+    verlauf = SIGNAL_CACHE.lege_ab(schluessel, verlauf)
+    _merke_stand(strategie_schluessel, schluessel)
+    return verlauf
@@ -1,11 +1,17 @@
 import pandas as pd
-import yfinance as yf
 import numpy as np  # nur wenn du numpy Funktionen brauchst
 import plotly.graph_objects as go
 import streamlit as st
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.trend import MACD, ADXIndicator
-from ta.volatility import BollingerBands
+from core_magic_3 import TICKER_METADATEN
+from signal_auswertung import (
+    KompakteSignale,
+    VorwaertsFenster,
+    bewerte_kaufperioden,
+    bewerte_kaufsignale,
+    cluster_perioden,
+    signal_verlauf,
+    trefferquoten_flaeche,
+)
 
 def fundamental_analyse(fundamentaldaten, ticker_symbol):
     sector = fundamentaldaten["sector"]
@@ -445,6 +451,26 @@ TRADING_STATUS_MODIFIKATOR = {
     }
 }
 
+# Gewichtungen für kombiniertes_signal (du kannst sie anpassen)
+KOMBINIERTES_SIGNAL_GEWICHTE = {
+    "Bollinger": 0.25,
+    "RSI": 0.3,
+    "MACD": 0.2,
+    "ADX": 0.1,
+    "Stochastic": 0.15
+}
+
+def map_signal(sig: str) -> int:
+    """
+    Übersetzt ein Textsignal in eine Zahl (+1 Kauf, -1 Verkauf, 0 sonst).
+    """
+    if "Kauf" in sig:
+        return 1
+    elif "Verkauf" in sig:
+        return -1
+    else:
+        return 0
+
 def kombiniertes_signal(data: pd.DataFrame):
     """
     Kombiniert mehrere technische Signale zu einer Gesamtentscheidung:
@@ -465,23 +491,7 @@ def kombiniertes_signal(data: pd.DataFrame):
     # --- Nur Kaufsignale herausfiltern
     #kaufsignale = filter_kaufsignale(signale)
 
-    # Gewichtungen (du kannst sie anpassen)
-    weights = {
-        "Bollinger": 0.25,
-        "RSI": 0.3,
-        "MACD": 0.2,
-        "ADX": 0.1,
-        "Stochastic": 0.15
-    }
-
-    # Hilfsfunktion: Textsignal in Zahl übersetzen
-    def map_signal(sig: str) -> int:
-        if "Kauf" in sig:
-            return 1
-        elif "Verkauf" in sig:
-            return -1
-        else:
-            return 0
+    weights = KOMBINIERTES_SIGNAL_GEWICHTE
 
     # Gesamtbewertung berechnen
     gesamt_score = sum(map_signal(sig) * weights[name] for name, sig in signale.items())
@@ -554,78 +564,199 @@ def kombiniertes_signal_2(data: pd.DataFrame, kategorie: str, trading_status: st
 
     return entscheidung, details, round(gesamt_score, 3)
 
-def cluster_buy_signal_periods(kaufsignale_df: pd.DataFrame, max_gap_days: int = 5):
-    if "Datum" not in kaufsignale_df.columns:
-        kaufsignale_df = kaufsignale_df.reset_index()
+# ------------------------------------------------------
+# Vektorisierte Signalberechnung über die gesamte Historie
+# ------------------------------------------------------
+# Jeder Einzelsignal-Zustand wird als Code gespeichert, der Index im Tupel
+# entspricht dem Code. Die Texte sind identisch zu den Rückgaben von
+# bollinger_signal, RSI_signal, macd_signal, adx_signal und stochastic_signal.
+SIGNAL_TEXTE = {
+    "Bollinger": (
+        "🟡 Bollinger Signal - Haltesignal",
+        "🟢 Bollinger Signal - Kaufsignal (≤1,5 % vom unteren Band oder Rebound)",
+        "🔴 Bollinger Signal - Verkaufssignal (≤1,5 % vom oberen Band oder Rebound)",
+        "Keine gültigen Bollinger-Daten",
+        "🟡 Zu wenige Daten für Bollinger-Signal",
+        "Keine Bollinger-Band-Daten vorhanden",
+    ),
+    "RSI": (
+        "🟡 RSI Signal - Haltesignal",
+        "🟢 RSI Signal - Kaufsignal",
+        "🔴 RSI Signal - Verkaufssignal",
+    ),
+    "MACD": (
+        "🟡 MACD Signal - Haltesignal",
+        "🟢 MACD Signal - Starkes Kaufsignal (Cross + Momentum)",
+        "🔴 MACD Signal - Starkes Verkaufssignal (Cross + Momentum)",
+        "🟡 MACD Signal - Schwaches Kaufsignal (Cross ohne Momentum)",
+        "🟡 MACD Signal - Schwaches Verkaufssignal (Cross ohne Momentum)",
+        "🟡 Zu wenige Daten für MACD-Signal",
+    ),
+    "ADX": (
+        "🟡 ADX Signal - Kein klarer Trend (ADX zu niedrig)",
+        "🟢 ADX Signal - Aufwärtstrend (ADX stark, +DI > -DI)",
+        "🔴 ADX Signal - Abwärtstrend (ADX stark, +DI < -DI)",
+    ),
+    "Stochastic": (
+        "🟡 Stochastic Oscillator - Haltesignal",
+        "🟢 Stochastic Oscillator - Kaufsignal",
+        "🔴 Stochastic Oscillator - Verkaufssignal",
+        "🟡 Zu wenige Daten für Stochastic-Signal",
+        "Daten für Stochastic Oscillator fehlen",
+    ),
+}
 
-    daten = kaufsignale_df.sort_values("Datum").reset_index(drop=True)["Datum"]
+def _vorwert(werte: np.ndarray) -> np.ndarray:
+    """
+    Verschiebt ein Array um eine Zeile nach hinten (entspricht iloc[-2] je Fenster).
+    """
+    verschoben = np.empty_like(werte)
+    verschoben[0] = np.nan
+    verschoben[1:] = werte[:-1]
+    return verschoben
 
-    perioden = []
-    start = daten[0]
-    prev = daten[0]
+def berechne_signal_zustaende(full_data: pd.DataFrame) -> dict:
+    """
+    Berechnet die Zustandscodes aller Einzelsignale für jede Zeile auf einmal.
+
+    Zeile i entspricht dem Aufruf des jeweiligen Einzelsignals mit full_data.iloc[:i+1].
+    Die Codes indizieren SIGNAL_TEXTE.
 
-    for current in daten[1:]:
-        diff = (current - prev).days
-        if diff <= max_gap_days:
-            prev = current
+    Rückgabe:
+    - Dict Signalname -> int8-Array mit einem Code je Zeile
+    """
+    n = len(full_data)
+    position = np.arange(n)
+    spalten = full_data.columns
+
+    close = full_data["Close"].to_numpy(dtype=float)
+    close_prev = _vorwert(close)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # --- Bollinger
+        if {"Close", "BB_Upper", "BB_Lower"}.issubset(spalten):
+            upper = full_data["BB_Upper"].to_numpy(dtype=float)
+            lower = full_data["BB_Lower"].to_numpy(dtype=float)
+            upper_prev = _vorwert(upper)
+            lower_prev = _vorwert(lower)
+
+            dist_lower = (close - lower) / lower
+            dist_upper = (upper - close) / upper
+            kauf = (dist_lower <= 0.015) | ((close_prev < lower_prev) & (close > lower))
+            verkauf = (dist_upper <= 0.015) | ((close_prev > upper_prev) & (close < upper))
+            ungueltig = np.isnan(upper) | np.isnan(lower)
+            bollinger = np.select([position < 1, ungueltig, kauf, verkauf], [4, 3, 1, 2], default=0)
         else:
-            perioden.append((start, prev))
-            start = current
-            prev = current
-    perioden.append((start, prev))
+            bollinger = np.where(position < 1, 4, 5)
+
+        # --- RSI
+        rsi = full_data["RSI"].to_numpy(dtype=float)
+        rsi_zustand = np.select([rsi < 35, rsi > 60], [1, 2], default=0)
+
+        # --- MACD
+        macd = full_data["MACD"].to_numpy(dtype=float)
+        macd_sig = full_data["MACD_Signal"].to_numpy(dtype=float)
+        macd_prev = _vorwert(macd)
+        macd_sig_prev = _vorwert(macd_sig)
+
+        bullish_cross = (macd_prev < macd_sig_prev) & (macd > macd_sig)
+        bearish_cross = (macd_prev > macd_sig_prev) & (macd < macd_sig)
+        momentum_positive = (macd - macd_prev) > 0
+        momentum_negative = (macd - macd_prev) < 0
+        distanz_ok = np.abs(macd - macd_sig) > 0.1
+        macd_zustand = np.select(
+            [
+                position < 2,
+                bullish_cross & momentum_positive & distanz_ok,
+                bearish_cross & momentum_negative & distanz_ok,
+                bullish_cross,
+                bearish_cross,
+            ],
+            [5, 1, 2, 3, 4],
+            default=0,
+        )
+
+        # --- ADX
+        adx = full_data["ADX"].to_numpy(dtype=float)
+        pdi = full_data["+DI"].to_numpy(dtype=float)
+        mdi = full_data["-DI"].to_numpy(dtype=float)
+        adx_zustand = np.select([adx < 25, pdi > mdi], [0, 1], default=2)
+
+        # --- Stochastic
+        if {"Stoch_%K", "Stoch_%D"}.issubset(spalten):
+            k = full_data["Stoch_%K"].to_numpy(dtype=float)
+            d = full_data["Stoch_%D"].to_numpy(dtype=float)
+            k_prev = _vorwert(k)
+            d_prev = _vorwert(d)
+            kauf = (k_prev < d_prev) & (k > d) & (k < 20) & (d < 20)
+            verkauf = (k_prev > d_prev) & (k < d) & (k > 80) & (d > 80)
+            stochastic = np.select([position < 1, kauf, verkauf], [3, 1, 2], default=0)
+        else:
+            stochastic = np.where(position < 1, 3, 4)
+
+    return {
+        "Bollinger": bollinger.astype(np.int8),
+        "RSI": rsi_zustand.astype(np.int8),
+        "MACD": macd_zustand.astype(np.int8),
+        "ADX": adx_zustand.astype(np.int8),
+        "Stochastic": stochastic.astype(np.int8),
+    }
+
+def _kombinierte_zustaende(full_data: pd.DataFrame, min_len_window: int):
+    """
+    Zustandscodes ab min_len_window, Gesamt-Score und Entscheidungscode je Zeile.
+    """
+    zustaende = berechne_signal_zustaende(full_data)
+    bereich = slice(min_len_window, len(full_data))
+    zustaende = {name: codes[bereich] for name, codes in zustaende.items()}
+
+    # Gesamtbewertung in derselben Reihenfolge wie kombiniertes_signal summieren
+    gesamt_score = np.zeros(len(full_data) - min_len_window)
+    for name, gewicht in KOMBINIERTES_SIGNAL_GEWICHTE.items():
+        werte = np.array([map_signal(text) for text in SIGNAL_TEXTE[name]])
+        gesamt_score = gesamt_score + werte[zustaende[name]] * gewicht
 
-    return perioden
+    entscheidung = np.select([gesamt_score > 0.2, gesamt_score < -0.2], [1, 2], default=0).astype(np.int8)
+    return zustaende, gesamt_score, entscheidung
+
+def kombinierte_signale_kompakt(full_data: pd.DataFrame, min_len_window: int = 20) -> KompakteSignale:
+    """
+    Vektorisierte Variante von kombiniertes_signal für alle Fenster
+    full_data.iloc[:i+1] mit i ab min_len_window, direkt als KompakteSignale:
+    die Zustandscodes sind bereits die Kategorie-Codes für SIGNAL_TEXTE.
+    """
+    if len(full_data) <= min_len_window:
+        return KompakteSignale(pd.DatetimeIndex([]), np.zeros(0, dtype=np.int8))
+
+    zustaende, gesamt_score, entscheidung = _kombinierte_zustaende(full_data, min_len_window)
+    namen = ["Bollinger", "RSI", "MACD", "ADX", "Stochastic"]
+    return KompakteSignale(
+        full_data.index[min_len_window:],
+        entscheidung,
+        spalten={name: zustaende[name] for name in namen},
+        kategorien={name: np.array(SIGNAL_TEXTE[name], dtype=object) for name in namen},
+        score=gesamt_score,
+    )
+
+def cluster_buy_signal_periods(kaufsignale_df: pd.DataFrame, max_gap_days: int = 5):
+    if "Datum" not in kaufsignale_df.columns:
+        kaufsignale_df = kaufsignale_df.reset_index()
+
+    # Abstände über np.diff statt Schleife, siehe cluster_indizes
+    return cluster_perioden(kaufsignale_df["Datum"], max_gap_days)
 
 
 def evaluate_buy_periods(perioden, full_data,
-                         Auswertung_tage, min_veraenderung):
-    bewertungen = []
-
-    for (start_datum, end_datum) in perioden:
-        # jetzt sind start_datum und end_datum schon Datumswerte
-        try:
-            start_kurs = full_data.loc[end_datum, "Close"]
-        except KeyError:
-            bewertungen.append({
-                "Start_Datum": start_datum,
-                "End_Datum": end_datum,
-                "Bewertung": None,
-                "Kommentar": "Datum nicht in Daten gefunden"
-            })
-            continue
-
-        try:
-            end_index = full_data.index.get_loc(end_datum)
-            lookahead_index = end_index + Auswertung_tage
-            if lookahead_index >= len(full_data):
-                lookahead_index = len(full_data) - 1
-            max_kurs = full_data.iloc[end_index:lookahead_index+1]["Close"].max()
-        except Exception as e:
-            bewertungen.append({
-                "Start_Datum": start_datum,
-                "End_Datum": end_datum,
-                "Bewertung": None,
-                "Kommentar": f"Fehler beim Kursvergleich: {e}"
-            })
-            continue
-
-        kurs_diff = (max_kurs - start_kurs) / start_kurs
-        getroffen = kurs_diff >= min_veraenderung
-
-        bewertungen.append({
-            "Start_Datum": start_datum,
-            "End_Datum": end_datum,
-            "Bewertung": getroffen,
-            "Max_Kurs": max_kurs,
-            "Start_Kurs": start_kurs,
-            "Kurs_Diff": kurs_diff,
-            "Kommentar": f"Kursanstieg >= {min_veraenderung*100:.1f}%: {getroffen}"
-        })
-
-    return bewertungen
-
-
-def evaluate_buy_signals(full_data, kaufsignale_df, Auswertung_tage, min_veraenderung):
+                         Auswertung_tage, min_veraenderung,
+                         fenster: VorwaertsFenster = None,
+                         positionen=None):
+    # Vorwärts-Max aller Bars einmal berechnen, dann je Periode nur ein Array-Zugriff
+    return bewerte_kaufperioden(perioden, full_data, Auswertung_tage, min_veraenderung, fenster, positionen)
+
+
+def evaluate_buy_signals(full_data, kaufsignale_df, Auswertung_tage, min_veraenderung,
+                         fenster: VorwaertsFenster = None,
+                         positionen=None):
     """
     Bewertet einzelne Kaufsignale nach Kursentwicklung.
 
@@ -640,178 +771,140 @@ def evaluate_buy_signals(full_data, kaufsignale_df, Auswertung_tage, min_veraend
     Rückgabe:
     - Dict mit Trefferquote und Anzahl geprüfter Signale
     """
+    return bewerte_kaufsignale(full_data, kaufsignale_df, Auswertung_tage, min_veraenderung, fenster, positionen)
 
-    treffer = 0
-    anzahl = 0
-
-    for _, signal_row in kaufsignale_df.iterrows():
-        datum = signal_row["Datum"]
+def kombinierter_signal_verlauf(full_data: pd.DataFrame, min_len_window: int = 20, vektorisiert: bool = True):
+    """
+    SignalVerlauf von kombiniertes_signal (gecacht, neue Bars werden nur angehängt;
+    hängt nicht von Auswertung_tage/min_veraenderung ab).
+    """
+    def erzeuge_signale(daten):
+        if vektorisiert:
+            # Alle Fenster auf einmal über verschobene Arrays berechnen
+            return kombinierte_signale_kompakt(daten, min_len_window)
 
-        try:
-            start_kurs = full_data.loc[datum, "Close"]
-        except KeyError:
-            continue  # Datum nicht gefunden, überspringen
+        signale_liste = []
+        scores = []
 
-        try:
-            start_index = full_data.index.get_loc(datum)
-            end_index = start_index + Auswertung_tage
-            if end_index >= len(full_data):
-                end_index = len(full_data) - 1
-            max_kurs = full_data.iloc[start_index:end_index+1]["Close"].max()
-        except Exception:
-            continue
+        for i in range(min_len_window, len(daten)):
+            fenster = daten.iloc[:i+1]
+            entscheidung, einzelsignale, gesamtscore = kombiniertes_signal(fenster)  # Deine Signalgenerierung
+            datum = fenster.index[-1]
+            signale_liste.append({"Datum": datum, "Entscheidung": entscheidung, **einzelsignale})
+            scores.append(gesamtscore)
 
-        kurs_diff = (max_kurs - start_kurs) / start_kurs
-        if kurs_diff >= min_veraenderung:
-            treffer += 1
-        anzahl += 1
+        return KompakteSignale.aus_frame(pd.DataFrame(signale_liste), score=scores)
 
-    trefferquote = (treffer / anzahl * 100) if anzahl > 0 else None
+    return signal_verlauf(
+        full_data, "signals_2.kombiniertes_signal", erzeuge_signale,
+        min_len_window=min_len_window, vektorisiert=vektorisiert
+    )
 
-    return {
-        "Trefferquote_Kauf (%)": trefferquote,
-        "Anzahl_geprüfter_Signale": anzahl,
-        "Treffer": treffer
-    }
+def generiere_kombinierte_signale(full_data: pd.DataFrame, min_len_window: int = 20, vektorisiert: bool = True) -> KompakteSignale:
+    """
+    Alle Signale über den gesamten Zeitraum als KompakteSignale
+    (gecacht: hängt nicht von Auswertung_tage/min_veraenderung ab).
+    """
+    return kombinierter_signal_verlauf(full_data, min_len_window, vektorisiert).signale
 
 def analyse_kaufsignal_perioden(full_data: pd.DataFrame,
                                Auswertung_tage,
                                min_veraenderung,
                                min_len_window: int = 20,
-                               innerhalb_zeitraum: bool = True):
-    # 1. Alle Signale über den gesamten Zeitraum generieren
-    signale_liste = []
+                               innerhalb_zeitraum: bool = True,
+                               vektorisiert: bool = True):
+    # 1. Alle Signale über den gesamten Zeitraum generieren (kompakt, neue Bars inkrementell)
+    verlauf = kombinierter_signal_verlauf(full_data, min_len_window, vektorisiert)
+    return _analyse_verlauf(verlauf, Auswertung_tage, min_veraenderung)
 
-    for i in range(min_len_window, len(full_data)):
-        fenster = full_data.iloc[:i+1]
-        entscheidung, einzelsignale, gesamtscore = kombiniertes_signal(fenster)  # Deine Signalgenerierung
-        datum = fenster.index[-1]
-        signale_liste.append({"Datum": datum, "Entscheidung": entscheidung, **einzelsignale})
-
-    signale_df = pd.DataFrame(signale_liste)  # signale_df hier erzeugen!
-
-    # 2. Nur Kaufsignale herausfiltern
-    kaufsignale_df = signale_df[signale_df["Entscheidung"].str.contains("Kauf")].copy()
+def _analyse_verlauf(verlauf, Auswertung_tage, min_veraenderung) -> dict:
+    """
+    Kaufsignale, Perioden und Trefferquoten eines SignalVerlaufs
+    (Signal_Details als KompakteSignale, Texte über als_frame()).
+    """
+    signale = verlauf.signale
 
-    if kaufsignale_df.empty:
+    # 2. Nur Kaufsignale zählen (Integer-Vergleich)
+    if len(verlauf.kauf_positionen) == 0:
         return {
             "Anzahl_Kaufsignale": 0,
             "Trefferquote_Kauf (%)": None,
             "Gesamt_Signale": 0,
-            "Signal_Details": signale_df,
+            "Signal_Details": signale,
             "Perioden": [],
             "Perioden_Bewertung": None
         }
 
-    # 3. Perioden clustern basierend auf echten Handelstagen
-    perioden = cluster_buy_signal_periods(kaufsignale_df, max_gap_days=5)
-
-    # 4. Jede Periode bewerten
-    perioden_bewertung = evaluate_buy_periods(perioden, full_data,
-                                             Auswertung_tage=Auswertung_tage,
-                                             min_veraenderung=min_veraenderung)
-
-    # 5. Einzelbewertung (optional)
-    einzelbewertung = evaluate_buy_signals(full_data, kaufsignale_df,
-                                           Auswertung_tage=Auswertung_tage,
-                                           min_veraenderung=min_veraenderung,
-                                           )
+    # 3.-5. Perioden (max. 5 Tage Lücke) und Bewertung; feste Treffer und
+    #       geschlossene Perioden kommen aus dem vorherigen Datenstand
+    auswertung = verlauf.auswertung(Auswertung_tage, min_veraenderung)
+    einzelbewertung = auswertung["Einzelbewertung"]
 
     return {
-        "Anzahl_Kaufsignale": len(kaufsignale_df),
+        "Anzahl_Kaufsignale": len(verlauf.kauf_positionen),
         "Trefferquote_Kauf (%)": einzelbewertung["Trefferquote_Kauf (%)"],
-        "Gesamt_Signale": len(signale_df),
-        "Signal_Details": signale_df,
-        "Perioden": perioden,
-        "Perioden_Bewertung": perioden_bewertung,
+        "Gesamt_Signale": len(signale),
+        "Signal_Details": signale,
+        "Perioden": auswertung["Perioden"],
+        "Perioden_Bewertung": auswertung["Perioden_Bewertung"],
         "Einzelbewertung": einzelbewertung
     }
 
+def analyse_trefferquoten_flaeche(full_data: pd.DataFrame,
+                                 tage_raster=range(10, 201, 10),
+                                 schwellen=np.round(np.arange(0.0, 0.301, 0.01), 2),
+                                 min_len_window: int = 20):
+    """
+    Trefferquote der Kaufsignale und Kaufperioden für ein ganzes Raster aus
+    Auswertung_tage × min_veraenderung (z.B. zum Kalibrieren der Sidebar-Slider).
+    Signale und Perioden werden nur einmal erzeugt, siehe trefferquoten_flaeche.
+    """
+    signale = generiere_kombinierte_signale(full_data, min_len_window)
+    kaufsignale_df = signale.auswahl(signale.kauf).als_frame()
+    perioden = cluster_buy_signal_periods(kaufsignale_df, max_gap_days=5) if not kaufsignale_df.empty else []
+
+    flaeche = trefferquoten_flaeche(full_data, kaufsignale_df["Datum"], perioden, tage_raster, schwellen)
+    flaeche["Anzahl_Kaufsignale"] = len(kaufsignale_df)
+    flaeche["Anzahl_Perioden"] = len(perioden)
+    return flaeche
+
 def analyse_kaufsignal_perioden_2(full_data: pd.DataFrame,
                                Auswertung_tage,
                                min_veraenderung,
                                min_len_window: int = 20,
                                innerhalb_zeitraum: bool = True):
     # 1. Alle Signale über den gesamten Zeitraum generieren
-    signale_liste = []
-
-    for i in range(min_len_window, len(full_data)):
-        fenster = full_data.iloc[:i+1]
-        entscheidung, einzelsignale, gesamtscore = kombiniertes_signal_2(fenster)  # Deine Signalgenerierung
-        datum = fenster.index[-1]
-        signale_liste.append({"Datum": datum, "Entscheidung": entscheidung, **einzelsignale})
-
-    signale_df = pd.DataFrame(signale_liste)  # signale_df hier erzeugen!
-
-    # 2. Nur Kaufsignale herausfiltern
-    kaufsignale_df = signale_df[signale_df["Entscheidung"].str.contains("Kauf")].copy()
-
-    if kaufsignale_df.empty:
-        return {
-            "Anzahl_Kaufsignale": 0,
-            "Trefferquote_Kauf (%)": None,
-            "Gesamt_Signale": 0,
-            "Signal_Details": signale_df,
-            "Perioden": [],
-            "Perioden_Bewertung": None
-        }
+    #    (gecacht wie analyse_kaufsignal_perioden, neue Bars werden nur angehängt)
+    def erzeuge_signale(daten):
+        signale_liste = []
+        scores = []
 
-    # 3. Perioden clustern basierend auf echten Handelstagen
-    perioden = cluster_buy_signal_periods(kaufsignale_df, max_gap_days=5)
+        for i in range(min_len_window, len(daten)):
+            fenster = daten.iloc[:i+1]
+            entscheidung, einzelsignale, gesamtscore = kombiniertes_signal_2(fenster)  # Deine Signalgenerierung
+            datum = fenster.index[-1]
+            signale_liste.append({"Datum": datum, "Entscheidung": entscheidung, **einzelsignale})
+            scores.append(gesamtscore)
 
-    # 4. Jede Periode bewerten
-    perioden_bewertung = evaluate_buy_periods(perioden, full_data,
-                                             Auswertung_tage=Auswertung_tage,
-                                             min_veraenderung=min_veraenderung)
+        return KompakteSignale.aus_frame(pd.DataFrame(signale_liste), score=scores)
 
-    # 5. Einzelbewertung (optional)
-    einzelbewertung = evaluate_buy_signals(full_data, kaufsignale_df,
-                                           Auswertung_tage=Auswertung_tage,
-                                           min_veraenderung=min_veraenderung,
-                                           )
+    verlauf = signal_verlauf(
+        full_data, "signals_2.kombiniertes_signal_2", erzeuge_signale, min_len_window=min_len_window
+    )
 
-    return {
-        "Anzahl_Kaufsignale": len(kaufsignale_df),
-        "Trefferquote_Kauf (%)": einzelbewertung["Trefferquote_Kauf (%)"],
-        "Gesamt_Signale": len(signale_df),
-        "Signal_Details": signale_df,
-        "Perioden": perioden,
-        "Perioden_Bewertung": perioden_bewertung,
-        "Einzelbewertung": einzelbewertung
-    }
+    # 2.-5. Kaufsignale, Perioden und Bewertung wie analyse_kaufsignal_perioden
+    return _analyse_verlauf(verlauf, Auswertung_tage, min_veraenderung)
 
 def lade_analystenbewertung(symbol):
-    ticker = yf.Ticker(symbol)
-    anal_data = {}
-
-    # Analysten-Empfehlungen (Buy/Hold/Sell)
-    try:
-        summary = ticker.recommendations_summary
-        # Falls summary nicht None und kein DataFrame, versuche Umwandlung
-        if summary is not None and not isinstance(summary, pd.DataFrame):
-            summary = pd.DataFrame(summary)
-        anal_data["summary"] = summary
-    except Exception as e:
-        anal_data["summary"] = None
-
-    # Historische Empfehlungen
-    try:
-        recs = ticker.recommendations
-        if recs is not None and not isinstance(recs, pd.DataFrame):
-            recs = pd.DataFrame(recs)
-        anal_data["recommendations"] = recs
-    except Exception as e:
-        anal_data["recommendations"] = None
-
-    # Tiefere Analyse wie Wachstum/Kennzahlen
-    try:
-        analysis = ticker.analysis
-        if analysis is not None and not isinstance(analysis, pd.DataFrame):
-            analysis = pd.DataFrame(analysis)
-        anal_data["analysis"] = analysis
-    except Exception as e:
-        anal_data["analysis"] = None
-
+    metadaten = TICKER_METADATEN.hole(symbol)
+
+    # Analysten-Empfehlungen (Buy/Hold/Sell), historische Empfehlungen
+    # und tiefere Analyse wie Wachstum/Kennzahlen
+    anal_data = {
+        "summary": metadaten["summary"],
+        "recommendations": metadaten["recommendations"],
+        "analysis": metadaten["analysis"]
+    }
     return anal_data
 
 
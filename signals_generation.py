@@ -3,9 +3,14 @@ import yfinance as yf
 import numpy as np  # nur wenn du numpy Funktionen brauchst
 import plotly.graph_objects as go
 import streamlit as st
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.trend import MACD, ADXIndicator
-from ta.volatility import BollingerBands
+from signal_auswertung import (
+    KompakteSignale,
+    VorwaertsFenster,
+    bewerte_kaufperioden,
+    bewerte_kaufsignale,
+    cluster_perioden,
+    signal_verlauf,
+)
 
 
 from core_magic_3 import (
@@ -835,14 +840,16 @@ class SwingTrading:
 
         st.write(gesamt_signal)
 
-    def zeige_swingtrading_signalauswertung(self, data, Auswertung_tage, min_veraenderung,  Kategorie, TradingStatus,):
+    def zeige_swingtrading_signalauswertung(self, data, Auswertung_tage, min_veraenderung,  Kategorie, TradingStatus, analyse_ergebnis=None):
         """
         Führt die Analyse der Kaufsignal-Perioden durch
         und zeigt nur die prozentzele trefferquote in Streamlit an.
+        Ein bereits berechnetes analyse_ergebnis wird direkt angezeigt.
         """
 
         # Analyse aus Kernfunktion laden
-        analyse_ergebnis = PeriodAnalysis.analyse_kaufsignal_perioden(data, Auswertung_tage, min_veraenderung, Kategorie, TradingStatus,)
+        if analyse_ergebnis is None:
+            analyse_ergebnis = PeriodAnalysis.analyse_kaufsignal_perioden(data, Auswertung_tage, min_veraenderung, Kategorie, TradingStatus,)
         st.write(f"Anzahl Kaufsignale (gesamt): {analyse_ergebnis.get('Anzahl_Kaufsignale', 0)}")
 
         # Perioden-Bewertung prüfen
@@ -897,14 +904,16 @@ class SwingTrading:
             else:
                 st.success("Alle abgeschlossenen Perioden wurden ausgewertet – keine offenen Perioden vorhanden.")
 
-    def zeige_swingtrading_signalauswertung_2(self, data, Auswertung_tage, min_veraenderung,  Kategorie, TradingStatus,):
+    def zeige_swingtrading_signalauswertung_2(self, data, Auswertung_tage, min_veraenderung,  Kategorie, TradingStatus, analyse_ergebnis=None):
         """
         Führt die Analyse der Kaufsignal-Perioden durch
         und zeigt nur die prozentzele trefferquote in Streamlit an.
+        Ein bereits berechnetes analyse_ergebnis wird direkt angezeigt.
         """
 
         # Analyse aus Kernfunktion laden
-        analyse_ergebnis = PeriodAnalysis.analyse_kaufsignal_perioden_2(data, Auswertung_tage, min_veraenderung, Kategorie, TradingStatus,)
+        if analyse_ergebnis is None:
+            analyse_ergebnis = PeriodAnalysis.analyse_kaufsignal_perioden_2(data, Auswertung_tage, min_veraenderung, Kategorie, TradingStatus,)
         st.write(f"Anzahl Kaufsignale (gesamt): {analyse_ergebnis.get('Anzahl_Kaufsignale', 0)}")
 
         # Perioden-Bewertung prüfen
@@ -968,50 +977,50 @@ class PeriodAnalysis:
                                 min_len_window: int = 20,
                                 innerhalb_zeitraum: bool = True):
         # 1. Alle Signale über den gesamten Zeitraum generieren
-        signale_liste = []
-
-        for i in range(min_len_window, len(full_data)):
-            fenster = full_data.iloc[:i+1]
-            entscheidung, einzelsignale, gesamtscore = SwingTrading.kombiniertes_signal_2(fenster, Kategorie, TradingStatus)  # Deine Signalgenerierung
-            datum = fenster.index[-1]
-            signale_liste.append({"Datum": datum, "Entscheidung": entscheidung, **einzelsignale})
-
-        signale_df = pd.DataFrame(signale_liste)  # signale_df hier erzeugen!
-
-        # 2. Nur Kaufsignale herausfiltern
-        kaufsignale_df = signale_df[signale_df["Entscheidung"].str.contains("Kauf")].copy()
+        #    (gecacht: hängt nicht von Auswertung_tage/min_veraenderung ab;
+        #    bei einer neuen Bar wird nur diese berechnet, siehe signal_verlauf)
+        def erzeuge_signale(daten):
+            signale_liste = []
+            scores = []
+
+            for i in range(min_len_window, len(daten)):
+                fenster = daten.iloc[:i+1]
+                entscheidung, einzelsignale, gesamtscore = SwingTrading.kombiniertes_signal_2(fenster, Kategorie, TradingStatus)  # Deine Signalgenerierung
+                datum = fenster.index[-1]
+                signale_liste.append({"Datum": datum, "Entscheidung": entscheidung, **einzelsignale})
+                scores.append(gesamtscore)
+
+            return KompakteSignale.aus_frame(pd.DataFrame(signale_liste), score=scores)
+
+        verlauf = signal_verlauf(
+            full_data, "SwingTrading.kombiniertes_signal_2", erzeuge_signale,
+            kategorie=Kategorie, trading_status=TradingStatus, min_len_window=min_len_window
+        )
+        signale = verlauf.signale
 
-        if kaufsignale_df.empty:
+        # 2. Nur Kaufsignale zählen (Integer-Vergleich)
+        if len(verlauf.kauf_positionen) == 0:
             return {
                 "Anzahl_Kaufsignale": 0,
                 "Trefferquote_Kauf (%)": None,
                 "Gesamt_Signale": 0,
-                "Signal_Details": signale_df,
+                "Signal_Details": signale,
                 "Perioden": [],
                 "Perioden_Bewertung": None
             }
 
-        # 3. Perioden clustern basierend auf echten Handelstagen
-        perioden = PeriodAnalysis.cluster_buy_signal_periods(kaufsignale_df, max_gap_days=5)
-
-        # 4. Jede Periode bewerten
-        perioden_bewertung = PeriodAnalysis.evaluate_buy_periods(perioden, full_data,
-                                                Auswertung_tage=Auswertung_tage,
-                                                min_veraenderung=min_veraenderung)
-
-        # 5. Einzelbewertung (optional)
-        einzelbewertung = PeriodAnalysis.evaluate_buy_signals(full_data, kaufsignale_df,
-                                            Auswertung_tage=Auswertung_tage,
-                                            min_veraenderung=min_veraenderung,
-                                            )
+        # 3.-5. Perioden (max. 5 Tage Lücke) und Bewertung; feste Treffer und
+        #       geschlossene Perioden kommen aus dem vorherigen Datenstand
+        auswertung = verlauf.auswertung(Auswertung_tage, min_veraenderung)
+        einzelbewertung = auswertung["Einzelbewertung"]
 
         return {
-            "Anzahl_Kaufsignale": len(kaufsignale_df),
+            "Anzahl_Kaufsignale": len(verlauf.kauf_positionen),
             "Trefferquote_Kauf (%)": einzelbewertung["Trefferquote_Kauf (%)"],
-            "Gesamt_Signale": len(signale_df),
-            "Signal_Details": signale_df,
-            "Perioden": perioden,
-            "Perioden_Bewertung": perioden_bewertung,
+            "Gesamt_Signale": len(signale),
+            "Signal_Details": signale,
+            "Perioden": auswertung["Perioden"],
+            "Perioden_Bewertung": auswertung["Perioden_Bewertung"],
             "Einzelbewertung": einzelbewertung
         }
     
@@ -1023,50 +1032,50 @@ class PeriodAnalysis:
                                 min_len_window: int = 20,
                                 innerhalb_zeitraum: bool = True):
         # 1. Alle Signale über den gesamten Zeitraum generieren
-        signale_liste = []
-
-        for i in range(min_len_window, len(full_data)):
-            fenster = full_data.iloc[:i+1]
-            entscheidung, einzelsignale, gesamtscore = SwingTrading.kombiniertes_signal_3(fenster, Kategorie, TradingStatus)  # Deine Signalgenerierung
-            datum = fenster.index[-1]
-            signale_liste.append({"Datum": datum, "Entscheidung": entscheidung, **einzelsignale})
-
-        signale_df = pd.DataFrame(signale_liste)  # signale_df hier erzeugen!
-
-        # 2. Nur Kaufsignale herausfiltern
-        kaufsignale_df = signale_df[signale_df["Entscheidung"].str.contains("Kauf")].copy()
+        #    (gecacht: hängt nicht von Auswertung_tage/min_veraenderung ab;
+        #    bei einer neuen Bar wird nur diese berechnet, siehe signal_verlauf)
+        def erzeuge_signale(daten):
+            signale_liste = []
+            scores = []
+
+            for i in range(min_len_window, len(daten)):
+                fenster = daten.iloc[:i+1]
+                entscheidung, einzelsignale, gesamtscore = SwingTrading.kombiniertes_signal_3(fenster, Kategorie, TradingStatus)  # Deine Signalgenerierung
+                datum = fenster.index[-1]
+                signale_liste.append({"Datum": datum, "Entscheidung": entscheidung, **einzelsignale})
+                scores.append(gesamtscore)
+
+            return KompakteSignale.aus_frame(pd.DataFrame(signale_liste), score=scores)
+
+        verlauf = signal_verlauf(
+            full_data, "SwingTrading.kombiniertes_signal_3", erzeuge_signale,
+            kategorie=Kategorie, trading_status=TradingStatus, min_len_window=min_len_window
+        )
+        signale = verlauf.signale
 
-        if kaufsignale_df.empty:
+        # 2. Nur Kaufsignale zählen (Integer-Vergleich)
+        if len(verlauf.kauf_positionen) == 0:
             return {
                 "Anzahl_Kaufsignale": 0,
                 "Trefferquote_Kauf (%)": None,
                 "Gesamt_Signale": 0,
-                "Signal_Details": signale_df,
+                "Signal_Details": signale,
                 "Perioden": [],
                 "Perioden_Bewertung": None
             }
 
-        # 3. Perioden clustern basierend auf echten Handelstagen
-        perioden = PeriodAnalysis.cluster_buy_signal_periods(kaufsignale_df, max_gap_days=5)
-
-        # 4. Jede Periode bewerten
-        perioden_bewertung = PeriodAnalysis.evaluate_buy_periods(perioden, full_data,
-                                                Auswertung_tage=Auswertung_tage,
-                                                min_veraenderung=min_veraenderung)
-
-        # 5. Einzelbewertung (optional)
-        einzelbewertung = PeriodAnalysis.evaluate_buy_signals(full_data, kaufsignale_df,
-                                            Auswertung_tage=Auswertung_tage,
-                                            min_veraenderung=min_veraenderung,
-                                            )
+        # 3.-5. Perioden (max. 5 Tage Lücke) und Bewertung; feste Treffer und
+        #       geschlossene Perioden kommen aus dem vorherigen Datenstand
+        auswertung = verlauf.auswertung(Auswertung_tage, min_veraenderung)
+        einzelbewertung = auswertung["Einzelbewertung"]
 
         return {
-            "Anzahl_Kaufsignale": len(kaufsignale_df),
+            "Anzahl_Kaufsignale": len(verlauf.kauf_positionen),
             "Trefferquote_Kauf (%)": einzelbewertung["Trefferquote_Kauf (%)"],
-            "Gesamt_Signale": len(signale_df),
-            "Signal_Details": signale_df,
-            "Perioden": perioden,
-            "Perioden_Bewertung": perioden_bewertung,
+            "Gesamt_Signale": len(signale),
+            "Signal_Details": signale,
+            "Perioden": auswertung["Perioden"],
+            "Perioden_Bewertung": auswertung["Perioden_Bewertung"],
             "Einzelbewertung": einzelbewertung
         }
 
@@ -1074,73 +1083,20 @@ class PeriodAnalysis:
         if "Datum" not in kaufsignale_df.columns:
             kaufsignale_df = kaufsignale_df.reset_index()
 
-        daten = kaufsignale_df.sort_values("Datum").reset_index(drop=True)["Datum"]
-
-        perioden = []
-        start = daten[0]
-        prev = daten[0]
-
-        for current in daten[1:]:
-            diff = (current - prev).days
-            if diff <= max_gap_days:
-                prev = current
-            else:
-                perioden.append((start, prev))
-                start = current
-                prev = current
-        perioden.append((start, prev))
-
-        return perioden
+        # Abstände über np.diff statt Schleife, siehe cluster_indizes
+        return cluster_perioden(kaufsignale_df["Datum"], max_gap_days)
 
 
     def evaluate_buy_periods(perioden, full_data,
-                            Auswertung_tage, min_veraenderung):
-        bewertungen = []
-
-        for (start_datum, end_datum) in perioden:
-            # jetzt sind start_datum und end_datum schon Datumswerte
-            try:
-                start_kurs = full_data.loc[end_datum, "Close"]
-            except KeyError:
-                bewertungen.append({
-                    "Start_Datum": start_datum,
-                    "End_Datum": end_datum,
-                    "Bewertung": None,
-                    "Kommentar": "Datum nicht in Daten gefunden"
-                })
-                continue
-
-            try:
-                end_index = full_data.index.get_loc(end_datum)
-                lookahead_index = end_index + Auswertung_tage
-                if lookahead_index >= len(full_data):
-                    lookahead_index = len(full_data) - 1
-                max_kurs = full_data.iloc[end_index:lookahead_index+1]["Close"].max()
-            except Exception as e:
-                bewertungen.append({
-                    "Start_Datum": start_datum,
-                    "End_Datum": end_datum,
-                    "Bewertung": None,
-                    "Kommentar": f"Fehler beim Kursvergleich: {e}"
-                })
-                continue
-
-            kurs_diff = (max_kurs - start_kurs) / start_kurs
-            getroffen = kurs_diff >= min_veraenderung
-
-            bewertungen.append({
-                "Start_Datum": start_datum,
-                "End_Datum": end_datum,
-                "Bewertung": getroffen,
-                "Max_Kurs": max_kurs,
-                "Start_Kurs": start_kurs,
-                "Kurs_Diff": kurs_diff,
-                "Kommentar": f"Kursanstieg >= {min_veraenderung*100:.1f}%: {getroffen}"
-            })
-
-        return bewertungen
-
-    def evaluate_buy_signals(full_data, kaufsignale_df, Auswertung_tage, min_veraenderung):
+                            Auswertung_tage, min_veraenderung,
+                            fenster: VorwaertsFenster = None,
+                            positionen=None):
+        # Vorwärts-Max aller Bars einmal berechnen, dann je Periode nur ein Array-Zugriff
+        return bewerte_kaufperioden(perioden, full_data, Auswertung_tage, min_veraenderung, fenster, positionen)
+
+    def evaluate_buy_signals(full_data, kaufsignale_df, Auswertung_tage, min_veraenderung,
+                             fenster: VorwaertsFenster = None,
+                             positionen=None):
         """
         Bewertet einzelne Kaufsignale nach Kursentwicklung.
 
@@ -1155,39 +1111,7 @@ class PeriodAnalysis:
         Rückgabe:
         - Dict mit Trefferquote und Anzahl geprüfter Signale
         """
-
-        treffer = 0
-        anzahl = 0
-
-        for _, signal_row in kaufsignale_df.iterrows():
-            datum = signal_row["Datum"]
-
-            try:
-                start_kurs = full_data.loc[datum, "Close"]
-            except KeyError:
-                continue  # Datum nicht gefunden, überspringen
-
-            try:
-                start_index = full_data.index.get_loc(datum)
-                end_index = start_index + Auswertung_tage
-                if end_index >= len(full_data):
-                    end_index = len(full_data) - 1
-                max_kurs = full_data.iloc[start_index:end_index+1]["Close"].max()
-            except Exception:
-                continue
-
-            kurs_diff = (max_kurs - start_kurs) / start_kurs
-            if kurs_diff >= min_veraenderung:
-                treffer += 1
-            anzahl += 1
-
-        trefferquote = (treffer / anzahl * 100) if anzahl > 0 else None
-
-        return {
-            "Trefferquote_Kauf (%)": trefferquote,
-            "Anzahl_geprüfter_Signale": anzahl,
-            "Treffer": treffer
-        }
+        return bewerte_kaufsignale(full_data, kaufsignale_df, Auswertung_tage, min_veraenderung, fenster, positionen)
     
     def plot_priodenchart(self, data, symbol, version, kaufperioden=None):
         fig = go.Figure()
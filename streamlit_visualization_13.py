@@ -32,6 +32,7 @@ from views import(
 from core_magic_3 import (
     lade_aktien,
     lade_daten_aktie,
+    lade_watchlist_daten,
     lade_analystenbewertung,
     berechne_indikatoren,
     lade_fundamentaldaten,
@@ -42,13 +43,35 @@ from core_magic_3 import (
 
 from signals_2 import (
     analyse_kaufsignal_perioden,
+    analyse_trefferquoten_flaeche,
 )
 
+from screener import (
+    screener_panel,
+    screener_tabelle,
+    ergaenze_klassifikation,
+    klassifiziere_watchlist
+)
+
+from portfolio_backtest import portfolio_backtest
+
+from gewichtungs_optimierer import vergleiche_strategien
+
+from vorlader import WatchlistVorlader
+
 def go_to(page_name):
     st.session_state.page = page_name
 
 def home_page():
     watchlist = lade_aktien()
+
+    # ------------------------------------------------------
+    # Aktienseiten im Hintergrund vorladen (ein Vorlader je Server-Prozess),
+    # vor allem anderen, damit er nicht auf den Screener wartet
+    # ------------------------------------------------------
+    vorlader = watchlist_vorlader()
+    vorlader.starte([w["symbol"] for w in watchlist])
+
     # --------------------------------------------------
     # SIDEBAR – Watchlist verwalten
     # --------------------------------------------------
@@ -75,6 +98,7 @@ def home_page():
                 })
                 save_watchlist_json(watchlist)
                 st.cache_data.clear()  # Cache löschen!
+                vorlader.stoppe()  # alte Watchlist nicht weiter vorladen
                 st.success(f"{new_symbol} hinzugefügt")
                 try:
                     st.experimental_rerun()
@@ -95,23 +119,338 @@ def home_page():
             ]
             save_watchlist_json(watchlist)
             st.cache_data.clear()  # Cache löschen!
+            vorlader.stoppe()  # alte Watchlist nicht weiter vorladen
             st.success(f"{remove_symbol} entfernt")
             try:
                 st.experimental_rerun()
             except AttributeError:
                 st.rerun()
 
+    st.title("📈 Aktien-Dashboard")
+
     # ------------------------------------------------------
     # Aktie Auswahl Button mit Links auflisten
     # ------------------------------------------------------
-    st.title("📈 Aktien-Dashboard")
     st.write("Wähle eine Aktie:")
+    zeige_vorladen(vorlader)
     for i, w in enumerate(watchlist):
         name = w["name"]
         symbol = w["symbol"]
         if st.button(f"{name} ({symbol})", key=f"button_{symbol}_{i}"):
             st.session_state.page = (name, symbol)  # Tuple speichern
 
+    # ------------------------------------------------------
+    # Screener: aktuelles Signal aller Aktien (nach der Aktienliste,
+    # damit diese nicht auf den ersten Aufbau der Tabelle wartet)
+    # ------------------------------------------------------
+    with st.container(border=True):
+        st.subheader("🔎 Screener")
+        zeige_screener(watchlist)
+
+    # ------------------------------------------------------
+    # Portfolio-Backtest der Kaufsignale (nur auf Wunsch)
+    # ------------------------------------------------------
+    with st.container(border=True):
+        st.subheader("💼 Portfolio-Backtest")
+        if st.checkbox("Kaufsignale der Watchlist mit gemeinsamem Konto nachspielen", key="portfolio_backtest"):
+            zeige_portfolio_backtest(watchlist)
+
+# ------------------------------------------------------
+# Screener der Startseite
+# ------------------------------------------------------
+@st.cache_resource(show_spinner=False, ttl=900)
+def lade_screener(aktien: tuple, period="4y") -> tuple:
+    """
+    Indikator-Panel und Screener-Tabelle der ganzen Watchlist, ohne Profil/Trading-Status
+    (gecacht und geteilt, nicht verändern). aktien: Tupel aus (Name, Symbol)
+    Die Klassifizierung hängt von den gerade geladenen Metadaten ab und wird
+    beim Anzeigen aus dem Panel ergänzt, siehe zeige_screener.
+    """
+    aktien = [{"name": name, "symbol": symbol} for name, symbol in aktien]
+    datensaetze = lade_watchlist_daten(period=period, aktien=aktien)
+    panel = screener_panel(datensaetze)
+    return panel["indikatoren"], screener_tabelle(panel, namen={a["symbol"]: a["name"] for a in aktien})
+
+@st.fragment
+def zeige_screener(watchlist):
+    # Filter und Auswahl laufen als Fragment, ohne die ganze Startseite neu aufzubauen
+    if not watchlist:
+        return
+    with st.spinner("Screener wird berechnet..."):
+        indikatoren, tabelle = lade_screener(tuple((w["name"], w["symbol"]) for w in watchlist))
+    if tabelle.empty:
+        st.info("Keine Kursdaten für den Screener verfügbar.")
+        return
+    # Nur bereits geladene Metadaten (kein Request), der Vorlader ergänzt die übrigen
+    tabelle = ergaenze_klassifikation(tabelle, klassifiziere_watchlist(indikatoren))
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        aktionen = st.multiselect("Aktion", sorted(tabelle["Aktion"].unique()), key="screener_aktion")
+    with col2:
+        profile = st.multiselect("Profil", sorted(tabelle["Profil"].dropna().unique()), key="screener_profil")
+    with col3:
+        suche = st.text_input("Suche (Name/Symbol)", key="screener_suche")
+
+    gefiltert = tabelle
+    if aktionen:
+        gefiltert = gefiltert[gefiltert["Aktion"].isin(aktionen)]
+    if profile:
+        gefiltert = gefiltert[gefiltert["Profil"].isin(profile)]
+    if suche:
+        treffer = gefiltert["Name"].str.contains(suche, case=False, regex=False) | gefiltert["Symbol"].str.contains(suche, case=False, regex=False)
+        gefiltert = gefiltert[treffer]
+
+    auswahl = st.dataframe(
+        gefiltert,
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="screener_tabelle",
+        column_config={
+            "Datum": st.column_config.DateColumn("Datum"),
+            "Kurs": st.column_config.NumberColumn("Kurs", format="%.2f"),
+            "Veränderung (%)": st.column_config.NumberColumn("Veränderung (%)", format="%.2f"),
+            "RSI": st.column_config.NumberColumn("RSI", format="%.1f"),
+            "ADX": st.column_config.NumberColumn("ADX", format="%.1f"),
+            "Trefferquote (%)": st.column_config.NumberColumn("Trefferquote (%)", format="%.1f"),
+        }
+    )
+    st.caption("Trefferquote: Kaufsignale der letzten 12 Monate mit mind. 8 % Anstieg innerhalb von 61 Handelstagen. Zeile anklicken öffnet die Aktie.")
+
+    zeilen = auswahl.selection.rows if auswahl is not None else []
+    if zeilen:
+        zeile = gefiltert.iloc[zeilen[0]]
+        st.session_state.page = (zeile["Name"], zeile["Symbol"])
+        st.rerun()
+
+# ------------------------------------------------------
+# Portfolio-Backtest der Startseite
+# ------------------------------------------------------
+@st.cache_data(show_spinner=False, ttl=900)
+def lade_portfolio_backtest(aktien: tuple, period="4y", startkapital=10000.0, risiko_prozent=1.0, stop_modus="beide") -> dict:
+    """
+    Portfolio-Backtest der ganzen Watchlist (gecacht).
+    aktien: Tupel aus (Name, Symbol)
+    """
+    aktien = [{"name": name, "symbol": symbol} for name, symbol in aktien]
+    datensaetze = lade_watchlist_daten(period=period, aktien=aktien)
+    return portfolio_backtest(datensaetze, startkapital=startkapital, risiko_prozent=risiko_prozent, stop_modus=stop_modus)
+
+def zeige_portfolio_backtest(watchlist):
+    if not watchlist:
+        return
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        startkapital = st.number_input("Startkapital (€)", min_value=1000.0, value=10000.0, step=1000.0, key="portfolio_startkapital")
+    with col2:
+        risiko_prozent = st.number_input("Risiko je Trade (%)", min_value=0.1, max_value=10.0, value=1.0, step=0.1, key="portfolio_risiko")
+    with col3:
+        stop_modus = st.selectbox("Stop-Loss", ["beide", "regime", "atr"], key="portfolio_stop",
+                                  help="regime: TradeRiskManager je Market-Regime, atr: 1.5 × ATR, beide: der engere Stop")
+
+    with st.spinner("Portfolio-Backtest läuft..."):
+        ergebnis = lade_portfolio_backtest(
+            tuple((w["name"], w["symbol"]) for w in watchlist), startkapital=startkapital,
+            risiko_prozent=risiko_prozent, stop_modus=stop_modus
+        )
+    verlauf, trades, kennzahlen = ergebnis["equity"], ergebnis["trades"], ergebnis["kennzahlen"]
+    if verlauf.empty:
+        st.info("Keine Kursdaten für den Portfolio-Backtest verfügbar.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Endkapital", f"{kennzahlen['Endkapital']:,.2f} €", f"{kennzahlen['Rendite (%)']:.2f} %")
+    col2.metric("Max. Drawdown", f"{kennzahlen['Max_Drawdown (%)']:.2f} %")
+    col3.metric("Trades", kennzahlen["Trades"])
+    trefferquote = kennzahlen["Trefferquote (%)"]
+    col4.metric("Trefferquote", "–" if trefferquote is None else f"{trefferquote:.2f} %")
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=verlauf.index, y=verlauf["Equity"], name="Equity"))
+    fig.add_trace(go.Scatter(x=verlauf.index, y=verlauf["Drawdown (%)"], name="Drawdown (%)", yaxis="y2", fill="tozeroy", opacity=0.3))
+    fig.update_layout(
+        height=400,
+        yaxis=dict(title="Equity (€)"),
+        yaxis2=dict(title="Drawdown (%)", overlaying="y", side="right"),
+        legend=dict(orientation="h")
+    )
+    st.plotly_chart(fig, use_container_width=True, key="Portfolio_Equity")
+
+    st.dataframe(
+        trades,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Einstieg_Datum": st.column_config.DateColumn("Einstieg"),
+            "Ausstieg_Datum": st.column_config.DateColumn("Ausstieg"),
+            "Einstiegskurs": st.column_config.NumberColumn("Einstiegskurs", format="%.2f"),
+            "Ausstiegskurs": st.column_config.NumberColumn("Ausstiegskurs", format="%.2f"),
+            "Stop_Loss": st.column_config.NumberColumn("Stop-Loss", format="%.2f"),
+            "Take_Profit": st.column_config.NumberColumn("Take-Profit", format="%.2f"),
+            "PnL": st.column_config.NumberColumn("PnL (€)", format="%.2f"),
+            "PnL (%)": st.column_config.NumberColumn("PnL (%)", format="%.2f"),
+        }
+    )
+    st.caption("Einstieg zum Schlusskurs des BUY-Signals, Positionsgröße über PositionSizer, Ausstieg an Stop-Loss oder Take-Profit.")
+
+# ------------------------------------------------------
+# Analysen der Aktienseite: erst bei Bedarf berechnen,
+# Ergebnis für die Session merken
+# ------------------------------------------------------
+def sitzungs_memo(name: str, schluessel) -> dict:
+    """
+    Liefert ein Dict in st.session_state, das nur so lange gilt, wie sich
+    `schluessel` nicht ändert (z.B. Symbol, Datenstand, Sidebar-Parameter).
+    """
+    memo = st.session_state.setdefault(name, {"schluessel": None, "werte": {}})
+    if memo["schluessel"] != schluessel:
+        memo["schluessel"] = schluessel
+        memo["werte"] = {}
+    return memo["werte"]
+
+class AktienseitenAnalysen:
+    """
+    Alle Analysen der Aktienseite als Methoden. Jede Analyse wird erst beim
+    ersten Zugriff berechnet (also nur, wenn ein Tab sie anzeigt) und dann
+    für die Session gemerkt. Abhängigkeiten werden über dieselben Methoden geholt.
+    """
+
+    def __init__(self, symbol, data_full, data, auswertung_tage, min_veraenderung, schluessel=None):
+        self.symbol = symbol
+        self.data_full = data_full
+        self.data = data
+        self.auswertung_tage = auswertung_tage
+        self.min_veraenderung = min_veraenderung
+        # ohne Schlüssel (z.B. beim Vorladen) nur für diese Instanz merken
+        self._werte = sitzungs_memo("aktienseite_analysen", schluessel) if schluessel is not None else {}
+
+        self.fundamental_alanalyzer = FundamentalAnalysis()
+        self.Analysten = Analystenbewertung()
+        self.rsi_analysis = RSIAnalysis()
+        self.macd_analysis = MACDAnalysis()
+        self.adx_analysis = ADXAnalysis()
+        self.bollinger_analysis = BollingerAnalysis()
+        self.stochastic_analysis = StochasticAnalysis()
+        self.market_analysis = MarketRegimeAnalysis()
+        self.entryquality_analysis = EntryQualityAnalysis()
+        self.trade_decision = TradeDecisionEngine()
+        self.swingsignal_analysis = SwingSignalService()
+
+    def _einmal(self, name, berechne):
+        if name not in self._werte:
+            self._werte[name] = berechne()
+        return self._werte[name]
+
+    # --- Fundamental- und Analystendaten ---
+    def fundamentaldaten(self):
+        return self._einmal("fundamentaldaten", lambda: lade_fundamentaldaten(self.symbol))
+
+    def data_fund(self):
+        return self._einmal("data_fund", lambda: self.fundamental_alanalyzer.fundamental_analyse(self.fundamentaldaten(), self.symbol))
+
+    def analysten_daten(self):
+        return self._einmal("analysten_daten", lambda: lade_analystenbewertung(self.symbol))
+
+    def rating_counts(self):
+        return self._einmal("rating_counts", lambda: self.Analysten.berechne_rating_bar(self.analysten_daten()["summary"]))
+
+    # --- Klassifizierung ---
+    def klassifikation(self):
+        return self._einmal("klassifikation", lambda: klassifiziere_aktie(self.symbol, self.data_full, self.fundamentaldaten()))
+
+    def erklaerung(self):
+        return self._einmal("erklaerung", lambda: erklaere_kategorien(self.klassifikation()["Profil"], self.klassifikation()["Trading_Status"]))
+
+    # --- Indikatorenauswertung ---
+    def rsi_result(self):
+        return self._einmal("rsi_result", lambda: self.rsi_analysis.analyse(self.data))
+
+    def rsi_history(self):
+        return self._einmal("rsi_history", lambda: self.rsi_analysis.analyze_history(self.data))
+
+    def macd_result(self):
+        return self._einmal("macd_result", lambda: self.macd_analysis.analyse(self.data))
+
+    def adx_result(self):
+        return self._einmal("adx_result", lambda: self.adx_analysis.analyse(self.data))
+
+    def bollinger_result(self):
+        return self._einmal("bollinger_result", lambda: self.bollinger_analysis.analyze(self.data))
+
+    def stochastic_result(self):
+        return self._einmal("stochastic_result", lambda: self.stochastic_analysis.analyze(self.data))
+
+    def market_result(self):
+        return self._einmal("market_result", lambda: self.market_analysis.analyse(self.rsi_result(), self.macd_result(), self.adx_result()))
+
+    def entryquality_result(self):
+        return self._einmal("entryquality_result", lambda: self.entryquality_analysis.analyse(self.bollinger_result(), self.stochastic_result(), self.market_result()))
+
+    def tradedecision_result(self):
+        return self._einmal("tradedecision_result", lambda: self.trade_decision.decide(self.market_result(), self.rsi_result(), self.macd_result(), self.adx_result()))
+
+    def trefferquoten_flaeche(self):
+        # unabhängig von den Slidern → wird bei Slider-Änderungen nicht neu berechnet
+        return self._einmal("trefferquoten_flaeche", lambda: analyse_trefferquoten_flaeche(self.data))
+
+    def swingsignal_analysed(self):
+        return self._einmal(
+            ("swingsignal_analysed", self.auswertung_tage, self.min_veraenderung),
+            lambda: self.swingsignal_analysis.run_analysis(
+                self.data, self.auswertung_tage, self.min_veraenderung,
+                self.market_result(), self.rsi_result(), self.macd_result(), self.adx_result()
+            )
+        )
+
+    def strategie_vergleich(self):
+        return self._einmal(
+            ("strategie_vergleich", self.auswertung_tage, self.min_veraenderung),
+            lambda: vergleiche_strategien(self.data, self.auswertung_tage, self.min_veraenderung)
+        )
+
+class AlgorithmusKontext:
+    """
+    Backtests des Algorithmus-Tabs für einen Render-Durchlauf.
+    Jede (Strategie, Parameter)-Kombination wird genau einmal ausgewertet;
+    Tabellen, Kennzahlen und Periodencharts bekommen dasselbe Ergebnis.
+    """
+
+    def __init__(self, data, auswertung_tage, min_veraenderung, kategorie, trading_status):
+        self.data = data
+        self.auswertung_tage = auswertung_tage
+        self.min_veraenderung = min_veraenderung
+        self.kategorie = kategorie
+        self.trading_status = trading_status
+        self._ergebnisse = {}
+
+    def _einmal(self, name, berechne):
+        if name not in self._ergebnisse:
+            self._ergebnisse[name] = berechne()
+        return self._ergebnisse[name]
+
+    def kaufsignal_perioden(self):
+        return self._einmal("kaufsignal_perioden", lambda: analyse_kaufsignal_perioden(
+            self.data, self.auswertung_tage, self.min_veraenderung
+        ))
+
+    def swingtrading_perioden(self):
+        return self._einmal("swingtrading_perioden", lambda: PeriodAnalysis.analyse_kaufsignal_perioden(
+            self.data, self.auswertung_tage, self.min_veraenderung, self.kategorie, self.trading_status
+        ))
+
+    def swingtrading_perioden_2(self):
+        return self._einmal("swingtrading_perioden_2", lambda: PeriodAnalysis.analyse_kaufsignal_perioden_2(
+            self.data, self.auswertung_tage, self.min_veraenderung, self.kategorie, self.trading_status
+        ))
+
+# Kurshistorie der Aktienseite (Basis aller Indikatoren und Signale)
+AKTIENSEITE_PERIODE = "4y"
+
+# Tabs der Aktienseite (es wird nur der ausgewählte Tab berechnet und gezeichnet)
+AKTIENSEITE_TABS = ["📈 Übersicht", "📊 Charts", "🔔Handelsentscheidung", "🌥️ Ichimoku", "🏦 Fundamentaldaten", "RSI", "Algorithmus"]
+
 def aktienseite(): 
     name, symbol = st.session_state.page
     # ---------------------------------------------------------
@@ -123,81 +462,46 @@ def aktienseite():
     # Laden aller Daten der letzten 4 jahre für weitere 
     # grundlegende Berechnungen und Anzeigen
     # ---------------------------------------------------------
-    max_period = "4y"
     try:
-        data_full = lade_daten_aktie(symbol, period=max_period)
-        data_full = berechne_indikatoren(data_full)
+        data_full = lade_daten_aktie(symbol, period=AKTIENSEITE_PERIODE)
+        data_full = berechne_indikatoren(
+            data_full,
+            symbol=symbol,
+            parameter={"macd_kurz": short_window, "macd_lang": long_window, "macd_signal": signal_window}
+        )
     except Exception as e:
         st.error(f"Fehler beim Laden der Daten: {e}")
         return
     
-    # Startdatum berechnen (heute minus tage)
-    startdatum = pd.Timestamp.today(tz=data_full.index.tz) - pd.Timedelta(days=tage)
-    # Daten filtern, nur Daten ab Startdatum behalten
-    data = data_full.loc[data_full.index >= startdatum]
+    # Nur Daten der letzten `tage` Tage behalten
+    data = zeitraum_daten(data_full, tage)
     
     # ---------------------------------------------------------
     # Aufrunf der Klassenfunktionen
     # ---------------------------------------------------------
     technicalmetrics = TechnicalMetrics()
-    fundamental_alanalyzer = FundamentalAnalysis()
     main_analyzer = MainDataAnalyzer(data)
     Ichimoku_analyzer = IchimokuAnalyer()
     Swingtrading = SwingTrading()
-    Analysten = Analystenbewertung()
     period_analyzer = PeriodAnalysis()
     st.set_page_config(
     page_title="Aktien Dashboard",
     layout="wide"  # 💥 macht Seite 100% breit
     )
-    # ---------------------------------------------------------
-    rsi_analysis = RSIAnalysis()
-    macd_analysis = MACDAnalysis()
-    adx_analysis = ADXAnalysis()
-    bollinger_analysis = BollingerAnalysis()
-    stochastic_analysis = StochasticAnalysis()
-    market_analysis = MarketRegimeAnalysis()
-    entryquality_analysis = EntryQualityAnalysis()
-    trade_decision = TradeDecisionEngine()
-    swingsignal_analysis = SwingSignalService()
     indikatoren_boards = indikatoren_databoards()
     indikatoren_diagram = indikatoren_plot()
 
     # ---------------------------------------------------------
-    # Laden und Analysieren der Fundamentaldaten
-    # ---------------------------------------------------------  
-    fundamentaldaten = lade_fundamentaldaten(symbol)
-    data_fund = fundamental_alanalyzer.fundamental_analyse(fundamentaldaten, symbol)
-
-    # ---------------------------------------------------------
-    # Import der Analysten Daten
-    # ---------------------------------------------------------  
-    analysten_daten = lade_analystenbewertung(symbol)
-    summary_df = analysten_daten["summary"]
-    rating_counts = Analysten.berechne_rating_bar(summary_df)
-
-    # ---------------------------------------------------------
-    # Klassifizierung der Aktie
-    # ---------------------------------------------------------  
-    klassifikation = klassifiziere_aktie(symbol, data_full, fundamentaldaten)
-    erklaerung = erklaere_kategorien(klassifikation["Profil"], klassifikation["Trading_Status"])
-
+    # Fundamentaldaten, Analysten, Klassifizierung und Indikatorenauswertung
+    # werden erst im jeweiligen Tab berechnet (und für die Session gemerkt)
     # ---------------------------------------------------------
-    # Indikatorenauswertung
-    # --------------------------------------------------------- 
-    rsi_result = rsi_analysis.analyse(data)
-    rsi_latest = {"value": rsi_result["value"], "label": rsi_result["state"]}
-    rsi_history = rsi_analysis.analyze_history(data)
-    rsi_interp = rsi_result["interpretation"]
-    macd_result = macd_analysis.analyse(data)
-    macd_interp = macd_result["interpretation"]
-    adx_result = adx_analysis.analyse(data)
-    bollinger_result = bollinger_analysis.analyze(data)
-    stochastic_result = stochastic_analysis.analyze(data)
-    market_result = market_analysis.analyse(rsi_result, macd_result, adx_result)
-    entryquality_result = entryquality_analysis.analyse(bollinger_result, stochastic_result, market_result)
-    tradedecision_result = trade_decision.decide(market_result, rsi_result, macd_result, adx_result)
-    swingsignal_analysed = swingsignal_analysis.run_analysis(data, Auswertung_tage, min_veraenderung, market_result, rsi_result, macd_result, adx_result)
+    daten_stand = (data_full.index[-1], float(data_full["Close"].iloc[-1]), len(data_full))
+    analysen = AktienseitenAnalysen(
+        symbol, data_full, data, Auswertung_tage, min_veraenderung,
+        schluessel=(symbol, daten_stand, tage, short_window, long_window, signal_window)
+    )
+    fundamental_alanalyzer = analysen.fundamental_alanalyzer
+    Analysten = analysen.Analysten
    
     # ---------------------------------------------------------
     # Überschrift der Aktienseite
@@ -213,15 +517,31 @@ def aktienseite():
             go_to("home")
 
     # ---------------------------------------------------------
-    # Definition der TABS
+    # Definition der TABS (Auswahl statt st.tabs, damit nur der
+    # sichtbare Tab seine Analysen berechnet)
     # ---------------------------------------------------------
-    tab_overview, tab_charts, tab_handel, tab_ichimoku, tab_fundamentals, tab_rsi, Algorithmus = st.tabs(
-        ["📈 Übersicht", "📊 Charts", "🔔Handelsentscheidung", "🌥️ Ichimoku", "🏦 Fundamentaldaten", "RSI", "Algorithmus"]
+    ansicht = st.radio(
+        "Ansicht",
+        AKTIENSEITE_TABS,
+        horizontal=True,
+        key="aktienseite_tab",
+        label_visibility="collapsed"
     )
     # ---------------------------------------------------------
     # TAB Overview
     # ---------------------------------------------------------
-    with tab_overview:
+    if ansicht == "📈 Übersicht":
+        klassifikation = analysen.klassifikation()
+        erklaerung = analysen.erklaerung()
+        summary_df = analysen.analysten_daten()["summary"]
+        data_fund = analysen.data_fund()
+        tradedecision_result = analysen.tradedecision_result()
+        swingsignal_analysed = analysen.swingsignal_analysed()
+        rsi_interp = analysen.rsi_result()["interpretation"]
+        macd_interp = analysen.macd_result()["interpretation"]
+        stochastic_result = analysen.stochastic_result()
+        adx_result = analysen.adx_result()
+
         with st.container(border=True):
             main_analyzer.plot_hautpchart(name, 1)
         # --- 2 Spalten Layout ---
@@ -241,7 +561,7 @@ def aktienseite():
             with st.container(border=True):
                 st.subheader("Experteneinschätzung:")
                 if summary_df is not None:
-                    Analysten.zeichne_rating_gauge(rating_counts)
+                    Analysten.zeichne_rating_gauge(analysen.rating_counts())
 
         # --- 2 Spalten Layout ---
         col1, col2, col3 = st.columns([1,1,1])
@@ -278,7 +598,17 @@ def aktienseite():
     # ---------------------------------------------------------
     # TAB CHARTS
     # ---------------------------------------------------------
-    with tab_charts:
+    elif ansicht == "📊 Charts":
+        bollinger_result = analysen.bollinger_result()
+        rsi_result = analysen.rsi_result()
+        rsi_latest = {"value": rsi_result["value"], "label": rsi_result["state"]}
+        rsi_history = analysen.rsi_history()
+        rsi_interp = rsi_result["interpretation"]
+        macd_result = analysen.macd_result()
+        macd_interp = macd_result["interpretation"]
+        stochastic_result = analysen.stochastic_result()
+        adx_result = analysen.adx_result()
+
         col1, col2 = st.columns([1,1])
         with col1:
             with st.container(border=True):
@@ -399,7 +729,12 @@ def aktienseite():
                 st.info(f"Handlungsfazit: {adx_result['action_hint']}")
                 st.progress(adx_result["strength"])
 
-    with tab_handel:
+    elif ansicht == "🔔Handelsentscheidung":
+        tradedecision_result = analysen.tradedecision_result()
+        swingsignal_analysed = analysen.swingsignal_analysed()
+        market_result = analysen.market_result()
+        entryquality_result = analysen.entryquality_result()
+
         # ---------------------------------------------------------
         # 2️⃣ RECHTE SPALTE
         # ---------------------------------------------------------
@@ -468,14 +803,17 @@ def aktienseite():
 
         
 
-    with tab_ichimoku:
+    elif ansicht == "🌥️ Ichimoku":
         # ---------------------------------------------------------
         # Hauptchart
         # ---------------------------------------------------------
         Ichimoku_analyzer.plot_Ichimoku(data, name)
 
 
-    with tab_fundamentals:
+    elif ansicht == "🏦 Fundamentaldaten":
+        data_fund = analysen.data_fund()
+        fundamentaldaten = analysen.fundamentaldaten()
+
         with st.container(border=True):
             st.subheader("🏦 Übersicht des Fundamentalsignals")
             fundamental_alanalyzer.fundamental_interpretation(data_fund)
@@ -495,20 +833,24 @@ def aktienseite():
             # Fundamentaldaten
             technicalmetrics.zeige_fundamentaldaten(fundamentaldaten)
 
-    with tab_rsi:  
+    elif ansicht == "RSI":  
         st.write("Leere Dummy Seite")
                 
-    with Algorithmus:
+    elif ansicht == "Algorithmus":
+        klassifikation = analysen.klassifikation()
+        # Jeder Backtest läuft pro Render nur einmal, Anzeige und Charts teilen sich das Ergebnis
+        algorithmus = AlgorithmusKontext(data, Auswertung_tage, min_veraenderung, klassifikation["Profil"], klassifikation["Trading_Status"])
+
         with st.container(border=True):
             st.subheader("Analyse der Signale")
-            zeige_kaufsignal_analyse(data, Auswertung_tage, min_veraenderung) 
+            zeige_kaufsignal_analyse(data, Auswertung_tage, min_veraenderung, analyse_ergebnis=algorithmus.kaufsignal_perioden()) 
             st.subheader("🔄 Swingtrading Übersicht:")
-            Swingtrading.zeige_swingtrading_signalauswertung(data, Auswertung_tage, min_veraenderung, klassifikation["Profil"], klassifikation["Trading_Status"])
+            Swingtrading.zeige_swingtrading_signalauswertung(data, Auswertung_tage, min_veraenderung, klassifikation["Profil"], klassifikation["Trading_Status"], analyse_ergebnis=algorithmus.swingtrading_perioden())
             st.subheader("🔄 Swingtrading Übersicht:")
-            Swingtrading.zeige_swingtrading_signalauswertung_2(data, Auswertung_tage, min_veraenderung, klassifikation["Profil"], klassifikation["Trading_Status"])
+            Swingtrading.zeige_swingtrading_signalauswertung_2(data, Auswertung_tage, min_veraenderung, klassifikation["Profil"], klassifikation["Trading_Status"], analyse_ergebnis=algorithmus.swingtrading_perioden_2())
 
         with st.container(border=True):
-            analyse_ergebnis = analyse_kaufsignal_perioden(data, Auswertung_tage, min_veraenderung)
+            analyse_ergebnis = algorithmus.kaufsignal_perioden()
             # macht es nicht Sinn, die folgende Formatierung in die Funktion mit aufzunehmen?
             df_details = pd.DataFrame(analyse_ergebnis["Perioden_Bewertung"])
             df_details.columns = ["Start", "Ende", "Signal", "Wert1", "Wert2", "Beschreibung", "ExtraInfo"]
@@ -519,7 +861,7 @@ def aktienseite():
             plot_priodenchart(data, name, 2, kaufperioden=df_details)
         
         with st.container(border=True):
-            analyse_ergebnis = period_analyzer.analyse_kaufsignal_perioden(data, Auswertung_tage, min_veraenderung, klassifikation["Profil"], klassifikation["Trading_Status"])
+            analyse_ergebnis = algorithmus.swingtrading_perioden()
             # macht es nicht Sinn, die folgende Formatierung in die Funktion mit aufzunehmen?
             df_details = pd.DataFrame(analyse_ergebnis["Perioden_Bewertung"])
             df_details.columns = ["Start", "Ende", "Signal", "Wert1", "Wert2", "Beschreibung", "ExtraInfo"]
@@ -529,25 +871,131 @@ def aktienseite():
             st.subheader("Kennzeichnung der Original-Perioden")
             period_analyzer.plot_priodenchart(data, name, 3, kaufperioden=df_details)
 
+        with st.container(border=True):
+            st.subheader("Trefferquote je Mindestkursanstieg und Auswertung-Tage")
+            if st.checkbox("Trefferquoten über alle Schwellen berechnen", key="trefferquoten_flaeche"):
+                flaeche = analysen.trefferquoten_flaeche()
+                st.write(f"Kaufsignale: {flaeche['Anzahl_Kaufsignale']}, Perioden: {flaeche['Anzahl_Perioden']}")
+                col1, col2 = st.columns(2)
+                with col1:
+                    plot_trefferquoten_heatmap(flaeche["Signale"], "Einzelsignale", Auswertung_tage, min_veraenderung)
+                with col2:
+                    plot_trefferquoten_heatmap(flaeche["Perioden"], "Abgeschlossene Perioden", Auswertung_tage, min_veraenderung)
+
+        with st.container(border=True):
+            st.subheader("Vergleich aller Kategorie-Strategien")
+            if st.checkbox("Alle Kategorien × Trading-Status auswerten", key="strategie_vergleich"):
+                vergleich = analysen.strategie_vergleich().copy()
+                aktuell = (vergleich["Kategorie"] == klassifikation["Profil"]) & (vergleich["Trading_Status"] == klassifikation["Trading_Status"])
+                vergleich.insert(0, "Aktuell", aktuell.map({True: "⭐", False: ""}))
+                vergleich = vergleich.sort_values("Trefferquote_Perioden (%)", ascending=False, na_position="last")
+                st.dataframe(vergleich, hide_index=True, use_container_width=True)
+
         
+def zeitraum_daten(data_full, tage):
+    """
+    Daten ab heute minus `tage` Tage (Zeitraum aus der Sidebar).
+    """
+    startdatum = pd.Timestamp.today(tz=data_full.index.tz) - pd.Timedelta(days=tage)
+    return data_full.loc[data_full.index >= startdatum]
+
+# ------------------------------------------------------
+# Aktienseiten der Watchlist im Hintergrund vorladen
+# ------------------------------------------------------
+def waerme_aktienseite(symbol):
+    """
+    Berechnet für ein Symbol, was die Aktienseite mit den Standardwerten der
+    Sidebar beim Öffnen braucht: Kurse, Indikatoren, Metadaten/Klassifizierung
+    und die Signalverläufe von Übersicht und Algorithmus-Tab (ohne
+    swingtrading_perioden_2). Die Ergebnisse liegen danach in den
+    prozessweiten Caches, die Seite liest sie dort.
+    """
+    standard = SIDEBAR_STANDARD
+    data_full = lade_daten_aktie(symbol, period=AKTIENSEITE_PERIODE)
+    data_full = berechne_indikatoren(
+        data_full,
+        symbol=symbol,
+        parameter={
+            "macd_kurz": standard["short_window"],
+            "macd_lang": standard["long_window"],
+            "macd_signal": standard["signal_window"]
+        }
+    )
+    data = zeitraum_daten(data_full, standard["tage"])
+
+    analysen = AktienseitenAnalysen(symbol, data_full, data, standard["auswertung_tage"], standard["min_veraenderung"])
+    klassifikation = analysen.klassifikation()
+    analysen.analysten_daten()
+    analysen.swingsignal_analysed()
+
+    algorithmus = AlgorithmusKontext(
+        data, standard["auswertung_tage"], standard["min_veraenderung"],
+        klassifikation["Profil"], klassifikation["Trading_Status"]
+    )
+    algorithmus.kaufsignal_perioden()
+    algorithmus.swingtrading_perioden()
+    # swingtrading_perioden_2 nicht vorladen: Schleife über alle Fenster (kombiniertes_signal_3),
+    # die nur Rechenzeit der laufenden Sitzungen kostet; der Algorithmus-Tab rechnet sie selbst
+
+@st.cache_resource(show_spinner=False)
+def watchlist_vorlader() -> WatchlistVorlader:
+    """
+    Ein Vorlader je Server-Prozess, alle Sessions teilen sich Fortschritt und Caches.
+    """
+    return WatchlistVorlader(waerme_aktienseite)
+
+def zeige_vorladen(vorlader):
+    stand = vorlader.stand()
+    if stand["laeuft"]:
+        zeige_vorlade_fortschritt(vorlader)
+    elif stand["gesamt"]:
+        text = f"✅ {stand['fertig']} von {stand['gesamt']} Aktienseiten vorgeladen"
+        if stand["fehler"]:
+            text += f" (Fehler: {', '.join(stand['fehler'])})"
+        st.caption(text)
+
+@st.fragment(run_every=2)
+def zeige_vorlade_fortschritt(vorlader):
+    # aktualisiert sich selbst, bis der Durchlauf fertig ist
+    stand = vorlader.stand()
+    if not stand["laeuft"]:
+        st.rerun()
+    text = f"Aktienseiten werden vorgeladen: {stand['fertig']} von {stand['gesamt']}"
+    if stand["in_arbeit"]:
+        text += f" ({', '.join(stand['in_arbeit'])})"
+    st.progress(stand["fertig"] / max(stand["gesamt"], 1), text=text)
 
 # ------------------------------
 # Sidebar: Parameter laden
 # ------------------------------
+# Standardwerte der Sidebar (auch für das Vorladen der Aktienseiten)
+SIDEBAR_STANDARD = {
+    "tage": 180,
+    "min_veraenderung": 0.08,
+    "auswertung_tage": 61,
+    "short_window": 12,
+    "long_window": 26,
+    "signal_window": 9
+}
+
 def lade_sidebar_parameter():
-    zeitraum = st.sidebar.selectbox("Zeitraum wählen", ["6 Monate", "1 Jahr", "3 Jahre"])
     period_map = {
         "6 Monate": 180,
         "1 Jahr": 365,
         "3 Jahre": 1095
     }
+    zeitraum = st.sidebar.selectbox(
+        "Zeitraum wählen",
+        list(period_map),
+        index=list(period_map.values()).index(SIDEBAR_STANDARD["tage"])
+    )
     tage = period_map[zeitraum]
 
     min_veraenderung = st.sidebar.slider(
         "📈 Mindestkursanstieg (%)",
         min_value=0.0,
         max_value=0.3,
-        value=0.08,
+        value=SIDEBAR_STANDARD["min_veraenderung"],
         step=0.01
     )
 
@@ -555,7 +1003,7 @@ def lade_sidebar_parameter():
         "📅 Auswertung-Tage für Performance-Auswertung",
         min_value=10,
         max_value=200,
-        value=61,
+        value=SIDEBAR_STANDARD["auswertung_tage"],
         step=1
     )
 
@@ -568,33 +1016,35 @@ def lade_sidebar_parameter():
         "Short EMA Periode",
         min_value=5,
         max_value=50,
-        value=12
+        value=SIDEBAR_STANDARD["short_window"]
     )
 
     long_window = st.sidebar.number_input(
         "Long EMA Periode",
         min_value=10,
         max_value=100,
-        value=26
+        value=SIDEBAR_STANDARD["long_window"]
     )
 
     signal_window = st.sidebar.number_input(
         "Signal EMA Periode",
         min_value=5,
         max_value=30,
-        value=9
+        value=SIDEBAR_STANDARD["signal_window"]
     )
 
     return tage, min_veraenderung, auswertung_tage, short_window, long_window, signal_window
 
-def zeige_kaufsignal_analyse(data, Auswertung_tage, min_veraenderung):
+def zeige_kaufsignal_analyse(data, Auswertung_tage, min_veraenderung, analyse_ergebnis=None):
     """
     Führt die Analyse der Kaufsignal-Perioden durch
     und zeigt die wichtigsten Kennzahlen und Details in Streamlit an.
+    Ein bereits berechnetes analyse_ergebnis wird direkt angezeigt.
     """
 
     # Analyse aus Kernfunktion laden
-    analyse_ergebnis = analyse_kaufsignal_perioden(data, Auswertung_tage, min_veraenderung)
+    if analyse_ergebnis is None:
+        analyse_ergebnis = analyse_kaufsignal_perioden(data, Auswertung_tage, min_veraenderung)
 
     st.write(f"Anzahl Kaufsignale (gesamt): {analyse_ergebnis.get('Anzahl_Kaufsignale', 0)}")
 
@@ -700,6 +1150,29 @@ def plot_priodenchart(data, symbol, version, kaufperioden=None):
         ))
     st.plotly_chart(fig, use_container_width=True, key=f"Periodenchart_{version}")
 
+def plot_trefferquoten_heatmap(flaeche, titel, auswertung_tage=None, min_veraenderung=None):
+    """
+    Heatmap Trefferquote (%) über Auswertung_tage (y) und min_veraenderung (x).
+    Die aktuelle Slider-Einstellung wird markiert.
+    """
+    fig = go.Figure(go.Heatmap(
+        z=flaeche.to_numpy(),
+        x=flaeche.columns * 100,
+        y=flaeche.index,
+        colorscale="RdYlGn",
+        zmin=0,
+        zmax=100,
+        colorbar=dict(title="Treffer %"),
+        hovertemplate="Anstieg ≥ %{x:.0f}%<br>Tage: %{y}<br>Trefferquote: %{z:.1f}%<extra></extra>"
+    ))
+    if auswertung_tage is not None and min_veraenderung is not None:
+        fig.add_trace(go.Scatter(
+            x=[min_veraenderung * 100], y=[auswertung_tage], mode="markers",
+            marker=dict(symbol="x", size=12, color="black"), name="Aktuelle Einstellung", showlegend=False
+        ))
+    fig.update_layout(title=titel, xaxis_title="Mindestkursanstieg (%)", yaxis_title="Auswertung-Tage")
+    st.plotly_chart(fig, use_container_width=True, key=f"Trefferquoten_{titel}")
+
 def zeige_swingtrading_signalauswertung(data, service_result):
 
     trefferquote = service_result.get("trefferquote")
@@ -719,7 +1192,7 @@ def zeige_swingtrading_signalauswertung(data, service_result):
             st.dataframe(service_result["perioden_bewertung"])
 
     with st.expander("📊 Alle Signale"):
-        st.dataframe(service_result["signals"])
+        st.dataframe(service_result["signals"].als_frame())
 
 
 # ---------------------------------------------------------
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+# Module liegen flach im Projektverzeichnis
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def synthetische_kurse(n=1000, seed=0, start="2021-01-04", tz="America/New_York") -> pd.DataFrame:
+    """
+    OHLCV-Daten im Format von yfinance (Random Walk, reproduzierbar über `seed`).
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=n, tz=tz, name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.005, n)),
+            "High": close * (1 + np.abs(rng.normal(0, 0.01, n))),
+            "Low": close * (1 - np.abs(rng.normal(0, 0.01, n))),
+            "Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, n),
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def kurse():
+    return synthetische_kurse
+
+
+def indikator_daten(n=400, seed=0, adx_warmup=True, **kwargs) -> pd.DataFrame:
+    """
+    Synthetische Kurse mit allen Indikatoren. Mit `adx_warmup` sind ADX/+DI/-DI
+    in den ersten 2*14-1 Bars NaN (wie vor dem Start der Wilder-Glättung),
+    damit auch die Warm-up-Bars in den Vergleichen vorkommen.
+    """
+    from indikator_kernel import berechne_indikatoren_numpy
+
+    data = berechne_indikatoren_numpy(synthetische_kurse(n, seed=seed, **kwargs))
+    if adx_warmup:
+        data.iloc[:27, [data.columns.get_loc(s) for s in ("ADX", "+DI", "-DI")]] = np.nan
+    return data
+
+
+@pytest.fixture
+def indikatoren():
+    return indikator_daten
@@ -0,0 +1,88 @@
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 12), reason="streamlit_visualization_13 nutzt verschachtelte f-Strings")
+
+
+def aktienseite_skript():
+    # Läuft als eigenes Skript in AppTest: Kurse und Metadaten ohne Netzwerk
+    import pandas as pd
+    import streamlit as st
+
+    import core_magic_3
+    from conftest import synthetische_kurse
+    from streamlit_visualization_13 import aktienseite
+
+    def lade(symbol, period="4y"):
+        # bis heute, die Sidebar schneidet relativ zum aktuellen Datum zu
+        return synthetische_kurse(1000, seed=3, start=pd.Timestamp.today().normalize() - pd.offsets.BDay(999))
+
+    def metadaten(symbol):
+        return {
+            "info": {"sector": "Technology", "industry": "Software", "trailingPE": 20, "forwardPE": 18, "marketCap": 5e10},
+            "market_cap": 5e10,
+            "summary": pd.DataFrame({"period": ["0m"], "strongBuy": [5], "buy": [10], "hold": [3], "sell": [1], "strongSell": [0]}),
+            "recommendations": None,
+            "analysis": None,
+        }
+
+    core_magic_3.KURSDATEN_SPEICHER.lade = lade
+    core_magic_3.TICKER_METADATEN.provider = metadaten
+    st.session_state.setdefault("page", ("ServiceNow", "NOW"))
+    aktienseite()
+
+
+@pytest.fixture
+def seite():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_function(aktienseite_skript, default_timeout=120)
+    at.session_state["aktienseite_tab"] = "RSI"
+    at.run()
+    assert not at.exception, [e.message for e in at.exception]
+    return at
+
+
+def analysen(at) -> dict:
+    return at.session_state["aktienseite_analysen"]["werte"]
+
+
+def test_nur_der_gewaehlte_tab_wird_berechnet(seite):
+    assert seite.radio(key="aktienseite_tab").value == "RSI"
+    # Der Dummy-Tab braucht keine Analyse
+    assert analysen(seite) == {}
+
+    seite.radio(key="aktienseite_tab").set_value("🔔Handelsentscheidung").run()
+
+    assert not seite.exception, [e.message for e in seite.exception]
+    berechnet = set(analysen(seite))
+    assert {"rsi_result", "macd_result", "adx_result", "market_result", "tradedecision_result"} <= berechnet
+    assert not {"fundamentaldaten", "klassifikation", "trefferquoten_flaeche"} & berechnet
+
+
+def test_analysen_bleiben_fuer_die_session_gemerkt(seite):
+    seite.radio(key="aktienseite_tab").set_value("🔔Handelsentscheidung").run()
+    vorher = dict(analysen(seite))
+
+    # Zurück zu einem anderen Tab und wieder hin: nichts wird neu berechnet
+    seite.radio(key="aktienseite_tab").set_value("RSI").run()
+    seite.radio(key="aktienseite_tab").set_value("🔔Handelsentscheidung").run()
+    assert all(analysen(seite)[name] is wert for name, wert in vorher.items())
+
+    # Auswertung-Tage betreffen nur die Signalauswertung
+    seite.sidebar.slider[1].set_value(30).run()
+    nachher = analysen(seite)
+    assert nachher["rsi_result"] is vorher["rsi_result"]
+    neu = set(nachher) - set(vorher)
+    assert neu and all(name[0] == "swingsignal_analysed" and name[1] == 30 for name in neu)
+
+
+def test_neue_macd_parameter_verwerfen_das_memo(seite):
+    seite.radio(key="aktienseite_tab").set_value("🔔Handelsentscheidung").run()
+    vorher = analysen(seite)["macd_result"]
+
+    seite.sidebar.number_input[0].set_value(8).run()
+
+    assert not seite.exception, [e.message for e in seite.exception]
+    assert analysen(seite)["macd_result"] is not vorher
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import signal_auswertung
+from gewichtungs_optimierer import (
+    ANZAHL_MUSTER,
+    MUSTER,
+    SIGNAL_NAMEN,
+    bewerte_kandidaten,
+    effektive_gewichte,
+    empfohlene_gewichtung,
+    gewichts_kandidaten,
+    muster_zaehlungen,
+    optimiere_walk_forward,
+    signal_matrix,
+    signal_tensor,
+    strategie_entscheidungen,
+    vergleiche_strategien,
+)
+from signal_auswertung import ENTSCHEIDUNG_TEXTE, SIGNAL_CACHE
+from signals_generation import Gewichtung, IndikatorAnalyses, PeriodAnalysis, SwingTrading
+
+MIN_LEN_WINDOW = 20
+
+
+@pytest.fixture(autouse=True)
+def leerer_cache():
+    SIGNAL_CACHE.entferne()
+    signal_auswertung.SIGNAL_STAENDE.clear()
+    yield
+    SIGNAL_CACHE.entferne()
+    signal_auswertung.SIGNAL_STAENDE.clear()
+
+
+@pytest.fixture
+def data(indikatoren):
+    data = indikatoren(300, seed=4)
+    assert data["ADX"].iloc[:MIN_LEN_WINDOW + 5].isna().all(), "Warm-up-Bars liegen im Vergleich"
+    return data
+
+
+def test_strategie_entscheidungen_wie_kombiniertes_signal_2(data):
+    ergebnis = strategie_entscheidungen(data, MIN_LEN_WINDOW)
+
+    assert len(ergebnis["strategien"]) == 18
+    assert ergebnis["index"].equals(data.index[MIN_LEN_WINDOW:])
+    for s, (kategorie, trading_status) in enumerate(ergebnis["strategien"]):
+        entscheidungen, scores = [], []
+        for i in range(MIN_LEN_WINDOW, len(data)):
+            entscheidung, _, score = SwingTrading.kombiniertes_signal_2(data.iloc[:i+1], kategorie, trading_status)
+            entscheidungen.append(entscheidung)
+            scores.append(score)
+
+        texte = np.array(ENTSCHEIDUNG_TEXTE, dtype=object)[ergebnis["entscheidung"][s]]
+        assert list(texte) == entscheidungen, (kategorie, trading_status)
+        np.testing.assert_allclose(np.round(ergebnis["score"][s], 3), scores, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("auswertung_tage, min_veraenderung", [(10, 0.03), (30, 0.05)])
+def test_vergleiche_strategien_wie_period_analysis(data, auswertung_tage, min_veraenderung):
+    vergleich = vergleiche_strategien(data, auswertung_tage, min_veraenderung, MIN_LEN_WINDOW)
+
+    assert vergleich["Kaufsignale"].sum() > 0
+    for zeile in vergleich.itertuples(index=False):
+        kategorie, trading_status = zeile.Kategorie, zeile.Trading_Status
+        erwartet = PeriodAnalysis.analyse_kaufsignal_perioden(
+            data, auswertung_tage, min_veraenderung, kategorie, trading_status, MIN_LEN_WINDOW
+        )
+
+        assert zeile.Kaufsignale == erwartet["Anzahl_Kaufsignale"], (kategorie, trading_status)
+        assert zeile.Perioden == len(erwartet["Perioden"])
+        if erwartet["Anzahl_Kaufsignale"] == 0:
+            assert np.isnan(zeile[3])
+            continue
+        assert zeile[3] == pytest.approx(erwartet["Trefferquote_Kauf (%)"])
+
+        # Abgeschlossene Perioden wie im Algorithmus-Tab
+        bewertung = pd.DataFrame(erwartet["Perioden_Bewertung"])
+        abgeschlossen = bewertung[bewertung["End_Datum"] + pd.Timedelta(days=auswertung_tage) <= data.index[-1]]
+        assert zeile.Perioden_abgeschlossen == len(abgeschlossen)
+        if len(abgeschlossen):
+            assert zeile[6] == pytest.approx(abgeschlossen["Bewertung"].astype(bool).mean() * 100)
+
+        letzte = SwingTrading.kombiniertes_signal_2(data, kategorie, trading_status)[0]
+        assert zeile.Aktuelle_Entscheidung == letzte
+
+
+# ------------------------------------------------------
+# Signalmatrix, Musterzählungen und Walk-Forward
+# ------------------------------------------------------
+def test_signal_matrix_wie_signal_2_je_zeile(data):
+    funktionen = [getattr(IndikatorAnalyses, f"{name.lower()}_signal_2") for name in SIGNAL_NAMEN]
+    matrix = signal_matrix(data)
+
+    assert matrix.shape == (len(SIGNAL_NAMEN), len(data)) and matrix.dtype == np.int8
+    for i in range(len(data)):
+        fenster = data.iloc[:i+1]
+        for s, funktion in enumerate(funktionen):
+            ergebnis = funktion(fenster)
+            # Textrückgaben (zu wenig Vorlauf, fehlende Bänder) zählen als 0
+            erwartet = ergebnis["signal"] if isinstance(ergebnis, dict) else 0
+            assert matrix[s, i] == erwartet, (SIGNAL_NAMEN[s], i)
+
+
+def test_signal_tensor_richtet_symbole_aus(indikatoren):
+    a = indikatoren(120, seed=1)
+    b = indikatoren(80, seed=2, start="2021-03-01")
+
+    tensor = signal_tensor({"A": a, "B": b})
+
+    assert tensor["symbole"] == ["A", "B"]
+    assert tensor["index"].equals(a.index.union(b.index))
+    zeilen_b = tensor["index"].get_indexer(b.index)
+    np.testing.assert_array_equal(tensor["signale"][:, zeilen_b, 1], signal_matrix(b))
+    np.testing.assert_array_equal(tensor["kurse"][zeilen_b, 1], b["Close"].to_numpy())
+    ohne_b = np.setdiff1d(np.arange(len(tensor["index"])), zeilen_b)
+    assert np.isnan(tensor["kurse"][ohne_b, 1]).all()
+    assert (tensor["signale"][:, ohne_b, 1] == 0).all()
+
+
+def test_muster_zaehlungen_wie_abzaehlen():
+    rng = np.random.default_rng(0)
+    signale = rng.integers(-1, 2, size=(len(SIGNAL_NAMEN), 90, 3)).astype(np.int8)
+    kurse = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, size=(90, 3)), axis=0))
+    kurse[:15, 2] = np.nan                      # Symbol startet später
+    auswertung_tage, min_veraenderung = 5, 0.04
+
+    zaehlungen = muster_zaehlungen(signale, kurse, auswertung_tage, min_veraenderung)
+
+    anzahl = np.zeros((91, ANZAHL_MUSTER))
+    treffer = np.zeros((91, ANZAHL_MUSTER))
+    for bar in range(90):
+        anzahl[bar + 1], treffer[bar + 1] = anzahl[bar], treffer[bar]
+        for j in range(3):
+            kurs = kurse[bar, j]
+            if np.isnan(kurs) or bar + auswertung_tage > 89:
+                continue
+            muster = next(m for m in range(ANZAHL_MUSTER) if (MUSTER[m] == signale[:, bar, j]).all())
+            anzahl[bar + 1, muster] += 1
+            if np.nanmax(kurse[bar + 1:bar + auswertung_tage + 1, j]) / kurs - 1 >= min_veraenderung:
+                treffer[bar + 1, muster] += 1
+
+    np.testing.assert_array_equal(zaehlungen["anzahl"], anzahl)
+    np.testing.assert_array_equal(zaehlungen["treffer"], treffer)
+
+
+def test_bewerte_kandidaten_wie_score_je_bar():
+    rng = np.random.default_rng(1)
+    anzahl = rng.integers(0, 5, ANZAHL_MUSTER).astype(float)
+    treffer = np.minimum(anzahl, rng.integers(0, 3, ANZAHL_MUSTER))
+    gewichte = gewichts_kandidaten("Value", anzahl=20) * effektive_gewichte(dict.fromkeys(SIGNAL_NAMEN, 1.0), "Volatil")
+    schwellen = np.array([0.1, 0.25, 0.5])
+
+    ergebnis = bewerte_kandidaten(gewichte, schwellen, anzahl, treffer)
+
+    for k in range(len(gewichte)):
+        score = MUSTER @ gewichte[k]
+        for s, schwelle in enumerate(schwellen):
+            kauf = score > schwelle
+            assert ergebnis["signale"][k, s] == anzahl[kauf].sum()
+            assert ergebnis["treffer"][k, s] == treffer[kauf].sum()
+
+
+def test_gewichts_kandidaten_nur_signale_der_kategorie():
+    kandidaten = gewichts_kandidaten("Zyklisch", anzahl=50, seed=3)
+    strategie = Gewichtung.KATEGORIE_STRATEGIEN["Zyklisch"]
+
+    np.testing.assert_allclose(kandidaten.sum(axis=1), 1.0)
+    assert list(kandidaten[0]) == [strategie["weights"].get(name, 0.0) for name in SIGNAL_NAMEN]
+    fremde = [i for i, name in enumerate(SIGNAL_NAMEN) if name not in strategie["signale"]]
+    assert (kandidaten[:, fremde] == 0).all()
+
+
+def test_walk_forward_trennt_training_und_test(indikatoren):
+    datensaetze = {symbol: indikatoren(700, seed=seed) for seed, symbol in enumerate("ABC")}
+    tensor = signal_tensor(datensaetze)
+    auswertung_tage = 20
+
+    folds = optimiere_walk_forward(
+        tensor["signale"], tensor["kurse"], "Growth", index=tensor["index"], auswertung_tage=auswertung_tage,
+        min_veraenderung=0.05, train_bars=200, test_bars=60, anzahl_kandidaten=200, min_signale=5,
+    )
+
+    assert len(folds) == int(np.ceil((700 - 200 - auswertung_tage) / 60))
+    position = tensor["index"].get_indexer
+    train_ende, test_start = position(folds["Train_Ende"]), position(folds["Test_Start"])
+    # Zwischen Training und Test liegen auswertung_tage Bars, die Testfenster schließen lückenlos an
+    assert (test_start - train_ende == auswertung_tage + 1).all()
+    assert (position(folds["Test_Start"])[1:] == position(folds["Test_Ende"])[:-1] + 1).all()
+    assert (folds["Train_Signale"] >= 5).all()
+    np.testing.assert_allclose(folds[SIGNAL_NAMEN].sum(axis=1), 1.0)
+
+    empfehlung = empfohlene_gewichtung(folds, "Growth")
+    assert empfehlung["signale"] == Gewichtung.KATEGORIE_STRATEGIEN["Growth"]["signale"]
+    assert sum(empfehlung["weights"].values()) == pytest.approx(1.0, abs=0.01)
+    assert empfehlung["schwelle"] == folds["Schwelle"].median()
+
+
+def test_ohne_folds_bleibt_aktuelle_gewichtung():
+    empfehlung = empfohlene_gewichtung(pd.DataFrame(), "Defensiv")
+    assert empfehlung == {"signale": ["ADX", "Bollinger"], "weights": {"ADX": 0.9, "Bollinger": 0.1}, "schwelle": 0.25}
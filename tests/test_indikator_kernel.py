@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from core_magic_3 import berechne_indikatoren_ta
+from indikator_kernel import berechne_indikatoren_numpy
+
+pytest.importorskip("ta")
+
+# Gleitkomma-Abweichungen aus unterschiedlicher Summationsreihenfolge
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+@pytest.mark.parametrize("laenge", [30, 60, 250, 1000])
+@pytest.mark.parametrize("parameter", [
+    None,
+    {"macd_kurz": 8, "macd_lang": 21, "macd_signal": 5, "rsi_fenster": 10, "adx_fenster": 10, "kijun": 30},
+])
+def test_numpy_backend_wie_ta(kurse, laenge, parameter):
+    data = kurse(laenge, seed=laenge)
+
+    erwartet = berechne_indikatoren_ta(data, parameter)
+    ergebnis = berechne_indikatoren_numpy(data, parameter)
+
+    assert list(ergebnis.columns) == list(erwartet.columns)
+    for spalte in erwartet.columns:
+        np.testing.assert_allclose(
+            ergebnis[spalte].to_numpy(dtype=float), erwartet[spalte].to_numpy(dtype=float),
+            rtol=RTOL, atol=ATOL, err_msg=spalte
+        )
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indikator_kernel import berechne_indikatoren_numpy
+from indikator_panel import IndikatorPanel, handelstage
+
+PARAMETER = [
+    None,
+    {"macd_kurz": 8, "macd_lang": 21, "macd_signal": 5, "tenkan": 10, "kijun": 30, "bb_std": 2.5, "stoch_glaettung": 4},
+]
+
+
+def ohne_tage(data, tage):
+    return data[~handelstage(data.index).isin(pd.DatetimeIndex(tage))]
+
+
+@pytest.fixture
+def datensaetze(kurse):
+    # Eigene Feiertage je Börse: NOW (New York) und RHM.DE (Xetra)
+    now = ohne_tage(kurse(400, seed=1), ["2021-05-31", "2021-07-05", "2021-09-06", "2021-11-25"])
+    rhm = ohne_tage(
+        kurse(420, seed=2, start="2020-12-01", tz="Europe/Berlin"),
+        ["2020-12-24", "2020-12-25", "2020-12-31", "2021-04-02", "2021-04-05", "2021-05-24"],
+    )
+    return {"NOW": now, "RHM.DE": rhm}
+
+
+def assert_gleich(ergebnis: pd.DataFrame, erwartet: pd.DataFrame):
+    assert list(ergebnis.columns) == list(erwartet.columns)
+    assert ergebnis.index.equals(erwartet.index)
+    for spalte in erwartet.columns:
+        np.testing.assert_allclose(
+            ergebnis[spalte].to_numpy(dtype=float), erwartet[spalte].to_numpy(dtype=float),
+            rtol=1e-9, atol=1e-9, err_msg=spalte
+        )
+
+
+@pytest.mark.parametrize("parameter", PARAMETER)
+def test_je_symbol_wie_einzelberechnung(datensaetze, parameter):
+    panel = IndikatorPanel(datensaetze, parameter)
+
+    assert panel.symbole == ["NOW", "RHM.DE"]
+    for symbol, data in datensaetze.items():
+        # Rolling-Fenster laufen im eigenen Handelskalender, nicht auf dem gemeinsamen Index
+        assert_gleich(panel.frame(symbol), berechne_indikatoren_numpy(data, parameter))
+
+
+def test_ausrichtung_ueber_handelskalender(datensaetze):
+    panel = IndikatorPanel(datensaetze)
+    now, rhm = datensaetze["NOW"], datensaetze["RHM.DE"]
+
+    # Lokaler Handelstag: Mitternacht Frankfurt und New York landen in derselben Zeile
+    assert panel.index.tz is None
+    assert panel.index.equals(handelstage(now.index).union(handelstage(rhm.index)))
+    position = panel.position
+    close = panel.ausgerichtet("Close")
+
+    for j, (symbol, data) in enumerate(datensaetze.items()):
+        zeilen = panel.index.get_indexer(handelstage(data.index))
+        assert (zeilen >= 0).all()
+        np.testing.assert_array_equal(position[zeilen, j], np.arange(len(data)))
+        np.testing.assert_array_equal(close[zeilen, j], data["Close"].to_numpy())
+        ohne = np.setdiff1d(np.arange(len(panel.index)), zeilen)
+        assert (position[ohne, j] == -1).all() and np.isnan(close[ohne, j]).all()
+        np.testing.assert_allclose(
+            panel.ausgerichtet("RSI")[zeilen, j], berechne_indikatoren_numpy(data)["RSI"].to_numpy(), equal_nan=True
+        )
+
+    # US-Feiertag: RHM.DE handelt, NOW nicht – und umgekehrt
+    zeile = panel.index.get_loc(pd.Timestamp("2021-07-05"))
+    assert position[zeile, 0] == -1 and position[zeile, 1] >= 0
+    zeile = panel.index.get_loc(pd.Timestamp("2021-04-05"))
+    assert position[zeile, 0] >= 0 and position[zeile, 1] == -1
+
+
+def test_sichten_teilen_den_speicher(datensaetze):
+    panel = IndikatorPanel(datensaetze)
+
+    frame = panel.frame("RHM.DE")
+    assert np.shares_memory(frame["Close"].to_numpy(), panel.werte("RHM.DE"))
+    assert np.shares_memory(panel.arrays("NOW")["ADX"], panel.werte("NOW"))
+    assert panel.ausgerichtet("ADX") is panel.ausgerichtet("ADX")
+    assert "NOW" in panel and "SAP.DE" not in panel
+
+
+def test_leere_watchlist(datensaetze):
+    panel = IndikatorPanel({"LEER": datensaetze["NOW"].iloc[:0], "NONE": None})
+
+    assert len(panel) == 0 and len(panel.index) == 0
+    assert panel.ausgerichtet("Close").shape == (0, 0)
+    assert panel.position.shape == (0, 0)
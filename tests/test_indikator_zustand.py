@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+import core_magic_3
+from core_magic_3 import INDIKATOR_ZUSTAENDE, berechne_indikatoren_inkrementell
+from indikator_kernel import berechne_indikatoren_numpy
+
+PARAMETER = [
+    None,
+    {"macd_kurz": 8, "macd_lang": 21, "macd_signal": 5, "tenkan": 10, "kijun": 30, "bb_std": 2.5, "stoch_glaettung": 4},
+]
+
+
+@pytest.fixture(autouse=True)
+def leere_zustaende():
+    INDIKATOR_ZUSTAENDE.clear()
+    core_magic_3._INDIKATOR_STAENDE.clear()
+    yield
+    INDIKATOR_ZUSTAENDE.clear()
+    core_magic_3._INDIKATOR_STAENDE.clear()
+
+
+def assert_gleich(ergebnis, erwartet):
+    assert list(ergebnis.columns) == list(erwartet.columns)
+    assert ergebnis.index.equals(erwartet.index)
+    for spalte in erwartet.columns:
+        np.testing.assert_allclose(
+            ergebnis[spalte].to_numpy(dtype=float), erwartet[spalte].to_numpy(dtype=float),
+            rtol=1e-9, atol=1e-9, err_msg=spalte
+        )
+
+
+@pytest.mark.parametrize("parameter", PARAMETER)
+def test_neue_bar_nutzt_zustand_weiter(kurse, parameter):
+    data = kurse(600, seed=1)
+    berechne_indikatoren_inkrementell("X", data.iloc[:-1], parameter)
+    zustand = next(iter(INDIKATOR_ZUSTAENDE.values()))
+
+    ergebnis = berechne_indikatoren_inkrementell("X", data, parameter)
+
+    assert next(iter(INDIKATOR_ZUSTAENDE.values())) is zustand
+    assert len(zustand) == len(data)
+    assert_gleich(ergebnis, berechne_indikatoren_numpy(data, parameter))
+
+
+@pytest.mark.parametrize("parameter", PARAMETER)
+def test_offene_bar_wird_ersetzt(kurse, parameter):
+    data = kurse(400, seed=2)
+    berechne_indikatoren_inkrementell("X", data, parameter)
+    geaendert = data.copy()
+    geaendert.iloc[-1, geaendert.columns.get_loc("Close")] *= 1.02
+
+    ergebnis = berechne_indikatoren_inkrementell("X", geaendert, parameter)
+
+    assert len(ergebnis) == len(data)
+    assert_gleich(ergebnis, berechne_indikatoren_numpy(geaendert, parameter))
+
+
+def test_alter_frame_bleibt_unveraendert(kurse):
+    data = kurse(300, seed=3)
+    vorher = berechne_indikatoren_inkrementell("X", data.iloc[:-1])
+    kopie = vorher.copy()
+
+    berechne_indikatoren_inkrementell("X", data)
+
+    assert vorher.equals(kopie)
+
+
+def test_anhaengen_teilt_die_alten_zeilen(kurse):
+    data = kurse(700, seed=7)
+    vorher = berechne_indikatoren_inkrementell("X", data.iloc[:-3])
+    kopie = vorher.copy()
+
+    frames = [berechne_indikatoren_inkrementell("X", data.iloc[:i]) for i in range(len(data) - 2, len(data) + 1)]
+
+    for spalte in ["Close", "Volume", "MA10", "ADX", "Senkou_Span_B"]:
+        assert np.shares_memory(vorher[spalte].to_numpy(), frames[-1][spalte].to_numpy()), spalte
+    assert vorher.equals(kopie)
+    assert_gleich(frames[-1], berechne_indikatoren_numpy(data))
+
+
+def test_ersetzte_letzte_bar_aendert_alten_frame_nicht(kurse):
+    data = kurse(300, seed=8)
+    vorher = berechne_indikatoren_inkrementell("X", data)
+    kopie = vorher.copy()
+    offen = data.copy()
+    offen.iloc[-1, offen.columns.get_loc("Close")] *= 1.05
+
+    ergebnis = berechne_indikatoren_inkrementell("X", offen)
+
+    assert vorher.equals(kopie)
+    assert ergebnis["Close"].iloc[-1] != vorher["Close"].iloc[-1]
+    assert_gleich(ergebnis, berechne_indikatoren_numpy(offen))
+
+
+def test_geaenderte_historie_baut_neu_auf(kurse):
+    data = kurse(300, seed=4)
+    berechne_indikatoren_inkrementell("X", data.iloc[:-1])
+    zustand = next(iter(INDIKATOR_ZUSTAENDE.values()))
+    adjustiert = data.copy()
+    adjustiert[["Open", "High", "Low", "Close"]] *= 0.5
+
+    ergebnis = berechne_indikatoren_inkrementell("X", adjustiert)
+
+    assert next(iter(INDIKATOR_ZUSTAENDE.values())) is not zustand
+    assert_gleich(ergebnis, berechne_indikatoren_numpy(adjustiert))
+
+
+def test_zustand_je_parameter(kurse):
+    data = kurse(300, seed=5)
+    berechne_indikatoren_inkrementell("X", data, PARAMETER[0])
+    berechne_indikatoren_inkrementell("X", data, PARAMETER[1])
+
+    assert len(INDIKATOR_ZUSTAENDE) == 2
+
+
+def test_refresh_ueber_berechne_indikatoren(kurse):
+    data = kurse(500, seed=6)
+    core_magic_3.INDIKATOR_CACHE.entferne(lambda schluessel: schluessel[0] == "REFRESH")
+
+    core_magic_3.berechne_indikatoren(data.iloc[:-2], symbol="REFRESH")
+    assert not INDIKATOR_ZUSTAENDE
+    core_magic_3.berechne_indikatoren(data.iloc[:-1], symbol="REFRESH")
+    zustand = next(iter(INDIKATOR_ZUSTAENDE.values()))
+    ergebnis = core_magic_3.berechne_indikatoren(data, symbol="REFRESH")
+
+    assert next(iter(INDIKATOR_ZUSTAENDE.values())) is zustand
+    assert_gleich(ergebnis, berechne_indikatoren_numpy(data))
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJEKT = Path(__file__).resolve().parent.parent
+
+APP_MODULE = [
+    "core_magic_3",
+    "signals_2",
+    "signals_generation",
+    "SwingtradingSignale",
+    "screener",
+    "portfolio_backtest",
+    "gewichtungs_optimierer",
+    "watchlist_backtest",
+    "vorlader",
+    "views",
+]
+if sys.version_info >= (3, 12):
+    # verschachtelte f-Strings
+    APP_MODULE.append("streamlit_visualization_13")
+
+
+@pytest.mark.parametrize("modul", APP_MODULE)
+def test_app_module_laden_ta_nicht(modul):
+    # eigener Interpreter: andere Tests haben ta längst geladen
+    code = f"import sys; import {modul}; sys.exit('ta' in sys.modules)"
+    ergebnis = subprocess.run([sys.executable, "-c", code], cwd=PROJEKT, capture_output=True, text=True)
+    assert ergebnis.returncode == 0, ergebnis.stderr or f"{modul} lädt ta beim Import"
@@ -0,0 +1,216 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from kursdaten_speicher import KursdatenSpeicher
+
+
+class FakeMarkt:
+    """
+    Lokaler Provider: liefert Ausschnitte einer festen Kurshistorie
+    und zählt die Requests (Einzel- und Sammel-Provider).
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self.requests = []
+
+    def _ausschnitt(self, period=None, start=None):
+        if start is None:
+            return self.data.copy()
+        return self.data.loc[self.data.index >= pd.Timestamp(start, tz=self.data.index.tz)].copy()
+
+    def provider(self, symbol, period=None, start=None):
+        self.requests.append(("einzeln", symbol, period, start))
+        return self._ausschnitt(period, start)
+
+    def sammel_provider(self, symbole, period=None, start=None):
+        self.requests.append(("sammel", tuple(symbole), period, start))
+        return {symbol: self._ausschnitt(period, start) for symbol in symbole}
+
+
+@pytest.fixture
+def markt(kurse):
+    # Historie bis heute, damit period="3y"/"4y" den gespeicherten Zeitraum abdeckt
+    start = (pd.Timestamp.today() - pd.offsets.BDay(1199)).strftime("%Y-%m-%d")
+    return FakeMarkt(kurse(1200, seed=7, start=start))
+
+
+@pytest.fixture
+def speicher(markt, tmp_path):
+    return KursdatenSpeicher(tmp_path, provider=markt.provider, sammel_provider=markt.sammel_provider)
+
+
+# ------------------------------------------------------
+# lade: Voll-Download, Delta, Neuladen nach Dividende/Split
+# ------------------------------------------------------
+def test_erster_aufruf_laedt_voll_und_speichert(speicher, markt):
+    data = speicher.lade("ABC", "3y")
+
+    assert markt.requests == [("einzeln", "ABC", "3y", None)]
+    assert speicher.pfad("ABC").exists()
+    assert data.index.equals(markt.data.index)
+    assert speicher.lese("ABC").equals(markt.data)
+
+
+def test_delta_wird_angehaengt(speicher, markt):
+    alt = markt.data
+    markt.data = alt.iloc[:-5]
+    speicher.lade("ABC", "3y")
+    markt.data = alt
+    speicher.AKTUALITAET = pd.Timedelta(0)
+
+    data = speicher.lade("ABC", "3y")
+
+    art, _, period, start = markt.requests[-1]
+    assert (art, period) == ("einzeln", None)
+    assert start == alt.index[-6].strftime("%Y-%m-%d")
+    assert len(markt.requests) == 2
+    assert speicher.lese("ABC").index.equals(alt.index)
+    assert data.index[-1] == alt.index[-1]
+    assert data.index[0] >= pd.Timestamp.now(tz=alt.index.tz) - pd.DateOffset(years=3)
+
+
+def test_offene_letzte_bar_wird_ueberschrieben(speicher, markt):
+    speicher.lade("ABC", "3y")
+    markt.data = markt.data.copy()
+    markt.data.iloc[-1, markt.data.columns.get_loc("Close")] += 1.0
+    speicher.AKTUALITAET = pd.Timedelta(0)
+
+    data = speicher.lade("ABC", "3y")
+
+    assert data["Close"].iloc[-1] == markt.data["Close"].iloc[-1]
+    assert not data.index.duplicated().any()
+
+
+@pytest.mark.parametrize("spalte", ["Dividends", "Stock Splits"])
+def test_dividende_oder_split_laedt_voll_neu(speicher, markt, spalte):
+    alt = markt.data
+    markt.data = alt.iloc[:-1]
+    speicher.lade("ABC", "3y")
+    # Neue Bar mit Kapitalmaßnahme, die Historie ist neu adjustiert
+    neu = alt.copy()
+    neu[["Open", "High", "Low", "Close"]] *= 0.9
+    neu.iloc[-1, neu.columns.get_loc(spalte)] = 0.5
+    markt.data = neu
+    speicher.AKTUALITAET = pd.Timedelta(0)
+
+    data = speicher.lade("ABC", "3y")
+
+    delta, voll = markt.requests[-2:]
+    assert delta[3] is not None
+    assert voll == ("einzeln", "ABC", "3y", None)
+    assert speicher.lese("ABC").equals(neu)
+    assert data["Close"].iloc[0] == neu["Close"].iloc[0]
+
+
+def test_zu_kurze_historie_laedt_voll(speicher, markt):
+    alt = markt.data
+    markt.data = alt.iloc[-100:]
+    speicher.lade("ABC", "3y")
+    markt.data = alt
+    speicher.AKTUALITAET = pd.Timedelta(0)
+
+    speicher.lade("ABC", "3y")
+
+    assert markt.requests[-1] == ("einzeln", "ABC", "3y", None)
+    assert speicher.lese("ABC").index.equals(alt.index)
+
+
+def test_ist_aktuell_spart_den_request(speicher, markt):
+    assert not speicher.ist_aktuell("ABC")
+    erster = speicher.lade("ABC", "3y")
+    assert speicher.ist_aktuell("ABC")
+
+    zweiter = speicher.lade("ABC", "4y")
+
+    assert len(markt.requests) == 1
+    assert zweiter.index[-1] == erster.index[-1]
+    speicher.AKTUALITAET = pd.Timedelta(0)
+    assert not speicher.ist_aktuell("ABC")
+
+
+def test_leere_antwort_wird_nicht_gespeichert(speicher, markt):
+    markt.data = markt.data.iloc[:0]
+
+    data = speicher.lade("ABC", "3y")
+
+    assert data.empty
+    assert not speicher.pfad("ABC").exists()
+    assert not speicher.ist_aktuell("ABC")
+
+
+def test_gleichzeitig_lade_und_lade_viele(speicher, markt):
+    speicher.AKTUALITAET = pd.Timedelta(0)   # jeder Aufruf gleicht ab
+    fehler = []
+
+    def lauf(i):
+        try:
+            if i % 2:
+                speicher.lade("ABC", "4y")
+            else:
+                speicher.lade_viele(["ABC", "DEF"], period="4y")
+        except Exception as e:
+            fehler.append(e)
+
+    threads = [threading.Thread(target=lauf, args=(i,)) for i in range(200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fehler == []
+    assert sorted(p.name for p in speicher.verzeichnis.iterdir()) == ["ABC.parquet", "DEF.parquet"]
+    assert speicher.lese("ABC").index.equals(markt.data.index)
+
+
+# ------------------------------------------------------
+# lade_viele: Sammel-Download der Watchlist
+# ------------------------------------------------------
+def test_lade_viele_erst_voll_dann_delta(speicher, markt):
+    alt = markt.data
+    markt.data = alt.iloc[:-3]
+    erster = speicher.lade_viele(["ABC", "DEF"], period="3y")
+    assert [r[0] for r in markt.requests] == ["sammel"]
+    assert markt.requests[0][2] == "3y"
+
+    markt.data = alt
+    speicher.AKTUALITAET = pd.Timedelta(0)
+    zweiter = speicher.lade_viele(["ABC", "DEF"], period="3y")
+
+    assert markt.requests[-1][0] == "sammel" and markt.requests[-1][3] is not None
+    assert len(markt.requests) == 2
+    assert len(zweiter["ABC"]) == len(erster["ABC"]) + 3
+    assert speicher.lese("DEF").index.equals(alt.index)
+
+
+def test_lade_viele_ohne_request_nach_frischem_abgleich(speicher, markt):
+    speicher.lade("ABC", "3y")
+    speicher.lade("DEF", "3y")
+    anzahl = len(markt.requests)
+
+    ergebnis = speicher.lade_viele(["ABC", "DEF"], period="3y")
+
+    assert len(markt.requests) == anzahl
+    assert ergebnis["ABC"].equals(speicher.lade("ABC", "3y"))
+
+
+def test_lade_viele_laedt_nur_veraltete_symbole(speicher, markt):
+    speicher.lade_viele(["ABC", "DEF"], period="3y")
+    speicher._synchronisiert.pop("DEF")
+
+    speicher.lade_viele(["ABC", "DEF"], period="3y")
+
+    assert markt.requests[-1][:2] == ("sammel", ("DEF",))
+
+
+def test_lade_viele_ohne_daten_fehlt_im_ergebnis(speicher, markt):
+    sammel = markt.sammel_provider
+    speicher.sammel_provider = lambda symbole, **zeitraum: {
+        s: d for s, d in sammel(symbole, **zeitraum).items() if s != "LEER"
+    }
+
+    ergebnis = speicher.lade_viele(["ABC", "LEER"], period="3y")
+
+    assert list(ergebnis) == ["ABC"]
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import portfolio_backtest
+from indikator_panel import handelstage
+from portfolio_backtest import TRADE_SPALTEN, portfolio_backtest as backtest
+
+EINSTIEG_BAR = 30
+
+
+def flache_kurse(n=60, tz="America/New_York"):
+    index = pd.bdate_range("2023-01-02", periods=n, tz=tz, name="Date")
+    return pd.DataFrame(
+        {"Open": 100.0, "High": 101.0, "Low": 99.0, "Close": 100.0, "Volume": 1e6, "Dividends": 0.0, "Stock Splits": 0.0},
+        index=index,
+    )
+
+
+def setze_bar(data, bar, **werte):
+    for spalte, wert in werte.items():
+        data.iloc[bar, data.columns.get_loc(spalte)] = wert
+
+
+@pytest.fixture
+def kauf_an_einem_tag(monkeypatch):
+    """
+    Ersetzt die Entscheidungen: BUY für alle Symbole an EINSTIEG_BAR, sonst NO_TRADE,
+    Market-Regime trend_market (Stop 3 %, Ziel 6 %).
+    """
+    def bewerte_panel(panel):
+        form = panel["position"].shape
+        action = np.full(form, "NO_TRADE", dtype=object)
+        action[EINSTIEG_BAR] = "BUY"
+        return {
+            "action": action,
+            "confidence": np.full(form, 0.75),
+            "market_regime": np.full(form, "trend_market", dtype=object),
+        }
+
+    monkeypatch.setattr(portfolio_backtest, "bewerte_panel", bewerte_panel)
+
+
+def test_ausstiege_an_stop_ziel_und_haltedauer(kauf_an_einem_tag):
+    datensaetze = {symbol: flache_kurse() for symbol in ("GAP", "BEIDE", "ZIEL", "ZEIT", "EINSTIEG")}
+    # Kurslücke unter den Stop → Ausstieg zum Eröffnungskurs
+    setze_bar(datensaetze["GAP"], EINSTIEG_BAR + 5, Open=95.0, High=95.5, Low=94.0, Close=95.0)
+    # Stop und Ziel in derselben Bar → vorsichtig der Stop
+    setze_bar(datensaetze["BEIDE"], EINSTIEG_BAR + 3, High=107.0, Low=96.0)
+    # Kurslücke über das Ziel → Ausstieg zum Eröffnungskurs
+    setze_bar(datensaetze["ZIEL"], EINSTIEG_BAR + 2, Open=108.0, High=109.0, Low=107.5, Close=108.5)
+    # Tief unter dem Stop in der Einstiegsbar selbst löst nichts aus
+    setze_bar(datensaetze["EINSTIEG"], EINSTIEG_BAR, Low=90.0)
+
+    ergebnis = backtest(datensaetze, startkapital=1e6, risiko_prozent=0.5, stop_modus="regime", max_haltedauer=10)
+    trades = ergebnis["trades"].set_index("Symbol")
+
+    assert list(ergebnis["trades"].columns) == TRADE_SPALTEN
+    assert (trades["Einstiegskurs"] == 100.0).all()
+    assert (trades["Stop_Loss"] == 97.0).all() and (trades["Take_Profit"] == 106.0).all()
+    # Trades tragen den lokalen Handelstag des gemeinsamen Panel-Index
+    index = handelstage(datensaetze["GAP"].index)
+
+    erwartet = {
+        "GAP": ("Stop-Loss", 95.0, 5),
+        "BEIDE": ("Stop-Loss", 97.0, 3),
+        "ZIEL": ("Take-Profit", 108.0, 2),
+        "ZEIT": ("Haltedauer", 100.0, 10),
+        "EINSTIEG": ("Haltedauer", 100.0, 10),
+    }
+    for symbol, (grund, kurs, bars) in erwartet.items():
+        trade = trades.loc[symbol]
+        assert (trade["Grund"], trade["Ausstiegskurs"], trade["Haltedauer (Bars)"]) == (grund, kurs, bars), symbol
+        assert trade["Ausstieg_Datum"] == index[EINSTIEG_BAR + bars]
+        assert trade["PnL"] == pytest.approx(trade["Stueck"] * (kurs - 100.0))
+
+
+def test_konto_und_positionslimit(kauf_an_einem_tag):
+    datensaetze = {symbol: flache_kurse() for symbol in ("A", "B", "C")}
+
+    ergebnis = backtest(
+        datensaetze, startkapital=1e6, risiko_prozent=0.5, stop_modus="regime", max_positionen=2, gebuehr_prozent=0.1
+    )
+
+    trades = ergebnis["trades"]
+    assert list(trades["Symbol"]) == ["A", "B"]
+    assert (trades["Grund"] == "offen").all()
+    verlauf = ergebnis["equity"]
+    kosten = (trades["Stueck"] * 100.0 * 1.001).sum()
+    assert verlauf["Cash"].iloc[-1] == pytest.approx(1e6 - kosten)
+    np.testing.assert_allclose(verlauf["Equity"], verlauf["Cash"] + verlauf["Investiert"])
+    # Gebühr beim Kauf und beim (gedachten) Verkauf
+    assert trades["PnL"].sum() == pytest.approx(-(trades["Stueck"] * 100.0 * 0.002).sum())
+
+
+def test_ausstiege_passen_zu_den_kursen(kurse):
+    datensaetze = {
+        "NOW": kurse(500, seed=1),
+        "RHM.DE": kurse(480, seed=2, start="2021-01-18", tz="Europe/Berlin"),
+        "SAP.DE": kurse(500, seed=3, tz="Europe/Berlin"),
+    }
+
+    ergebnis = backtest(datensaetze, startkapital=50_000, risiko_prozent=1.0, max_haltedauer=40, max_positionen=2)
+    trades, verlauf = ergebnis["trades"], ergebnis["equity"]
+
+    assert len(trades) > 5
+    assert (verlauf["Cash"] >= -1e-6).all()
+    np.testing.assert_allclose(verlauf["Equity"], verlauf["Cash"] + verlauf["Investiert"])
+    assert ergebnis["kennzahlen"]["Endkapital"] == pytest.approx(verlauf["Equity"].iloc[-1], abs=0.01)
+
+    for trade in trades.rename(columns={"Haltedauer (Bars)": "Haltedauer"}).itertuples(index=False):
+        data = datensaetze[trade.Symbol]
+        tage = handelstage(data.index)
+        einstieg, ausstieg = tage.get_loc(trade.Einstieg_Datum), tage.get_loc(trade.Ausstieg_Datum)
+        assert trade.Stop_Loss < trade.Einstiegskurs == data["Close"].iloc[einstieg]
+        # Vor dem Ausstieg berührt keine Bar Stop oder Ziel
+        dazwischen = data.iloc[einstieg + 1:ausstieg]
+        assert (dazwischen["Low"] > trade.Stop_Loss).all() and (dazwischen["High"] < trade.Take_Profit).all()
+
+        bar = data.iloc[ausstieg]
+        if trade.Grund == "Stop-Loss":
+            assert bar["Low"] <= trade.Stop_Loss
+            assert trade.Ausstiegskurs == min(bar["Open"], trade.Stop_Loss)
+        elif trade.Grund == "Take-Profit":
+            assert bar["Low"] > trade.Stop_Loss and bar["High"] >= trade.Take_Profit
+            assert trade.Ausstiegskurs == max(bar["Open"], trade.Take_Profit)
+        elif trade.Grund == "Haltedauer":
+            assert trade.Haltedauer == 40 and trade.Ausstiegskurs == bar["Close"]
+        else:
+            assert trade.Grund == "offen" and ausstieg == len(data) - 1
+
+    # Höchstens max_positionen gleichzeitig offen
+    for datum in verlauf.index:
+        offen = (trades["Einstieg_Datum"] <= datum) & ((trades["Ausstieg_Datum"] > datum) | (trades["Grund"] == "offen"))
+        assert offen.sum() <= 2
+
+
+def test_unbekannter_stop_modus():
+    with pytest.raises(ValueError):
+        backtest({}, stop_modus="fest")
@@ -0,0 +1,84 @@
+import time
+
+import pandas as pd
+import pytest
+
+import core_magic_3
+from core_magic_3 import TICKER_METADATEN, berechne_indikatoren, klassifiziere_aktie, lade_fundamentaldaten
+from screener import ergaenze_klassifikation, klassifiziere_watchlist, screener_panel, screener_tabelle
+
+METADATEN = {
+    "info": {"sector": "Technology", "marketCap": 5e10, "beta": 1.3, "trailingPE": 35.0},
+    "market_cap": 5e10,
+    "summary": None,
+    "recommendations": None,
+    "analysis": None,
+}
+
+
+@pytest.fixture
+def panel(kurse):
+    datensaetze = {
+        "AAA": kurse(900, seed=1),
+        "BBB": kurse(700, seed=2, tz="Europe/Berlin"),
+    }
+    return datensaetze, screener_panel(datensaetze)["indikatoren"]
+
+
+@pytest.fixture
+def metadaten(monkeypatch):
+    def lade(symbol):
+        raise AssertionError(f"Request für {symbol}")
+
+    monkeypatch.setattr(TICKER_METADATEN, "_eintraege", {})
+    monkeypatch.setattr(TICKER_METADATEN, "provider", lade)
+    return TICKER_METADATEN._eintraege
+
+
+def test_klassifiziert_aus_panel_wie_einzelberechnung(panel, metadaten, monkeypatch):
+    datensaetze, indikatoren = panel
+    for symbol in datensaetze:
+        metadaten[symbol] = (time.time(), METADATEN)
+
+    aufrufe = []
+    numpy_berechnung = core_magic_3.berechne_indikatoren_numpy
+    monkeypatch.setattr(core_magic_3, "berechne_indikatoren_numpy", lambda *a: aufrufe.append(a) or numpy_berechnung(*a))
+    ergebnis = klassifiziere_watchlist(indikatoren)
+    assert aufrufe == []
+
+    for symbol, data in datensaetze.items():
+        erwartet = klassifiziere_aktie(symbol, berechne_indikatoren(data, symbol=symbol), lade_fundamentaldaten(symbol))
+        assert ergebnis[symbol] == erwartet
+
+
+def test_ohne_metadaten_kein_request(panel, metadaten):
+    _, indikatoren = panel
+    metadaten["AAA"] = (time.time(), METADATEN)
+
+    ergebnis = klassifiziere_watchlist(indikatoren)
+
+    assert set(ergebnis) == {"AAA"}
+    assert ergebnis["AAA"]["Profil"] is not None
+
+
+def test_veraltete_metadaten_gelten_als_fehlend(panel, metadaten):
+    _, indikatoren = panel
+    metadaten["AAA"] = (time.time() - TICKER_METADATEN.ttl - TICKER_METADATEN.max_veraltet - 1, METADATEN)
+
+    assert not TICKER_METADATEN.ist_vorhanden("AAA")
+    assert klassifiziere_watchlist(indikatoren) == {}
+
+
+def test_klassifikation_wird_beim_anzeigen_ergaenzt(panel, metadaten):
+    datensaetze, indikatoren = panel
+    tabelle = screener_tabelle(screener_panel(datensaetze))
+    assert tabelle["Profil"].isna().all()
+    metadaten["BBB"] = (time.time(), METADATEN)
+
+    ergebnis = ergaenze_klassifikation(tabelle, klassifiziere_watchlist(indikatoren))
+
+    assert tabelle["Profil"].isna().all()
+    profile = dict(zip(ergebnis["Symbol"], ergebnis["Profil"]))
+    assert pd.isna(profile["AAA"])
+    assert profile["BBB"] == "Growth"
+    assert ergebnis.drop(columns=["Profil", "Trading_Status"]).equals(tabelle.drop(columns=["Profil", "Trading_Status"]))
@@ -0,0 +1,211 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import signal_auswertung
+from indikator_kernel import berechne_indikatoren_numpy
+from signal_auswertung import (
+    MAX_AUSWERTUNGEN,
+    SIGNAL_CACHE,
+    KompakteSignale,
+    SignalVerlauf,
+    cluster_indizes,
+    cluster_perioden,
+    signal_verlauf,
+)
+from signals_2 import kombinierte_signale_kompakt
+
+MIN_LEN_WINDOW = 20
+AUSWERTUNGEN = [(10, 0.03), (30, 0.05), (61, 0.08)]
+
+# Länge der Daten je Signalberechnung (fortgeschrieben wird nur das Ende)
+BERECHNET = []
+
+
+def berechne(daten):
+    BERECHNET.append(len(daten))
+    return kombinierte_signale_kompakt(daten, MIN_LEN_WINDOW)
+
+
+@pytest.fixture(autouse=True)
+def leerer_cache():
+    SIGNAL_CACHE.entferne()
+    signal_auswertung.SIGNAL_STAENDE.clear()
+    BERECHNET.clear()
+    yield
+    SIGNAL_CACHE.entferne()
+    signal_auswertung.SIGNAL_STAENDE.clear()
+
+
+@pytest.fixture
+def daten(kurse):
+    # Indikatoren über die ganze Historie: Ausschnitte haben dieselben Werte
+    return berechne_indikatoren_numpy(kurse(700, seed=11))
+
+
+def verlauf(full_data):
+    return signal_verlauf(full_data, "test", berechne, min_len_window=MIN_LEN_WINDOW)
+
+
+def assert_wie_neu_berechnet(ergebnis: SignalVerlauf, full_data):
+    erwartet = SignalVerlauf(full_data, berechne(full_data))
+    pd.testing.assert_frame_equal(ergebnis.signale.als_frame(mit_score=True), erwartet.signale.als_frame(mit_score=True))
+    np.testing.assert_array_equal(ergebnis.kauf_positionen, erwartet.kauf_positionen)
+    np.testing.assert_array_equal(ergebnis.perioden_start, erwartet.perioden_start)
+    np.testing.assert_array_equal(ergebnis.perioden_ende, erwartet.perioden_ende)
+    for tage, schwelle in AUSWERTUNGEN:
+        a, b = ergebnis.auswertung(tage, schwelle), erwartet.auswertung(tage, schwelle)
+        assert a["Perioden"] == b["Perioden"]
+        assert a["Einzelbewertung"] == b["Einzelbewertung"]
+        pd.testing.assert_frame_equal(pd.DataFrame(a["Perioden_Bewertung"]), pd.DataFrame(b["Perioden_Bewertung"]))
+
+
+def test_wachsendes_fenster_wie_neuberechnung(daten):
+    aktuell = verlauf(daten.iloc[:500])
+    for tage, schwelle in AUSWERTUNGEN:
+        aktuell.auswertung(tage, schwelle)
+
+    for ende in range(501, len(daten) + 1, 7):
+        vorher = aktuell
+        aktuell = verlauf(daten.iloc[:ende])
+        assert aktuell is not vorher
+        for tage, schwelle in AUSWERTUNGEN:
+            aktuell.auswertung(tage, schwelle)
+
+    assert max(BERECHNET[1:]) < 2 * MIN_LEN_WINDOW
+    assert aktuell._feste, "Feste Bewertungen werden fortgeschrieben"
+    assert_wie_neu_berechnet(aktuell, daten.iloc[:ende])
+
+
+def test_gleitendes_fenster_wie_neuberechnung(daten):
+    aktuell = verlauf(daten.iloc[:500])
+    for tage, schwelle in AUSWERTUNGEN:
+        aktuell.auswertung(tage, schwelle)
+
+    for start in range(1, 150, 9):
+        aktuell = verlauf(daten.iloc[start:start + 500])
+        for tage, schwelle in AUSWERTUNGEN:
+            aktuell.auswertung(tage, schwelle)
+
+    assert max(BERECHNET[1:]) < 2 * MIN_LEN_WINDOW
+    assert_wie_neu_berechnet(aktuell, daten.iloc[start:start + 500])
+
+
+def test_offene_letzte_bar_wird_ersetzt(daten):
+    verlauf(daten.iloc[:600])
+    offen = daten.iloc[:601].copy()
+    offen.iloc[-1, offen.columns.get_loc("Close")] *= 1.03
+
+    verlauf(offen)
+
+    assert_wie_neu_berechnet(verlauf(daten.iloc[:601]), daten.iloc[:601])
+
+
+def test_auswertungen_sind_begrenzt_und_eingerechnet(daten):
+    aktuell = verlauf(daten)
+    groesse = aktuell.nbytes
+
+    ergebnisse = {}
+
+    def werte_aus(tage):
+        ergebnisse[tage] = aktuell.auswertung(tage, 0.05)
+
+    threads = [threading.Thread(target=werte_aus, args=(tage,)) for tage in range(5, 5 + 3 * MAX_AUSWERTUNGEN)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(aktuell._auswertungen) == MAX_AUSWERTUNGEN
+    assert len(aktuell._feste) == MAX_AUSWERTUNGEN
+    assert aktuell.nbytes == groesse
+    erwartet = SignalVerlauf(daten, berechne(daten))
+    for tage, ergebnis in ergebnisse.items():
+        assert ergebnis["Einzelbewertung"] == erwartet.auswertung(tage, 0.05)["Einzelbewertung"]
+
+
+def test_kompakte_signale_geben_die_tabelle_unveraendert_zurueck():
+    signale_df = pd.DataFrame({
+        "Datum": pd.bdate_range("2024-01-01", periods=4, tz="Europe/Berlin"),
+        "Entscheidung": ["🟡 Halten", "🟢 Kaufen", "🔴 Verkaufen", "🟢 Kaufen"],
+        "RSI": ["neutral", "überverkauft", "neutral", "überverkauft"],
+        "adx_value": [None, None, None, None],
+        "Details": [{"score": 0.5, "text": "a"}, {"score": 1.0, "text": "b"}, {"score": 0.5, "text": "a"}, {"score": -1.0, "text": None}],
+    })
+
+    signale = KompakteSignale.aus_frame(signale_df, score=[0.1, 0.9, -0.7, 0.4])
+    frame = signale.als_frame()
+
+    assert "Score" not in frame.columns
+    assert list(frame["adx_value"]) == [None] * 4
+    assert list(frame["Details"]) == list(signale_df["Details"])
+    pd.testing.assert_frame_equal(frame.drop(columns=["adx_value", "Details"]), signale_df.drop(columns=["adx_value", "Details"]))
+    np.testing.assert_array_equal(signale.kauf, [False, True, False, True])
+    assert "Score" in signale.als_frame(mit_score=True).columns
+
+
+def perioden_schleife(daten, max_gap_days=5):
+    """
+    Bisherige Schleife aus cluster_buy_signal_periods/cluster_periods.
+    """
+    daten = pd.Series(daten).sort_values().reset_index(drop=True)
+    perioden = []
+    start = prev = daten[0]
+    for current in daten[1:]:
+        if (current - prev).days <= max_gap_days:
+            prev = current
+        else:
+            perioden.append((start, prev))
+            start = prev = current
+    perioden.append((start, prev))
+    return perioden
+
+
+def zufaellige_signaldaten(seed, anzahl=400, intraday=False):
+    rng = np.random.default_rng(seed)
+    tage = pd.bdate_range("2022-01-03", periods=900, tz="America/New_York")
+    daten = pd.DatetimeIndex(rng.choice(tage, anzahl, replace=True))
+    if intraday:
+        # Uhrzeiten verschieben die Tagesgrenze: 5 Tage 23 h gelten als 5 Tage
+        daten = daten + pd.to_timedelta(rng.integers(0, 24 * 60, anzahl), unit="min")
+    return daten
+
+
+@pytest.mark.parametrize("intraday", [False, True])
+@pytest.mark.parametrize("max_gap_days", [0, 1, 5, 12])
+def test_cluster_perioden_wie_schleife(intraday, max_gap_days):
+    for seed in range(5):
+        daten = zufaellige_signaldaten(seed, intraday=intraday)
+        assert cluster_perioden(daten, max_gap_days) == perioden_schleife(daten, max_gap_days)
+
+
+def test_cluster_indizes_trennt_gruppen():
+    daten = zufaellige_signaldaten(3, anzahl=600, intraday=True)
+    gruppen = np.random.default_rng(3).integers(0, 4, len(daten))
+
+    reihenfolge, start, ende = cluster_indizes(daten, 5, gruppen=gruppen)
+    sortiert = daten[reihenfolge]
+
+    erwartet = []
+    for gruppe in range(4):
+        erwartet += perioden_schleife(daten[gruppen == gruppe])
+    assert list(zip(sortiert[start], sortiert[ende])) == erwartet
+    assert (gruppen[reihenfolge][start] == gruppen[reihenfolge][ende]).all()
+
+
+def test_cluster_wrapper_wie_schleife():
+    from signals_2 import cluster_buy_signal_periods
+    from signals_generation import PeriodAnalysis
+    from SwingtradingSignale import BuySignalEvaluator
+
+    daten = zufaellige_signaldaten(8, anzahl=150, intraday=True)
+    erwartet = perioden_schleife(daten)
+    kaufsignale_df = pd.DataFrame({"Datum": daten, "Entscheidung": "🟢 Kaufen"})
+
+    assert cluster_buy_signal_periods(kaufsignale_df) == erwartet
+    assert cluster_buy_signal_periods(kaufsignale_df.set_index("Datum")) == erwartet
+    assert PeriodAnalysis.cluster_buy_signal_periods(kaufsignale_df) == erwartet
+    assert BuySignalEvaluator.cluster_periods(kaufsignale_df) == erwartet
+    assert BuySignalEvaluator.cluster_periods(kaufsignale_df.iloc[:0]) == []
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import signal_auswertung
+from signal_auswertung import SIGNAL_CACHE, KompakteSignale, trefferquoten_kurve
+from signals_2 import (
+    analyse_kaufsignal_perioden,
+    analyse_trefferquoten_flaeche,
+    kombiniertes_signal,
+    kombinierte_signale_kompakt,
+)
+
+MIN_LEN_WINDOW = 20
+
+
+@pytest.fixture(autouse=True)
+def leerer_cache():
+    SIGNAL_CACHE.entferne()
+    signal_auswertung.SIGNAL_STAENDE.clear()
+    yield
+    SIGNAL_CACHE.entferne()
+    signal_auswertung.SIGNAL_STAENDE.clear()
+
+
+def signale_schleife(full_data, min_len_window=MIN_LEN_WINDOW):
+    """
+    Ursprüngliche Schleife: kombiniertes_signal je Fenster full_data.iloc[:i+1].
+    """
+    zeilen, scores = [], []
+    for i in range(min_len_window, len(full_data)):
+        fenster = full_data.iloc[:i+1]
+        entscheidung, einzelsignale, gesamtscore = kombiniertes_signal(fenster)
+        zeilen.append({"Datum": fenster.index[-1], "Entscheidung": entscheidung, **einzelsignale})
+        scores.append(gesamtscore)
+    return pd.DataFrame(zeilen), np.array(scores)
+
+
+@pytest.mark.parametrize("seed", [0, 5])
+def test_kompakt_wie_schleife(indikatoren, seed):
+    data = indikatoren(400, seed=seed)
+    assert data["ADX"].iloc[:MIN_LEN_WINDOW + 5].isna().all(), "Warm-up-Bars liegen im Vergleich"
+
+    erwartet, scores = signale_schleife(data)
+    ergebnis = kombinierte_signale_kompakt(data, MIN_LEN_WINDOW)
+
+    pd.testing.assert_frame_equal(ergebnis.als_frame(), erwartet)
+    # Score wird kompakt als float32 gehalten
+    np.testing.assert_array_equal(ergebnis.score, scores.astype(np.float32))
+    # Über aus_frame verpackt entsteht dieselbe Tabelle
+    pd.testing.assert_frame_equal(KompakteSignale.aus_frame(erwartet, score=scores).als_frame(), erwartet)
+
+
+def test_ohne_bollinger_und_stochastic(indikatoren):
+    data = indikatoren(120, seed=2).drop(columns=["BB_Upper", "BB_Lower", "Stoch_%K", "Stoch_%D"])
+
+    erwartet, scores = signale_schleife(data)
+    ergebnis = kombinierte_signale_kompakt(data, MIN_LEN_WINDOW)
+
+    pd.testing.assert_frame_equal(ergebnis.als_frame(), erwartet)
+    np.testing.assert_array_equal(ergebnis.score, scores.astype(np.float32))
+
+
+@pytest.mark.parametrize("auswertung_tage, min_veraenderung", [(10, 0.03), (30, 0.05)])
+def test_analyse_vektorisiert_wie_schleife(indikatoren, auswertung_tage, min_veraenderung):
+    data = indikatoren(400, seed=0)
+
+    vektor = analyse_kaufsignal_perioden(data, auswertung_tage, min_veraenderung, MIN_LEN_WINDOW, vektorisiert=True)
+    schleife = analyse_kaufsignal_perioden(data, auswertung_tage, min_veraenderung, MIN_LEN_WINDOW, vektorisiert=False)
+
+    assert vektor["Anzahl_Kaufsignale"] > 0
+    for schluessel in ("Anzahl_Kaufsignale", "Trefferquote_Kauf (%)", "Gesamt_Signale", "Perioden", "Einzelbewertung"):
+        assert vektor[schluessel] == schleife[schluessel], schluessel
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(vektor["Perioden_Bewertung"]), pd.DataFrame(schleife["Perioden_Bewertung"])
+    )
+    pd.testing.assert_frame_equal(vektor["Signal_Details"].als_frame(), schleife["Signal_Details"].als_frame())
+
+
+def test_trefferquoten_flaeche_wie_einzelne_auswertungen(indikatoren):
+    data = indikatoren(400, seed=0)
+    tage_raster = [5, 30, 61]
+    schwellen = np.array([0.0, 0.03, 0.08, 0.2])
+
+    flaeche = analyse_trefferquoten_flaeche(data, tage_raster, schwellen, MIN_LEN_WINDOW)
+
+    assert flaeche["Anzahl_Kaufsignale"] > 0 and flaeche["Anzahl_Perioden"] > 0
+    for tage in tage_raster:
+        for schwelle in schwellen:
+            ergebnis = analyse_kaufsignal_perioden(data, tage, schwelle, MIN_LEN_WINDOW)
+            assert flaeche["Signale"].loc[tage, schwelle] == pytest.approx(ergebnis["Trefferquote_Kauf (%)"])
+
+            # Nur abgeschlossene Perioden wie im Algorithmus-Tab
+            bewertung = pd.DataFrame(ergebnis["Perioden_Bewertung"])
+            abgeschlossen = bewertung[bewertung["End_Datum"] + pd.Timedelta(days=tage) <= data.index[-1]]
+            erwartet = abgeschlossen["Bewertung"].astype(bool).mean() * 100 if len(abgeschlossen) else np.nan
+            assert flaeche["Perioden"].loc[tage, schwelle] == pytest.approx(erwartet, nan_ok=True), (tage, schwelle)
+
+
+def test_trefferquoten_kurve_zaehlt_schwelle_und_nan():
+    kurs_diff = np.array([0.05, np.nan, 0.1, -0.02])
+
+    quote = trefferquoten_kurve(kurs_diff, [0.0, 0.05, 0.2])
+
+    # NaN zählt als geprüft, aber nicht getroffen; die Schwelle selbst ist ein Treffer
+    np.testing.assert_array_equal(quote, [50.0, 50.0, 0.0])
+    assert np.isnan(trefferquoten_kurve([], [0.1])).all()
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from SwingtradingSignale import RegimeBatchAnalysis, SignalGenerator
+
+MIN_LEN_WINDOW = 20
+
+
+@pytest.mark.parametrize("seed", [0, 7])
+def test_batch_wie_schleife(indikatoren, seed):
+    data = indikatoren(300, seed=seed)
+    assert data["ADX"].iloc[:MIN_LEN_WINDOW + 5].isna().all(), "Warm-up-Bars liegen im Vergleich"
+
+    generator = SignalGenerator()
+    schleife = generator.generate_signals(data, MIN_LEN_WINDOW, vektorisiert=False)
+    batch = generator.generate_signals(data, MIN_LEN_WINDOW, vektorisiert=True)
+
+    pd.testing.assert_frame_equal(batch, schleife)
+    assert set(batch["Entscheidung"]) > {"🟡 Halten"}
+
+
+def test_kurze_historie_liefert_leeren_frame(indikatoren):
+    data = indikatoren(60, seed=1).iloc[:MIN_LEN_WINDOW]
+    assert SignalGenerator().generate_signals(data, MIN_LEN_WINDOW).empty
+
+
+def test_rsi_wert_gerundet_und_nan_wenn_ungueltig():
+    rsi = np.array([31.234567, 55.555, 70.0049, np.nan])
+    vorwert = np.full(4, 50.0)
+    ergebnis = RegimeBatchAnalysis().analyse(
+        rsi=rsi, prev_rsi=vorwert, macd=vorwert, signal=vorwert, hist=vorwert, prev_hist=vorwert,
+        adx=vorwert, rsi_valid=np.array([True, False, True, True]),
+    )
+
+    np.testing.assert_array_equal(ergebnis["rsi_value"], [31.23, np.nan, 70.0, np.nan])
+    assert ergebnis["rsi_state"][1] == "invalid"
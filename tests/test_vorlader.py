@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pandas as pd
+
+from vorlader import WatchlistVorlader
+
+
+def warte_auf_ende(vorlader, timeout=5.0):
+    ende = time.time() + timeout
+    while vorlader.laeuft:
+        assert time.time() < ende, "Durchlauf endet nicht"
+        time.sleep(0.01)
+
+
+class Aufrufe:
+    def __init__(self, sperre: threading.Event = None):
+        self.symbole = []
+        self.sperre = sperre
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol):
+        with self._lock:
+            self.symbole.append(symbol)
+        if self.sperre is not None:
+            assert self.sperre.wait(5)
+
+
+def test_durchlauf_waermt_jedes_symbol_einmal():
+    aufrufe = Aufrufe()
+    vorlader = WatchlistVorlader(aufrufe, max_workers=2)
+
+    assert vorlader.starte(["A", "B", "A", "C"])
+    warte_auf_ende(vorlader)
+
+    assert sorted(aufrufe.symbole) == ["A", "B", "C"]
+    stand = vorlader.stand()
+    assert stand["gesamt"] == stand["fertig"] == 3
+    assert stand["beendet"] is not None and not stand["fehler"]
+
+
+def test_gleiche_symbole_werden_nicht_erneut_geladen():
+    aufrufe = Aufrufe()
+    vorlader = WatchlistVorlader(aufrufe)
+    vorlader.starte(["A", "B"])
+    warte_auf_ende(vorlader)
+
+    assert not vorlader.starte(["A", "B", "A"])
+    assert not vorlader.starte(["A", "B"])
+    assert len(aufrufe.symbole) == 2
+
+    assert vorlader.starte(["A", "B", "C"])
+    warte_auf_ende(vorlader)
+    assert len(aufrufe.symbole) == 5
+
+
+def test_nach_ablauf_wird_neu_geladen():
+    aufrufe = Aufrufe()
+    vorlader = WatchlistVorlader(aufrufe, erneuern_nach=pd.Timedelta(0))
+    vorlader.starte(["A"])
+    warte_auf_ende(vorlader)
+
+    assert vorlader.starte(["A"])
+    warte_auf_ende(vorlader)
+    assert aufrufe.symbole == ["A", "A"]
+
+
+def test_kein_zweiter_durchlauf_waehrend_einer_laeuft():
+    sperre = threading.Event()
+    aufrufe = Aufrufe(sperre)
+    vorlader = WatchlistVorlader(aufrufe, max_workers=1)
+
+    assert vorlader.starte(["A", "B"])
+    assert not vorlader.starte(["C"])
+    sperre.set()
+    warte_auf_ende(vorlader)
+
+    assert aufrufe.symbole == ["A", "B"]
+
+
+def test_nach_stoppe_keine_weitere_arbeit():
+    sperre = threading.Event()
+    aufrufe = Aufrufe(sperre)
+    vorlader = WatchlistVorlader(aufrufe, max_workers=1)
+    symbole = [f"S{i}" for i in range(10)]
+
+    vorlader.starte(symbole)
+    while not aufrufe.symbole:
+        time.sleep(0.01)
+    vorlader.stoppe()
+    sperre.set()
+    warte_auf_ende(vorlader)
+    time.sleep(0.05)
+
+    assert aufrufe.symbole == ["S0"]
+    stand = vorlader.stand()
+    assert stand["gestoppt"] and stand["fertig"] == 1 and stand["beendet"] is None
+
+    # Gestoppter Durchlauf zählt nicht als aktuell: dieselben Symbole starten neu
+    assert vorlader.starte(symbole)
+    warte_auf_ende(vorlader)
+    assert len(aufrufe.symbole) == 11
+
+
+def test_fehler_brechen_den_durchlauf_nicht_ab():
+    def waerme(symbol):
+        if symbol == "B":
+            raise ValueError("keine Kurse")
+
+    vorlader = WatchlistVorlader(waerme)
+    vorlader.starte(["A", "B", "C"])
+    warte_auf_ende(vorlader)
+
+    stand = vorlader.stand()
+    assert stand["fertig"] == 3
+    assert stand["fehler"] == {"B": "keine Kurse"}
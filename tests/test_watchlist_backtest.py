@@ -0,0 +1,79 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import watchlist_backtest
+from watchlist_backtest import KURS_SPALTEN, KursBlock, backtest_symbol, backtest_watchlist
+
+
+@pytest.fixture
+def datensaetze(kurse):
+    return {
+        "NOW": kurse(400, seed=1),
+        "RHM.DE": kurse(380, seed=2, start="2021-02-01", tz="Europe/Berlin"),
+        "OHNE_TZ": kurse(300, seed=3, tz=None),
+    }
+
+
+@pytest.fixture
+def worker():
+    yield watchlist_backtest._WORKER
+    # Sichten vor dem Schließen freigeben, sonst bleibt der Puffer exportiert
+    bloecke = watchlist_backtest._WORKER.pop("bloecke", ())
+    watchlist_backtest._WORKER.clear()
+    for block in bloecke:
+        block.close()
+
+
+def test_kurs_block_liefert_die_kurse_zurueck(datensaetze, worker):
+    block = KursBlock(datensaetze)
+    try:
+        beschreibung = block.beschreibung
+        assert block.zeilen == sum(len(d) for d in datensaetze.values())
+        assert beschreibung["layout"]["RHM.DE"] == (400, 380, "Europe/Berlin")
+
+        watchlist_backtest._oeffne_block(beschreibung)
+        for symbol, data in datensaetze.items():
+            ergebnis = watchlist_backtest._kurse_aus_block(symbol)
+            erwartet = data[KURS_SPALTEN].astype(float).set_axis(data.index.as_unit("ns"))
+            pd.testing.assert_frame_equal(ergebnis, erwartet, check_freq=False)
+            # Kopie: der Frame hängt nicht mehr am Shared Memory
+            assert not np.shares_memory(ergebnis["Close"].to_numpy(), worker["werte"])
+    finally:
+        block.schliesse()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=beschreibung["werte"])
+
+
+def test_pool_wie_einzelner_backtest(datensaetze):
+    aktien = [{"name": symbol, "symbol": symbol} for symbol in datensaetze] + [{"name": "Leer", "symbol": "LEER"}]
+    datensaetze = {**datensaetze, "LEER": datensaetze["NOW"].iloc[:0]}
+
+    summary = backtest_watchlist(aktien, auswertung_tage=30, min_veraenderung=0.05, max_workers=2, datensaetze=datensaetze)
+
+    assert list(summary.index) == [a["symbol"] for a in aktien]
+    assert summary.loc["LEER", "Fehler"] == "Keine Daten"
+    for symbol in ("NOW", "RHM.DE", "OHNE_TZ"):
+        assert pd.isna(summary.loc[symbol, "Fehler"])
+        erwartet = backtest_symbol(datensaetze[symbol][KURS_SPALTEN].astype(float), 30, 0.05, symbol=symbol)
+        assert erwartet["Kaufsignale"] > 0
+        for spalte, wert in erwartet.items():
+            assert summary.loc[symbol, spalte] == pytest.approx(wert, nan_ok=True), (symbol, spalte)
+
+
+def test_fehler_eines_symbols_wird_als_text_gemeldet(datensaetze, worker, monkeypatch):
+    def backtest_mit_fehler(data, *args):
+        raise ValueError(f"{len(data)} Bars")
+
+    block = KursBlock(datensaetze)
+    try:
+        watchlist_backtest._oeffne_block(block.beschreibung)
+        monkeypatch.setattr(watchlist_backtest, "backtest_symbol", backtest_mit_fehler)
+        ergebnis = watchlist_backtest._backtest_aus_block("RHM.DE", 30, 0.05, None)
+    finally:
+        block.schliesse()
+
+    assert ergebnis == ("RHM.DE", None, "ValueError: 380 Bars")
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from zwischenspeicher import Einzelflug, LRUZwischenspeicher
+
+
+def test_gleichzeitige_fehlschlaege_rechnen_einmal():
+    cache = LRUZwischenspeicher()
+    berechnungen = []
+
+    def teuer():
+        berechnungen.append(1)
+        time.sleep(0.2)
+        return pd.DataFrame({"a": [1.0, 2.0]})
+
+    ergebnisse = []
+    threads = [
+        threading.Thread(target=lambda: ergebnisse.append(cache.hole_oder_berechne("k", teuer)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(berechnungen) == 1
+    assert len(ergebnisse) == 8
+    assert all(e.equals(ergebnisse[0]) for e in ergebnisse)
+    assert len({id(e) for e in ergebnisse}) == 8    # jeder bekommt eine eigene flache Kopie
+
+
+def test_fehlschlag_wird_einmal_gezaehlt():
+    cache = LRUZwischenspeicher()
+    cache.hole_oder_berechne("k", lambda: 1)
+    cache.hole_oder_berechne("k", lambda: 2)
+
+    assert (cache.fehlschlaege, cache.treffer) == (1, 1)
+
+
+def test_ausnahme_wird_geteilt_und_nicht_gespeichert():
+    flug = Einzelflug()
+    cache = LRUZwischenspeicher()
+    fehler = []
+
+    def kaputt():
+        time.sleep(0.1)
+        raise ValueError("kein Kurs")
+
+    def lauf():
+        try:
+            cache.hole_oder_berechne("k", kaputt)
+        except ValueError as e:
+            fehler.append(e)
+
+    threads = [threading.Thread(target=lauf) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fehler) == 4
+    assert "k" not in cache
+    with pytest.raises(ValueError):
+        flug.fuehre_aus("x", kaputt)
+    assert len(flug) == 0
+
+
+def test_schreiben_in_gelieferten_frame_aendert_cache_nicht():
+    cache = LRUZwischenspeicher()
+    cache.lege_ab("k", pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [4, 5, 6]}))
+
+    frame = cache.hole("k")
+    frame.loc[0, "a"] = -1.0
+    frame.iloc[1, 1] = -5
+    spalte = frame["a"]
+    spalte.iloc[2] = -3.0
+    frame["c"] = 0
+    berechnet = cache.hole_oder_berechne("k", lambda: None)
+    berechnet.iloc[:, 0] = 0.0
+
+    pd.testing.assert_frame_equal(cache.hole("k"), pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [4, 5, 6]}))
@@ -0,0 +1,141 @@
+import threading
+import time
+import pandas as pd
+import yfinance as yf
+
+# ------------------------------------------------------
+# Standard-Provider: Metadaten eines Tickers über yfinance laden
+# ------------------------------------------------------
+def _als_dataframe(wert):
+    if wert is not None and not isinstance(wert, pd.DataFrame):
+        wert = pd.DataFrame(wert)
+    return wert
+
+
+def yfinance_metadaten(symbol: str) -> dict:
+    """
+    Lädt alle Metadaten, die eine Aktienseite braucht, in einem Durchgang:
+    - info (Fundamentaldaten, Sektor, Industrie, ...)
+    - market_cap aus fast_info
+    - Analysten-Empfehlungen (summary, recommendations, analysis)
+    Schlägt info fehl, wird der Fehler weitergereicht; die übrigen Felder sind optional (None).
+    """
+    ticker = yf.Ticker(symbol)
+    metadaten = {"info": ticker.info}
+
+    try:
+        metadaten["market_cap"] = ticker.fast_info.get("market_cap")
+    except Exception:
+        metadaten["market_cap"] = None
+
+    for feld, attribut in [
+        ("summary", "recommendations_summary"),
+        ("recommendations", "recommendations"),
+        ("analysis", "analysis"),
+    ]:
+        try:
+            metadaten[feld] = _als_dataframe(getattr(ticker, attribut))
+        except Exception:
+            metadaten[feld] = None
+    return metadaten
+
+
+class TickerMetadaten:
+    """
+    Zwischenspeicher für Ticker-Metadaten mit TTL und Stale-While-Revalidate
+    -----------------------------------------------------------------------
+    - jünger als TTL: Eintrag wird direkt geliefert (kein Request)
+    - älter als TTL, aber jünger als TTL + MAX_VERALTET: der alte Eintrag wird
+      sofort geliefert und im Hintergrund einmal neu geladen
+    - sonst (oder noch nie geladen): synchron laden
+    Pro Symbol läuft immer höchstens ein Request gleichzeitig. Schlägt ein
+    Request fehl, wird ein vorhandener (veralteter) Eintrag weiterverwendet.
+    """
+
+    TTL = pd.Timedelta(hours=6)
+    MAX_VERALTET = pd.Timedelta(days=1)
+
+    def __init__(self, provider=yfinance_metadaten, ttl=None, max_veraltet=None):
+        self.provider = provider
+        self.ttl = (ttl if ttl is not None else self.TTL).total_seconds()
+        self.max_veraltet = (max_veraltet if max_veraltet is not None else self.MAX_VERALTET).total_seconds()
+        self._eintraege = {}      # Symbol -> (Zeitpunkt, Metadaten)
+        self._sperren = {}        # Symbol -> Lock (ein Request je Symbol)
+        self._im_hintergrund = set()
+        self._lock = threading.Lock()
+
+    def _sperre(self, symbol: str) -> threading.Lock:
+        with self._lock:
+            return self._sperren.setdefault(symbol, threading.Lock())
+
+    def _aktualisiere(self, symbol: str, bekannt_seit=None):
+        """
+        Lädt die Metadaten neu. Wartet ein zweiter Aufrufer auf denselben Request,
+        übernimmt er dessen Ergebnis statt erneut zu laden.
+        """
+        with self._sperre(symbol):
+            eintrag = self._eintraege.get(symbol)
+            if eintrag is not None and (bekannt_seit is None or eintrag[0] > bekannt_seit):
+                if time.time() - eintrag[0] < self.ttl:
+                    return eintrag[1]
+            try:
+                metadaten = self.provider(symbol)
+            except Exception:
+                if eintrag is not None:
+                    return eintrag[1]
+                raise
+            self._eintraege[symbol] = (time.time(), metadaten)
+            return metadaten
+
+    def _aktualisiere_im_hintergrund(self, symbol: str, bekannt_seit: float):
+        with self._lock:
+            if symbol in self._im_hintergrund:
+                return
+            self._im_hintergrund.add(symbol)
+
+        def lauf():
+            try:
+                self._aktualisiere(symbol, bekannt_seit)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._im_hintergrund.discard(symbol)
+
+        threading.Thread(target=lauf, daemon=True).start()
+
+    def hole(self, symbol: str) -> dict:
+        """
+        Liefert die Metadaten eines Symbols (Dict mit info, market_cap, summary,
+        recommendations, analysis). Die Inhalte werden geteilt und dürfen nicht verändert werden.
+        """
+        eintrag = self._eintraege.get(symbol)
+        if eintrag is not None:
+            alter = time.time() - eintrag[0]
+            if alter < self.ttl:
+                return eintrag[1]
+            if alter < self.ttl + self.max_veraltet:
+                self._aktualisiere_im_hintergrund(symbol, eintrag[0])
+                return eintrag[1]
+        return self._aktualisiere(symbol, eintrag[0] if eintrag is not None else None)
+
+    def info(self, symbol: str) -> dict:
+        return self.hole(symbol)["info"]
+
+    def ist_vorhanden(self, symbol: str) -> bool:
+        """
+        True, wenn hole(symbol) ohne wartenden Request antwortet
+        (Eintrag jünger als TTL + MAX_VERALTET).
+        """
+        eintrag = self._eintraege.get(symbol)
+        return eintrag is not None and time.time() - eintrag[0] < self.ttl + self.max_veraltet
+
+    def verwerfe(self, symbol: str = None):
+        """
+        Entfernt einen (oder alle) Einträge, z.B. nach einer Änderung der Watchlist.
+        """
+        with self._lock:
+            if symbol is None:
+                self._eintraege.clear()
+            else:
+                self._eintraege.pop(symbol, None)
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+# ------------------------------------------------------
+# Watchlist im Hintergrund vorladen
+# ------------------------------------------------------
+# Der Vorlader selbst kennt keine Analysen: er ruft je Symbol eine Funktion
+# `waerme(symbol)` auf, die alles berechnet, was eine Seite später braucht.
+# Die Ergebnisse landen in den prozessweiten Caches (Kursdaten-Speicher,
+# INDIKATOR_CACHE, SIGNAL_CACHE, Ticker-Metadaten) und werden von dort gelesen.
+
+
+class WatchlistVorlader:
+    """
+    Wärmt die Caches aller Watchlist-Symbole in einem Hintergrund-Thread vor
+    ------------------------------------------------------------------------
+    - starte(symbole): beginnt einen Durchlauf, wenn keiner läuft und sich die
+      Symbole geändert haben oder der letzte Durchlauf älter als ERNEUERN_NACH ist
+    - je Symbol läuft `waerme(symbol)` in einem begrenzten Thread-Pool
+    - stoppe(): noch nicht begonnene Symbole des laufenden Durchlaufs entfallen
+    - stand(): Fortschritt des laufenden (oder letzten) Durchlaufs
+    Fehler einzelner Symbole werden gesammelt und brechen den Durchlauf nicht ab.
+    """
+
+    # Danach sind neue Bars wahrscheinlich (gleich wie KursdatenSpeicher.AKTUALITAET)
+    ERNEUERN_NACH = pd.Timedelta(minutes=15)
+
+    def __init__(self, waerme, max_workers: int = 4, erneuern_nach=None):
+        self.waerme = waerme
+        self.max_workers = max_workers
+        self.erneuern_nach = (erneuern_nach if erneuern_nach is not None else self.ERNEUERN_NACH).total_seconds()
+        self._lock = threading.Lock()
+        self._symbole = ()
+        self._laeuft = False
+        self._gestoppt = False
+        self._gestartet = None
+        self._beendet = None
+        self._fertig = 0
+        self._in_arbeit = []
+        self._fehler = {}
+
+    def starte(self, symbole) -> bool:
+        """
+        Startet einen Durchlauf im Hintergrund (kehrt sofort zurück).
+        Rückgabe: True, wenn ein neuer Durchlauf gestartet wurde.
+        """
+        symbole = tuple(dict.fromkeys(symbole))
+        with self._lock:
+            if self._laeuft or not symbole:
+                return False
+            if (
+                symbole == self._symbole
+                and self._beendet is not None
+                and time.time() - self._beendet < self.erneuern_nach
+            ):
+                return False
+            self._symbole = symbole
+            self._laeuft = True
+            self._gestoppt = False
+            self._gestartet = time.time()
+            self._beendet = None
+            self._fertig = 0
+            self._in_arbeit = []
+            self._fehler = {}
+
+        threading.Thread(target=self._lauf, args=(symbole,), daemon=True, name="WatchlistVorlader").start()
+        return True
+
+    def _lauf(self, symbole):
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(symbole)))) as pool:
+                list(pool.map(self._waerme_symbol, symbole))
+        finally:
+            with self._lock:
+                self._laeuft = False
+                # Ein gestoppter Durchlauf gilt nicht als aktuell (starte() lädt neu)
+                self._beendet = None if self._gestoppt else time.time()
+
+    def stoppe(self):
+        """
+        Beendet den laufenden Durchlauf: Symbole in Arbeit laufen zu Ende,
+        die übrigen werden nicht mehr berechnet. Danach startet starte() neu.
+        """
+        with self._lock:
+            if self._laeuft:
+                self._gestoppt = True
+                self._beendet = None
+
+    def _waerme_symbol(self, symbol):
+        with self._lock:
+            if self._gestoppt:
+                return
+            self._in_arbeit.append(symbol)
+        try:
+            self.waerme(symbol)
+        except Exception as e:
+            with self._lock:
+                self._fehler[symbol] = str(e)
+        finally:
+            with self._lock:
+                self._in_arbeit.remove(symbol)
+                self._fertig += 1
+
+    @property
+    def laeuft(self) -> bool:
+        return self._laeuft
+
+    def stand(self) -> dict:
+        """
+        Fortschritt als Dict:
+        - gesamt, fertig: Anzahl Symbole (fertig zählt auch fehlgeschlagene)
+        - in_arbeit: Symbole, die gerade berechnet werden
+        - fehler: Symbol -> Fehlermeldung
+        - laeuft, gestoppt, gestartet, beendet (Zeitpunkte als time.time())
+        """
+        with self._lock:
+            return {
+                "gesamt": len(self._symbole),
+                "fertig": self._fertig,
+                "in_arbeit": list(self._in_arbeit),
+                "fehler": dict(self._fehler),
+                "laeuft": self._laeuft,
+                "gestoppt": self._gestoppt,
+                "gestartet": self._gestartet,
+                "beendet": self._beendet
+            }
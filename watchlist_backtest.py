@@ -0,0 +1,196 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------
+# Backtest der gesamten Watchlist über einen Prozess-Pool
+# ------------------------------------------------------
+# Der Hauptprozess lädt alle Kurse (Sammel-Download über den Kursdaten-Speicher)
+# und legt sie als ein zusammenhängender float64-Block in Shared Memory ab.
+# Die Worker bekommen nur Namen und Offsets, lesen ihre Kurse direkt aus dem
+# Block (kein Pickle von DataFrames), rechnen Indikatoren und Backtests und
+# schicken nur die Kennzahlen zurück.
+
+KURS_SPALTEN = ["Open", "High", "Low", "Close", "Volume"]
+
+# Im Worker: geöffneter Shared-Memory-Block und Beschreibung der Symbole
+_WORKER = {}
+
+
+class KursBlock:
+    """
+    Kurse mehrerer Symbole in zwei Shared-Memory-Blöcken:
+    - werte: (Zeilen gesamt × KURS_SPALTEN) float64
+    - zeiten: Zeitstempel in ns (int64)
+    Je Symbol wird (Start, Länge, Zeitzone) im Layout gespeichert.
+    """
+
+    def __init__(self, datensaetze: dict):
+        self.layout = {}
+        zeilen = sum(len(d) for d in datensaetze.values())
+        self._werte = shared_memory.SharedMemory(create=True, size=max(zeilen * len(KURS_SPALTEN) * 8, 1))
+        self._zeiten = shared_memory.SharedMemory(create=True, size=max(zeilen * 8, 1))
+        werte = np.ndarray((zeilen, len(KURS_SPALTEN)), dtype=np.float64, buffer=self._werte.buf)
+        zeiten = np.ndarray((zeilen,), dtype=np.int64, buffer=self._zeiten.buf)
+
+        start = 0
+        for symbol, data in datensaetze.items():
+            ende = start + len(data)
+            werte[start:ende] = data.reindex(columns=KURS_SPALTEN).to_numpy(dtype=np.float64)
+            index = pd.DatetimeIndex(data.index).as_unit("ns")
+            zeiten[start:ende] = index.asi8
+            self.layout[symbol] = (start, len(data), str(index.tz) if index.tz is not None else None)
+            start = ende
+        self.zeilen = zeilen
+
+    @property
+    def beschreibung(self) -> dict:
+        """
+        Alles, was ein Worker zum Öffnen braucht (klein, wird gepickelt).
+        """
+        return {"werte": self._werte.name, "zeiten": self._zeiten.name, "zeilen": self.zeilen, "layout": self.layout}
+
+    def schliesse(self):
+        for block in (self._werte, self._zeiten):
+            block.close()
+            block.unlink()
+
+
+def _oeffne_block(beschreibung: dict):
+    """
+    Pool-Initializer: Shared Memory einmal je Worker öffnen.
+    """
+    werte = shared_memory.SharedMemory(name=beschreibung["werte"])
+    zeiten = shared_memory.SharedMemory(name=beschreibung["zeiten"])
+    _WORKER["bloecke"] = (werte, zeiten)
+    _WORKER["werte"] = np.ndarray((beschreibung["zeilen"], len(KURS_SPALTEN)), dtype=np.float64, buffer=werte.buf)
+    _WORKER["zeiten"] = np.ndarray((beschreibung["zeilen"],), dtype=np.int64, buffer=zeiten.buf)
+    _WORKER["layout"] = beschreibung["layout"]
+
+
+def _kurse_aus_block(symbol: str) -> pd.DataFrame:
+    start, laenge, tz = _WORKER["layout"][symbol]
+    index = pd.DatetimeIndex(_WORKER["zeiten"][start:start + laenge].view("datetime64[ns]"))
+    if tz is not None:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    # Kopie, damit der DataFrame nicht mehr am Shared Memory hängt
+    data = pd.DataFrame(_WORKER["werte"][start:start + laenge].copy(), index=index, columns=KURS_SPALTEN)
+    data.index.name = "Date"
+    return data
+
+
+# ------------------------------------------------------
+# Kennzahlen eines Symbols
+# ------------------------------------------------------
+def _abgeschlossene_perioden(perioden_bewertung, letztes_datum, auswertung_tage) -> pd.DataFrame:
+    """
+    Perioden, deren Auswertungszeitraum schon vorbei ist (wie im Algorithmus-Tab).
+    """
+    df = pd.DataFrame(perioden_bewertung or [])
+    if df.empty:
+        return df
+    df["Signal"] = df["Bewertung"].astype(str).str.upper() == "TRUE"
+    ende = pd.to_datetime(df["End_Datum"])
+    return df[ende + pd.Timedelta(days=auswertung_tage) <= letztes_datum]
+
+
+def backtest_symbol(data_full: pd.DataFrame, auswertung_tage: int = 61, min_veraenderung: float = 0.08,
+                    tage: int = None, symbol: str = None) -> dict:
+    """
+    Indikatoren und beide Backtests (analyse_kaufsignal_perioden und SwingSignalService)
+    für ein Symbol – dieselben Kennzahlen wie auf der Aktienseite.
+    tage: wie die Sidebar nur die letzten `tage` Kalendertage auswerten (None = alles).
+    """
+    from core_magic_3 import berechne_indikatoren
+    from signals_2 import analyse_kaufsignal_perioden
+    from SwingtradingSignale import SwingSignalService
+
+    data = berechne_indikatoren(data_full, symbol=symbol)
+    if tage is not None:
+        startdatum = data.index[-1] - pd.Timedelta(days=tage)
+        data = data.loc[data.index >= startdatum]
+
+    ergebnis = analyse_kaufsignal_perioden(data, auswertung_tage, min_veraenderung)
+    abgeschlossen = _abgeschlossene_perioden(ergebnis.get("Perioden_Bewertung"), data.index[-1], auswertung_tage)
+    perioden = pd.DataFrame(ergebnis.get("Perioden_Bewertung") or [])
+
+    swing = SwingSignalService().run_analysis(data, auswertung_tage, min_veraenderung, None, None, None, None)
+
+    return {
+        "Bars": len(data),
+        "Kaufsignale": ergebnis["Anzahl_Kaufsignale"],
+        "Trefferquote_Signale (%)": ergebnis["Trefferquote_Kauf (%)"],
+        "Perioden": len(ergebnis["Perioden"]),
+        "Perioden_abgeschlossen": len(abgeschlossen),
+        "Trefferquote_Perioden (%)": abgeschlossen["Signal"].mean() * 100 if len(abgeschlossen) else None,
+        "Mittlerer_Kursanstieg (%)": perioden["Kurs_Diff"].mean() * 100 if "Kurs_Diff" in perioden else None,
+        "Mittlere_Periodenlaenge (Tage)": (
+            (pd.to_datetime(perioden["End_Datum"]) - pd.to_datetime(perioden["Start_Datum"])).dt.days.mean()
+            if len(perioden) else None
+        ),
+        "Swing_Kaufsignale": len(swing.get("buy_signals", [])),
+        "Swing_Perioden": len(swing.get("perioden_bewertung", [])),
+        "Swing_Trefferquote (%)": swing.get("trefferquote"),
+    }
+
+
+def _backtest_aus_block(symbol: str, auswertung_tage: int, min_veraenderung: float, tage):
+    try:
+        return symbol, backtest_symbol(_kurse_aus_block(symbol), auswertung_tage, min_veraenderung, tage, symbol), None
+    except Exception as e:
+        return symbol, None, f"{type(e).__name__}: {e}"
+
+
+# ------------------------------------------------------
+# Watchlist-Backtest
+# ------------------------------------------------------
+def backtest_watchlist(aktien=None, auswertung_tage: int = 61, min_veraenderung: float = 0.08,
+                       tage: int = None, period: str = "4y", max_workers: int = None,
+                       datensaetze: dict = None) -> pd.DataFrame:
+    """
+    Backtest aller Watchlist-Aktien parallel.
+    - aktien: Liste {"name", "symbol"} (Standard: Watchlist.json)
+    - datensaetze: bereits geladene Kurse Symbol -> DataFrame (sonst lade_watchlist_daten)
+    Rückgabe: eine Zeile je Symbol mit Trefferquoten, Signal- und Periodenkennzahlen;
+    Symbole ohne Daten oder mit Fehler stehen mit Spalte "Fehler" in der Tabelle.
+    """
+    from core_magic_3 import lade_aktien, lade_watchlist_daten
+
+    if aktien is None:
+        aktien = lade_aktien()
+    namen = {a["symbol"]: a["name"] for a in aktien}
+    if datensaetze is None:
+        datensaetze = lade_watchlist_daten(period=period, aktien=aktien)
+    datensaetze = {s: d for s, d in datensaetze.items() if s in namen and d is not None and not d.empty}
+
+    zeilen = {symbol: {"Name": name, "Fehler": "Keine Daten"} for symbol, name in namen.items()}
+    if datensaetze:
+        block = KursBlock(datensaetze)
+        try:
+            max_workers = max_workers or min(os.cpu_count() or 1, len(datensaetze))
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_oeffne_block, initargs=(block.beschreibung,)) as pool:
+                auftraege = [pool.submit(_backtest_aus_block, s, auswertung_tage, min_veraenderung, tage) for s in datensaetze]
+                for auftrag in auftraege:
+                    symbol, kennzahlen, fehler = auftrag.result()
+                    zeilen[symbol] = {"Name": namen[symbol], **(kennzahlen or {}), "Fehler": fehler}
+        finally:
+            block.schliesse()
+
+    summary = pd.DataFrame.from_dict(zeilen, orient="index")
+    summary.index.name = "Symbol"
+    return summary
+
+
+if __name__ == "__main__":
+    # Nächtliche Auswertung: python watchlist_backtest.py [ausgabe.csv]
+    import sys
+    import time
+
+    beginn = time.perf_counter()
+    summary = backtest_watchlist()
+    print(summary.to_string())
+    print(f"{len(summary)} Symbole in {time.perf_counter() - beginn:.1f} s")
+    if len(sys.argv) > 1:
+        summary.to_csv(sys.argv[1])
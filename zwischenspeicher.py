@@ -0,0 +1,176 @@
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------
+# Speicherbedarf eines Cache-Eintrags schätzen
+# ------------------------------------------------------
+def groesse_in_bytes(wert) -> int:
+    if isinstance(wert, pd.DataFrame):
+        return int(wert.memory_usage(index=True, deep=True).sum())
+    if isinstance(wert, pd.Series):
+        return int(wert.memory_usage(index=True, deep=True))
+    if isinstance(wert, np.ndarray) or hasattr(wert, "nbytes"):
+        # Arrays und Objekte mit eigener Größenangabe (z.B. IndikatorPanel)
+        return int(wert.nbytes)
+    if isinstance(wert, dict):
+        return sys.getsizeof(wert) + sum(groesse_in_bytes(v) for v in wert.values())
+    if isinstance(wert, (list, tuple)):
+        return sys.getsizeof(wert) + sum(groesse_in_bytes(v) for v in wert)
+    return sys.getsizeof(wert)
+
+
+def nur_lesen(wert):
+    """
+    Gibt einen gecachten Wert weiter, ohne ihn zu kopieren.
+    DataFrames/Series werden flach kopiert: die Daten werden geteilt, neue oder
+    überschriebene Spalten beim Aufrufer landen (Copy-on-Write) nicht im Cache.
+    Copy-on-Write ist erst ab pandas 3 immer aktiv, daher pandas>=3.0 in requirements.txt.
+    """
+    if isinstance(wert, (pd.DataFrame, pd.Series)):
+        return wert.copy(deep=False)
+    return wert
+
+
+class _Flug:
+    def __init__(self):
+        self.fertig = threading.Event()
+        self.wert = None
+        self.fehler = None
+
+
+class Einzelflug:
+    """
+    Single-Flight für teure Berechnungen
+    ------------------------------------
+    Gleichzeitige Aufrufe mit demselben Schlüssel starten die Berechnung nur
+    einmal: der erste Aufrufer rechnet, alle weiteren warten auf ihn und bekommen
+    dasselbe Ergebnis (bzw. dieselbe Ausnahme). Danach wird der Schlüssel
+    vergessen, das Ergebnis selbst hält der Aufrufer (z.B. ein Cache).
+    """
+
+    def __init__(self):
+        self._laufend = {}      # Schlüssel -> _Flug
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._laufend)
+
+    def fuehre_aus(self, schluessel, berechne):
+        with self._lock:
+            flug = self._laufend.get(schluessel)
+            fuehrt = flug is None
+            if fuehrt:
+                flug = self._laufend[schluessel] = _Flug()
+
+        if not fuehrt:
+            flug.fertig.wait()
+            if flug.fehler is not None:
+                raise flug.fehler
+            return flug.wert
+
+        try:
+            flug.wert = berechne()
+        except BaseException as e:
+            flug.fehler = e
+            raise
+        finally:
+            with self._lock:
+                del self._laufend[schluessel]
+            flug.fertig.set()
+        return flug.wert
+
+
+class LRUZwischenspeicher:
+    """
+    Prozessweiter LRU-Cache mit Obergrenze in Bytes
+    -----------------------------------------------
+    - Einträge werden über einen frei wählbaren (hashbaren) Schlüssel gefunden,
+      es wird also nie der Inhalt eines DataFrames gehasht
+    - Treffer liefern den gespeicherten Wert ohne Pickle/Kopie (siehe nur_lesen)
+    - wird max_bytes überschritten, fliegen die am längsten nicht genutzten Einträge raus
+    - hole_oder_berechne rechnet je Schlüssel nur einmal, auch bei gleichzeitigen
+      Fehlschlägen aus mehreren Sessions (siehe Einzelflug)
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 ** 2, groesse=groesse_in_bytes):
+        self.max_bytes = max_bytes
+        self.groesse = groesse
+        self._eintraege = OrderedDict()     # Schlüssel -> (Wert, Bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._einzelflug = Einzelflug()
+        self.treffer = 0
+        self.fehlschlaege = 0
+
+    def __len__(self):
+        return len(self._eintraege)
+
+    def __contains__(self, schluessel):
+        return schluessel in self._eintraege
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def hole(self, schluessel, standard=None):
+        with self._lock:
+            eintrag = self._eintraege.get(schluessel)
+            if eintrag is None:
+                self.fehlschlaege += 1
+                return standard
+            self._eintraege.move_to_end(schluessel)
+            self.treffer += 1
+            return nur_lesen(eintrag[0])
+
+    def lege_ab(self, schluessel, wert):
+        groesse = self.groesse(wert)
+        with self._lock:
+            alt = self._eintraege.pop(schluessel, None)
+            if alt is not None:
+                self._bytes -= alt[1]
+            if groesse > self.max_bytes:
+                # Passt nie in den Cache → nicht speichern, aber alles andere behalten
+                return nur_lesen(wert)
+            self._eintraege[schluessel] = (wert, groesse)
+            self._bytes += groesse
+            while self._bytes > self.max_bytes:
+                _, (_, entfernt) = self._eintraege.popitem(last=False)
+                self._bytes -= entfernt
+        return nur_lesen(wert)
+
+    def hole_oder_berechne(self, schluessel, berechne):
+        """
+        Liefert den Eintrag zum Schlüssel oder berechnet und speichert ihn.
+        Fehlt der Eintrag in mehreren Threads gleichzeitig, rechnet nur einer,
+        die anderen warten und bekommen dasselbe Ergebnis.
+        """
+        wert = self.hole(schluessel, _FEHLT)
+        if wert is not _FEHLT:
+            return wert
+
+        def berechne_einmal():
+            # Ein gerade beendeter Flug kann den Eintrag schon abgelegt haben
+            # (ohne hole(), der Fehlschlag ist oben schon gezählt)
+            with self._lock:
+                eintrag = self._eintraege.get(schluessel)
+                if eintrag is not None:
+                    self._eintraege.move_to_end(schluessel)
+                    return eintrag[0]
+            return self.lege_ab(schluessel, berechne())
+
+        return nur_lesen(self._einzelflug.fuehre_aus(schluessel, berechne_einmal))
+
+    def entferne(self, bedingung=None):
+        """
+        Entfernt alle Einträge (oder nur die, deren Schlüssel `bedingung` erfüllen).
+        """
+        with self._lock:
+            for schluessel in list(self._eintraege):
+                if bedingung is None or bedingung(schluessel):
+                    self._bytes -= self._eintraege.pop(schluessel)[1]
+
+
+_FEHLT = object()